@@ -0,0 +1,94 @@
+# File: benchmarks/bench_alignment.py
+"""
+Benchmark skalowania przypisywania mówców (AlignmentService) od 1k do 1M słów.
+
+Uruchomienie:
+    python benchmarks/bench_alignment.py [--legacy]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.alignment_engine import IntervalAlignmentEngine, SpeakerTimeline
+from src.core.alignment_service import AlignmentService
+
+SCALES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def make_synthetic(num_words: int, seed: int = 0):
+    """Słowa po ~0.4s i nakładające się tury 4 mówców (średnio ~8s każda)."""
+    rng = np.random.default_rng(seed)
+    durations = rng.uniform(0.15, 0.45, num_words)
+    gaps = rng.uniform(0.0, 0.1, num_words)
+    word_starts = np.cumsum(durations + gaps) - durations
+    word_ends = word_starts + durations
+    total = float(word_ends[-1])
+
+    num_turns = max(1, int(total / 8))
+    turn_starts = np.sort(rng.uniform(0, total, num_turns))
+    turn_ends = turn_starts + rng.uniform(2.0, 14.0, num_turns)
+    speakers = rng.integers(0, 4, num_turns)
+
+    words = [{"word": f" w{i}", "start": float(s), "end": float(e)} for i, (s, e) in enumerate(zip(word_starts, word_ends))]
+    segments = [{"start": float(s), "end": float(e), "speaker": f"SPEAKER_{k:02d}"} for s, e, k in zip(turn_starts, turn_ends, speakers)]
+    return words, segments
+
+
+def legacy_assign(words, segments):
+    """Poprzednia implementacja (pętla zagnieżdżona, pierwszy segment w ±0.75s) - punkt odniesienia."""
+    output = []
+    current_speaker_idx = 0
+    segments = sorted(segments, key=lambda x: x['start'])
+    for word in words:
+        assigned_speaker = "UNKNOWN"
+        for i in range(current_speaker_idx, len(segments)):
+            seg = segments[i]
+            if (word['start'] >= seg['start'] - 0.75) and (word['start'] <= seg['end'] + 0.75):
+                assigned_speaker = seg['speaker']
+                current_speaker_idx = i
+                break
+        output.append(assigned_speaker)
+    return output
+
+
+def run_benchmark(include_legacy: bool = False):
+    print(f"{'słowa':>10} | {'segmenty':>8} | {'engine [ms]':>11} | {'adapter [ms]':>12} | {'legacy [ms]':>11}")
+    print("-" * 64)
+
+    engine = IntervalAlignmentEngine()
+    service = AlignmentService()
+
+    for n in SCALES:
+        words, segments = make_synthetic(n)
+        word_starts = np.array([w['start'] for w in words])
+        word_ends = np.array([w['end'] for w in words])
+
+        t0 = time.perf_counter()
+        timeline = SpeakerTimeline.from_segments(segments)
+        engine.assign(word_starts, word_ends, timeline)
+        engine_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        service._assign_speakers_to_words(words, segments)
+        adapter_ms = (time.perf_counter() - t0) * 1000
+
+        legacy_ms = "-"
+        if include_legacy and n <= 100_000:
+            t0 = time.perf_counter()
+            legacy_assign(words, segments)
+            legacy_ms = f"{(time.perf_counter() - t0) * 1000:.1f}"
+
+        print(f"{n:>10} | {len(segments):>8} | {engine_ms:>11.1f} | {adapter_ms:>12.1f} | {legacy_ms:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--legacy", action="store_true", help="Porównaj z poprzednią pętlą (do 100k słów)")
+    args = parser.parse_args()
+    run_benchmark(include_legacy=args.legacy)
@@ -0,0 +1,75 @@
+# File: benchmarks/bench_asr_backends.py
+"""
+Porównanie backendów ASR: współczynnik czasu rzeczywistego (RTF = czas przetwarzania / długość audio).
+Pierwsze wywołanie (ładowanie modelu) mierzone jest osobno i nie wlicza się do RTF.
+
+Uruchomienie:
+    python benchmarks/bench_asr_backends.py [plik_audio] --backends fake cpu mlx --threads 4 --repeats 2
+"""
+
+import sys
+import os
+import time
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.infrastructure.asr_backends import create_asr_backend
+from src.infrastructure.audio_loader import AudioBuffer, SAMPLE_RATE, load_audio
+
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """Tony o zmiennej wysokości przeplatane ciszą (dla backendu fake i testów infrastruktury)."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = (np.sin(2 * np.pi * 0.2 * t) > -0.3).astype(np.float32)
+    tone = np.sin(2 * np.pi * (180 + 40 * np.sin(2 * np.pi * 0.5 * t)) * t)
+    return (0.3 * envelope * tone + 0.001 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def count_words(result) -> int:
+    return sum(len(segment.get("words", [])) for segment in result.get("segments", []))
+
+
+def run_benchmark(audio: AudioBuffer, backends, threads: int, compute_type: str, repeats: int):
+    print(f"Audio: {audio.name}, {audio.duration:.1f}s\n")
+    print(f"{'Backend':>8} | {'Ładowanie [s]':>14} | {'Czas [s]':>9} | {'RTF':>7} | {'Słowa':>6}")
+    print("-" * 58)
+    for name in backends:
+        try:
+            backend = create_asr_backend(name, threads=threads, compute_type=compute_type)
+            start = time.perf_counter()
+            result = backend.transcribe(audio.samples)
+            cold = time.perf_counter() - start
+
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                result = backend.transcribe(audio.samples)
+                times.append(time.perf_counter() - start)
+        except ImportError as e:
+            print(f"{name:>8} | pominięty (brak biblioteki: {e.name})")
+            continue
+
+        warm = float(np.median(times)) if times else cold
+        print(f"{name:>8} | {cold:>14.2f} | {warm:>9.2f} | {warm / audio.duration:>7.3f} | {count_words(result):>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", nargs="?", help="Nagranie testowe (domyślnie sygnał syntetyczny)")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Długość sygnału syntetycznego")
+    parser.add_argument("--backends", nargs="+", default=["fake", "cpu", "mlx"])
+    parser.add_argument("--threads", type=int, default=0, help="Wątki backendu cpu (0 = automatycznie)")
+    parser.add_argument("--compute-type", default="int8", help="Precyzja backendu cpu")
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.audio:
+        with load_audio(args.audio) as buffer:
+            run_benchmark(buffer, args.backends, args.threads, args.compute_type, args.repeats)
+    else:
+        buffer = AudioBuffer(synthetic_speech(args.seconds), name=f"synthetic-{args.seconds:.0f}s")
+        run_benchmark(buffer, args.backends, args.threads, args.compute_type, args.repeats)
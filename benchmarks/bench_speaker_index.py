@@ -0,0 +1,65 @@
+# File: benchmarks/bench_speaker_index.py
+"""
+Czas wyszukiwania w indeksie głosów (SpeakerIndex): dokładne (macierz · wektor) vs przybliżone (IVF),
+dla rosnącej liczby zapisanych głosów. Dane syntetyczne: każda osoba ma kilka zaszumionych głosów,
+zapytanie to kolejne nagranie tej samej osoby - trafność = odsetek zapytań z właściwą osobą na 1. miejscu.
+
+Uruchomienie:
+    python benchmarks/bench_speaker_index.py [--sizes 1000 10000 50000] [--dim 256] [--queries 500]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.infrastructure.speaker_index import SpeakerIndex
+
+VOICES_PER_PERSON = 3
+
+
+def build(approximate: bool, people: np.ndarray, voices: np.ndarray) -> SpeakerIndex:
+    index = SpeakerIndex(approximate=approximate)
+    for i in range(len(people)):
+        index.enroll(f"osoba{i}", voices[i * VOICES_PER_PERSON:(i + 1) * VOICES_PER_PERSON])
+    return index
+
+
+def run_benchmark(sizes, dim: int, num_queries: int, noise: float = 0.3):
+    print(f"{'Głosy':>8} | {'Tryb':>9} | {'Budowa [s]':>10} | {'Zapytanie [ms]':>14} | {'p99 [ms]':>8} | {'Trafność':>8}")
+    print("-" * 72)
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        people = rng.standard_normal((size // VOICES_PER_PERSON, dim)).astype(np.float32)
+        voices = np.repeat(people, VOICES_PER_PERSON, axis=0) + noise * rng.standard_normal((len(people) * VOICES_PER_PERSON, dim)).astype(np.float32)
+        targets = rng.choice(len(people), min(num_queries, len(people)), replace=False)
+        queries = people[targets] + noise * rng.standard_normal((len(targets), dim)).astype(np.float32)
+
+        for approximate in (False, True):
+            start = time.perf_counter()
+            index = build(approximate, people, voices)
+            index.search(queries[0])  # IVF budowany leniwie przy pierwszym zapytaniu
+            build_seconds = time.perf_counter() - start
+
+            latencies, hits = [], 0
+            for target, query in zip(targets.tolist(), queries):
+                t0 = time.perf_counter()
+                best = index.search(query, k=1)[0][0]
+                latencies.append(time.perf_counter() - t0)
+                hits += best == f"osoba{target}"
+            latencies = np.array(latencies) * 1000
+            print(f"{len(index):>8} | {'IVF' if approximate else 'dokładny':>9} | {build_seconds:>10.2f} | "
+                  f"{np.median(latencies):>14.3f} | {np.percentile(latencies, 99):>8.3f} | {hits / len(targets):>8.2%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=256, help="Wymiar embeddingu (WeSpeaker ResNet34: 256)")
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.dim, args.queries)
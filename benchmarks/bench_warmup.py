@@ -0,0 +1,50 @@
+# File: benchmarks/bench_warmup.py
+"""
+Pomiar zimnego i ciepłego startu: czas pierwszego żądania (ładowanie modeli + inferencja)
+w porównaniu z kolejnymi, na tym samym nagraniu. Cache wyników jest wyłączony.
+
+Uruchomienie:
+    python benchmarks/bench_warmup.py [plik_audio] [--repeats 3]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.meeting_service import MeetingService
+from src.infrastructure.settings import Settings
+
+
+def run_benchmark(audio_path: str = None, repeats: int = 3, clip_seconds: float = 2.0):
+    settings = Settings.from_env().model_copy(update={"cache_enabled": False})
+    service = MeetingService.from_settings(settings)
+
+    def request() -> float:
+        if audio_path is None:
+            return service.warm_up(clip_seconds)
+        start = time.perf_counter()
+        service.process_meeting(audio_path)
+        return time.perf_counter() - start
+
+    print(f"{'Żądanie':>10} | {'Czas [s]':>10}")
+    print("-" * 24)
+    latencies = []
+    for i in range(repeats + 1):
+        latencies.append(request())
+        label = "zimne" if i == 0 else f"ciepłe {i}"
+        print(f"{label:>10} | {latencies[-1]:>10.2f}")
+
+    warm = sorted(latencies[1:])[len(latencies[1:]) // 2] if repeats else float("nan")
+    print(f"\nZimny start: {latencies[0]:.2f}s, ciepły (mediana): {warm:.2f}s, narzut ładowania: {latencies[0] - warm:.2f}s")
+    service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", nargs="?", help="Nagranie testowe (domyślnie sztuczny klip)")
+    parser.add_argument("--repeats", type=int, default=3, help="Liczba ciepłych powtórzeń")
+    args = parser.parse_args()
+    run_benchmark(args.audio, args.repeats)
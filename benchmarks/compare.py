@@ -0,0 +1,63 @@
+# File: benchmarks/compare.py
+"""
+Porównanie dwóch plików wyników bench_pipeline.py (np. z dwóch commitów).
+Kończy się kodem 1, jeśli któryś etap zwolnił lub urósł w pamięci ponad próg.
+
+Uruchomienie:
+    python benchmarks/compare.py stary.json nowy.json [--threshold 0.15] [--min-ms 5.0]
+"""
+
+import sys
+import json
+import argparse
+from typing import Any, Dict, Tuple
+
+
+def load(path: str) -> Tuple[Dict[str, Any], Dict[Tuple[str, str], Dict[str, Any]]]:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return report, {(row["scale"], row["stage"]): row for row in report["results"]}
+
+
+def compare(base_path: str, new_path: str, threshold: float = 0.15, min_ms: float = 5.0) -> int:
+    """
+    :param threshold: Dopuszczalny względny wzrost czasu/pamięci (0.15 = 15%).
+    :param min_ms: Etapy szybsze niż to (w obu przebiegach) nie są oceniane - szum pomiarowy.
+    :return: Liczba regresji.
+    """
+    base_report, base = load(base_path)
+    new_report, new = load(new_path)
+    print(f"Bazowy: {base_report['commit']} ({base_report['created_at']}), nowy: {new_report['commit']} ({new_report['created_at']})\n")
+    print(f"{'skala':>6} | {'etap':>30} | {'czas [ms]':>19} | {'Δ czas':>7} | {'pamięć [MB]':>17} | {'Δ pam.':>7}")
+    print("-" * 102)
+
+    regressions = 0
+    for key in [k for k in new if k in base]:
+        old_row, new_row = base[key], new[key]
+        time_ratio = new_row["seconds"] / old_row["seconds"] if old_row["seconds"] else 1.0
+        memory_ratio = new_row["peak_mb"] / old_row["peak_mb"] if old_row["peak_mb"] else 1.0
+        measurable = max(old_row["seconds"], new_row["seconds"]) * 1000 >= min_ms
+        regressed = measurable and (time_ratio > 1 + threshold or memory_ratio > 1 + threshold)
+        regressions += regressed
+        print(
+            f"{key[0]:>6} | {key[1]:>30} | "
+            f"{old_row['seconds'] * 1000:>8.1f} → {new_row['seconds'] * 1000:>8.1f} | {time_ratio - 1:>+7.0%} | "
+            f"{old_row['peak_mb']:>7.1f} → {new_row['peak_mb']:>7.1f} | {memory_ratio - 1:>+7.0%}"
+            f"{'  ⚠️ REGRESJA' if regressed else ''}"
+        )
+
+    missing = [k for k in base if k not in new]
+    if missing:
+        print(f"\nBrak w nowym przebiegu: {', '.join(f'{s}/{e}' for s, e in missing)}")
+    print(f"\nRegresje powyżej {threshold:.0%}: {regressions}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--min-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    sys.exit(1 if compare(args.base, args.new, args.threshold, args.min_ms) else 0)
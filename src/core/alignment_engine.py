@@ -0,0 +1,132 @@
+# File: src/core/alignment_engine.py
+
+from typing import List, Dict, Any, Sequence, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Kod mówcy dla słów, których nie da się przypisać do żadnego segmentu
+UNKNOWN_CODE = -1
+# Najkrótsza klasa długości segmentów (s); kolejne klasy mają dwukrotnie dłuższy limit
+MIN_BUCKET_SECONDS = 0.5
+
+
+class SpeakerTimeline:
+    """
+    Kolumnowa (NumPy) reprezentacja segmentów diaryzacji.
+    Segmenty są posortowane po czasie startu, etykiety mówców zinternowane do kodów int32.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, codes: np.ndarray, speakers: List[str]):
+        self.starts = starts
+        self.ends = ends
+        self.codes = codes
+        self.speakers = speakers
+        # Segmenty pogrupowane w klasy długości (potęgi dwójki): w klasie o limicie L segment nachodzący
+        # na słowo zaczyna się najwcześniej L przed jego startem, a wszystkie mają co najmniej L/2 -
+        # jedna długa tura nie rozszerza okna kandydatów dla segmentów krótkich.
+        self.buckets: List[Tuple[float, np.ndarray, np.ndarray]] = []
+        if len(starts):
+            lengths = np.maximum(ends - starts, 0.0)
+            classes = np.ceil(np.log2(np.maximum(lengths, MIN_BUCKET_SECONDS) / MIN_BUCKET_SECONDS)).astype(np.int64)
+            for bucket in np.unique(classes).tolist():
+                indices = np.flatnonzero(classes == bucket)  # rosnąco, więc starty w klasie też posortowane
+                self.buckets.append((MIN_BUCKET_SECONDS * 2.0 ** bucket, indices, starts[indices]))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def from_segments(cls, segments: Sequence[Dict[str, Any]]) -> "SpeakerTimeline":
+        """Buduje oś czasu z listy słowników {'start', 'end', 'speaker'} (format AIEngine.diarize)."""
+        n = len(segments)
+        starts = np.fromiter((s['start'] for s in segments), dtype=np.float64, count=n)
+        ends = np.fromiter((s['end'] for s in segments), dtype=np.float64, count=n)
+
+        speakers: List[str] = []
+        lookup: Dict[str, int] = {}
+        codes = np.empty(n, dtype=np.int32)
+        for i, seg in enumerate(segments):
+            code = lookup.get(seg['speaker'])
+            if code is None:
+                code = lookup[seg['speaker']] = len(speakers)
+                speakers.append(seg['speaker'])
+            codes[i] = code
+
+        order = np.argsort(starts, kind="stable")
+        return cls(starts[order], ends[order], codes[order], speakers)
+
+
+class IntervalAlignmentEngine:
+    """
+    Wektorowy silnik przypisywania mówców do słów.
+    Dla każdego słowa wybiera segment o największym pokryciu czasowym (w obrębie tolerancji),
+    przetwarzając wszystkie słowa jednym przebiegiem na tablicach NumPy.
+    """
+
+    def __init__(self, tolerance: float = 0.75, chunk_size: int = 65536):
+        """
+        :param tolerance: Margines (s), w jakim słowo może wystawać poza segment mówcy.
+        :param chunk_size: Liczba słów przetwarzanych naraz (ogranicza pamięć tablic kandydatów).
+        """
+        self.tolerance = tolerance
+        self.chunk_size = chunk_size
+
+    def assign(self, word_starts: np.ndarray, word_ends: np.ndarray, timeline: SpeakerTimeline) -> np.ndarray:
+        """
+        Zwraca tablicę kodów mówców (indeksy w timeline.speakers) dla każdego słowa.
+        Słowa bez kandydata dostają UNKNOWN_CODE.
+        """
+        word_starts = np.asarray(word_starts, dtype=np.float64)
+        word_ends = np.asarray(word_ends, dtype=np.float64)
+        result = np.full(len(word_starts), UNKNOWN_CODE, dtype=np.int32)
+        if len(timeline) == 0 or len(word_starts) == 0:
+            return result
+
+        for offset in range(0, len(word_starts), self.chunk_size):
+            chunk = slice(offset, offset + self.chunk_size)
+            result[chunk] = self._assign_chunk(word_starts[chunk], word_ends[chunk], timeline)
+        return result
+
+    def _assign_chunk(self, ws: np.ndarray, we: np.ndarray, tl: SpeakerTimeline) -> np.ndarray:
+        tol = self.tolerance
+        out = np.full(len(ws), UNKNOWN_CODE, dtype=np.int32)
+
+        # Kandydaci dla słowa i w klasie o limicie długości L: segmenty zaczynające się
+        # w [start słowa - tolerancja - L, koniec słowa + tolerancja]. Liczba par jest ograniczona
+        # przez liczbę nakładających się tur, a nie przez liczbę segmentów pod jedną długą turą.
+        pairs_word, pairs_seg = [], []
+        for max_length, indices, starts in tl.buckets:
+            hi = np.searchsorted(starts, we + tol, side="right")
+            lo = np.searchsorted(starts, ws - tol - max_length, side="left")
+            counts = np.maximum(hi - lo, 0)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            # Rozwinięcie par (słowo, segment-kandydat) do płaskich tablic
+            group_starts = np.cumsum(counts) - counts
+            pairs_word.append(np.repeat(np.arange(len(ws)), counts))
+            pairs_seg.append(indices[np.arange(total) - np.repeat(group_starts, counts) + np.repeat(lo, counts)])
+        if not pairs_word:
+            return out
+        word_idx = np.concatenate(pairs_word)
+        seg_idx = np.concatenate(pairs_seg)
+
+        # Pokrycie (ujemne = odległość od segmentu). Odrzucamy pary poza tolerancją.
+        overlap = np.minimum(we[word_idx], tl.ends[seg_idx]) - np.maximum(ws[word_idx], tl.starts[seg_idx])
+        valid = overlap >= -tol
+        word_idx, seg_idx, overlap = word_idx[valid], seg_idx[valid], overlap[valid]
+        if len(word_idx) == 0:
+            return out
+
+        # Dla każdego słowa bierzemy parę z największym pokryciem (przy remisie wcześniejszy segment)
+        order = np.lexsort((seg_idx, -overlap, word_idx))
+        word_sorted = word_idx[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = word_sorted[1:] != word_sorted[:-1]
+        best = order[first]
+
+        out[word_idx[best]] = tl.codes[seg_idx[best]]
+        return out
@@ -1,8 +1,14 @@
 # File: src/core/services/alignment_service.py
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 
+import numpy as np
+
+from src.core.alignment_engine import IntervalAlignmentEngine, SpeakerTimeline
+from src.core.segmentation import SubtitleSegmenter
+from src.domain.models.columnar import ColumnarTranscript
+
 logger = logging.getLogger(__name__)
 
 class AlignmentService:
@@ -11,6 +17,25 @@ class AlignmentService:
     Nie zależy od konkretnej implementacji AI, operuje na czystych danych.
     """
 
+    def __init__(self, tolerance: float = 0.75, segmenter: Optional[SubtitleSegmenter] = None):
+        """
+        :param tolerance: Margines błędu w sekundach (ludzie często zaczynają mówić minimalnie przed/po wykryciu).
+        :param segmenter: Dodatkowy podział wypowiedzi (długość, przerwy, zdania); None - tylko przy zmianie mówcy.
+        """
+        self.tolerance = tolerance
+        self.engine = IntervalAlignmentEngine(tolerance=tolerance)
+        self.segmenter = segmenter if segmenter is not None and segmenter.enabled else None
+        # Bez segmentera podział tylko po mówcach - ta sama reguła, ścieżka wektorowa
+        self._boundaries = (self.segmenter or SubtitleSegmenter()).boundaries
+
+    def params(self) -> Dict[str, Any]:
+        """Parametry wpływające na wynik alignmentu (np. do klucza cache)."""
+        params: Dict[str, Any] = {"tolerance": self.tolerance}
+        # Bez segmentacji klucze jak dotąd - cache sprzed jej wprowadzenia pozostaje ważny
+        if self.segmenter is not None:
+            params["segmentation"] = self.segmenter.params()
+        return params
+
     def align(self, transcription: Dict[str, Any], segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Główna metoda łącząca.
@@ -34,6 +59,28 @@ class AlignmentService:
         # 3. Grupowanie słów z powrotem w pełne wypowiedzi
         return self._group_words_by_speaker(aligned_words)
 
+    def align_columnar(self, transcription: Dict[str, Any], segments: List[Dict[str, Any]],
+                       filename: str) -> ColumnarTranscript:
+        """
+        Jak align(), ale wynik jest kolumnowy i zachowuje czasy wszystkich słów.
+        Pomija tworzenie słownika per słowo - kody mówców z silnika trafiają wprost do tablic.
+        """
+        words = self._extract_words(transcription) if transcription and segments else []
+        if not words:
+            logger.warning("Brak słów lub segmentów mówców do alignowania.")
+            return ColumnarTranscript.from_words(filename, [], np.empty(0), np.empty(0), np.empty(0, np.int32), [])
+
+        timeline = SpeakerTimeline.from_segments(segments)
+        n = len(words)
+        word_starts = np.fromiter((w['start'] for w in words), dtype=np.float64, count=n)
+        word_ends = np.fromiter((w['end'] for w in words), dtype=np.float64, count=n)
+        codes = self.engine.assign(word_starts, word_ends, timeline)
+        texts = [w['word'].strip() for w in words]
+        return ColumnarTranscript.from_words(
+            filename, texts, word_starts, word_ends, codes, timeline.speakers,
+            boundaries=self._boundaries(texts, word_starts, word_ends, codes)
+        )
+
     def _extract_words(self, transcription: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Spłaszcza strukturę Whispera do prostej listy słów."""
         words = []
@@ -43,64 +90,52 @@ class AlignmentService:
         return words
 
     def _assign_speakers_to_words(self, words: List[Dict[str, Any]], segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Przypisuje etykietę mówcy do każdego słowa na podstawie czasu."""
-        aligned_output = []
-        current_speaker_idx = 0
-        
-        # Sortowanie segmentów jest kluczowe dla optymalizacji, zakładamy że przychodzą posortowane
-        # ale dla pewności:
-        segments = sorted(segments, key=lambda x: x['start'])
-
-        for word in words:
-            word_start, word_end = word['start'], word['end']
-            word_text = word['word']
-            assigned_speaker = "UNKNOWN"
-            
-            # Przeszukujemy segmenty diaryzacji (z optymalizacją indeksu startowego)
-            for i in range(current_speaker_idx, len(segments)):
-                seg = segments[i]
-                
-                # Margines błędu 0.5s (ludzie często zaczynają mówić minimalnie przed/po wykryciu)
-                if (word_start >= seg['start'] - 0.75) and (word_start <= seg['end'] + 0.75):
-                    assigned_speaker = seg['speaker']
-                    current_speaker_idx = i # Nie cofamy się w liście segmentów
-                    break
-            
-            aligned_output.append({
-                "word": word_text.strip(),
-                "start": word_start,
-                "end": word_end,
-                "speaker": assigned_speaker
-            })
-        return aligned_output
+        """
+        Przypisuje etykietę mówcy do każdego słowa na podstawie czasu.
+        Cienki adapter słownikowy na IntervalAlignmentEngine (obliczenia w NumPy).
+        """
+        timeline = SpeakerTimeline.from_segments(segments)
+        n = len(words)
+        word_starts = np.fromiter((w['start'] for w in words), dtype=np.float64, count=n)
+        word_ends = np.fromiter((w['end'] for w in words), dtype=np.float64, count=n)
+
+        codes = self.engine.assign(word_starts, word_ends, timeline)
+
+        # UNKNOWN_CODE (-1) indeksuje ostatni element listy, czyli "UNKNOWN"
+        labels = timeline.speakers + ["UNKNOWN"]
+        return [
+            {
+                "word": word['word'].strip(),
+                "start": word['start'],
+                "end": word['end'],
+                "speaker": labels[code]
+            }
+            for word, code in zip(words, codes.tolist())
+        ]
 
     def _group_words_by_speaker(self, aligned_words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Grupuje ciąg słów tego samego mówcy w jedną wypowiedź."""
+        """
+        Grupuje ciąg słów tego samego mówcy w wypowiedzi (z podziałem segmentera, jeśli jest).
+        Granice liczone raz dla całego ciągu, tekst wypowiedzi sklejany jednym join - koszt liniowy.
+        """
         if not aligned_words: return []
-        
-        grouped = []
-        current_entry = {
-            "speaker": aligned_words[0]['speaker'],
-            "text": aligned_words[0]['word'],
-            "start": aligned_words[0]['start'],
-            "end": aligned_words[0]['end']
-        }
-
-        for word in aligned_words[1:]:
-            if word['speaker'] == current_entry['speaker']:
-                # Kontynuacja wypowiedzi tego samego mówcy
-                current_entry['text'] += " " + word['word']
-                current_entry['end'] = word['end']
-            else:
-                # Zmiana mówcy - zapisujemy obecną i zaczynamy nową
-                grouped.append(current_entry)
-                current_entry = {
-                    "speaker": word['speaker'],
-                    "text": word['word'],
-                    "start": word['start'],
-                    "end": word['end']
-                }
-        
-        # Dodajemy ostatni wpis
-        grouped.append(current_entry)
-        return grouped
\ No newline at end of file
+
+        n = len(aligned_words)
+        texts = [w['word'] for w in aligned_words]
+        starts = np.fromiter((w['start'] for w in aligned_words), dtype=np.float64, count=n)
+        ends = np.fromiter((w['end'] for w in aligned_words), dtype=np.float64, count=n)
+        # Kody mówców tylko do wykrycia zmian - etykiety internowane w kolejności pojawienia się
+        codes_by_label: Dict[str, int] = {}
+        codes = np.fromiter((codes_by_label.setdefault(w['speaker'], len(codes_by_label)) for w in aligned_words),
+                            dtype=np.int64, count=n)
+
+        bounds = self._boundaries(texts, starts, ends, codes).tolist()
+        return [
+            {
+                "speaker": aligned_words[first]['speaker'],
+                "text": " ".join(texts[first:last]),
+                "start": aligned_words[first]['start'],
+                "end": aligned_words[last - 1]['end']
+            }
+            for first, last in zip([0] + bounds, bounds + [n])
+        ]
@@ -0,0 +1,156 @@
+# File: src/core/job_manager.py
+
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from src.domain.models.models import JobInfo, JobState
+from src.infrastructure.metrics import QUEUE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# (etap, postęp 0..1) - ten sam kształt co progress_callback w MeetingService
+ProgressCallback = Callable[[str, float], None]
+
+
+class QueueFullError(Exception):
+    """Kolejka zadań jest pełna - klient powinien spróbować później."""
+
+
+class JobCancelledError(Exception):
+    """Zadanie zostało anulowane w trakcie przetwarzania."""
+
+
+class Job:
+    """Zadanie w kolejce: publiczny stan (JobInfo) + prywatne elementy sterujące."""
+
+    def __init__(self, filename: str, work: Callable[[ProgressCallback], Any], on_finish: Optional[Callable[[], None]]):
+        self.info = JobInfo(job_id=uuid.uuid4().hex, filename=filename)
+        self.work = work
+        self.on_finish = on_finish
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+        self.finished_monotonic: Optional[float] = None
+
+    @property
+    def job_id(self) -> str:
+        return self.info.job_id
+
+    def report(self, stage: str, progress: float):
+        """Callback postępu. Anulowanie działa kooperacyjnie - przerywa przy najbliższym raporcie."""
+        if self.cancel_event.is_set():
+            raise JobCancelledError(f"Zadanie {self.job_id} anulowane")
+        self.info.stage = stage
+        self.info.progress = max(self.info.progress, min(1.0, progress))
+
+
+class JobManager:
+    """
+    Kolejka zadań przetwarzania w tle z ograniczoną pulą wątków.
+    Nie blokuje wywołującego: submit() zwraca zadanie od razu, a stan odczytuje się przez get().
+    Gdy liczba oczekujących zadań przekroczy max_queue, submit() rzuca QueueFullError (backpressure).
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 16, retention_seconds: float = 3600.0):
+        """
+        :param max_workers: Liczba zadań przetwarzanych jednocześnie.
+        :param max_queue: Maksymalna liczba zadań czekających na wolnego workera.
+        :param retention_seconds: Jak długo przechowywać zakończone zadania (wraz z wynikiem).
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, filename: str, work: Callable[[ProgressCallback], Any],
+               on_finish: Optional[Callable[[], None]] = None) -> Job:
+        """
+        Dodaje zadanie do kolejki.
+        :param work: Funkcja wykonująca przetwarzanie; dostaje callback postępu (etap, 0..1).
+        :param on_finish: Sprzątanie wywoływane zawsze po zakończeniu (także po anulowaniu/błędzie).
+        """
+        with self._lock:
+            self._purge_expired()
+            queued = sum(1 for job in self._jobs.values() if job.info.status == JobState.QUEUED)
+            if queued >= self.max_queue:
+                raise QueueFullError(f"Kolejka pełna ({queued}/{self.max_queue} oczekujących zadań)")
+
+            job = Job(filename, work, on_finish)
+            self._jobs[job.job_id] = job
+            job.future = self._executor.submit(self._run, job)
+
+        logger.info(f"Zadanie {job.job_id} ({filename}) dodane do kolejki (oczekujących: {queued + 1})")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Anuluje zadanie. Oczekujące znika z kolejki od razu, uruchomione przerywa się przy kolejnym etapie."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # Nie zdążyło wystartować - _run się nie wykona, więc sprzątamy tutaj
+            self._finish(job, JobState.CANCELLED)
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {state.value: 0 for state in JobState}
+            for job in self._jobs.values():
+                counts[job.info.status.value] += 1
+            return counts
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- Wewnętrzne ---
+
+    def _run(self, job: Job):
+        if job.cancel_event.is_set():
+            self._finish(job, JobState.CANCELLED)
+            return
+
+        job.info.status = JobState.RUNNING
+        job.info.started_at = datetime.now()
+        QUEUE_WAIT_SECONDS.observe((job.info.started_at - job.info.created_at).total_seconds(), queue="jobs")
+        try:
+            job.info.result = job.work(job.report)
+            self._finish(job, JobState.COMPLETED)
+        except JobCancelledError:
+            self._finish(job, JobState.CANCELLED)
+        except Exception as e:
+            logger.error(f"Zadanie {job.job_id} zakończone błędem: {e}")
+            job.info.error = str(e)
+            self._finish(job, JobState.FAILED)
+
+    def _finish(self, job: Job, state: JobState):
+        job.info.status = state
+        job.info.finished_at = datetime.now()
+        if state == JobState.COMPLETED:
+            job.info.progress = 1.0
+        job.finished_monotonic = time.monotonic()
+        if job.on_finish is not None:
+            try:
+                job.on_finish()
+            except Exception as e:
+                logger.warning(f"Błąd sprzątania po zadaniu {job.job_id}: {e}")
+        logger.info(f"Zadanie {job.job_id}: {state.value}")
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_monotonic is not None and now - job.finished_monotonic > self.retention_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
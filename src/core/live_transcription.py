@@ -0,0 +1,363 @@
+# File: src/core/live_transcription.py
+
+import time
+import uuid
+import logging
+import threading
+from contextlib import nullcontext
+from typing import List, Dict, Any, Optional, Callable, ContextManager
+
+import numpy as np
+
+from src.core.alignment_engine import IntervalAlignmentEngine, SpeakerTimeline, UNKNOWN_CODE
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.audio_loader import AudioBuffer, SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# Formaty ramek PCM przyjmowanych przez sesję: typ próbki i dzielnik do zakresu [-1, 1]
+PCM_FORMATS = {"pcm_s16le": ("<i2", 32768.0), "pcm_f32le": ("<f4", 1.0)}
+
+
+class PCMFrameDecoder:
+    """
+    Zamienia ramki PCM na próbki float32. Ramka nie musi kończyć się na granicy próbki -
+    niepełna próbka z końca ramki jest doklejana do początku następnej.
+    """
+
+    def __init__(self, sample_format: str = "pcm_s16le"):
+        if sample_format not in PCM_FORMATS:
+            raise ValueError(f"Nieobsługiwany format PCM: {sample_format} (dostępne: {list(PCM_FORMATS)})")
+        self.dtype, self.scale = PCM_FORMATS[sample_format]
+        self.width = np.dtype(self.dtype).itemsize
+        self._remainder = b""
+
+    def decode(self, frame: bytes) -> np.ndarray:
+        data = self._remainder + frame if self._remainder else frame
+        usable = len(data) - len(data) % self.width
+        self._remainder = data[usable:]
+        samples = np.frombuffer(data, dtype=self.dtype, count=usable // self.width)
+        if self.scale != 1.0:
+            return samples.astype(np.float32) / self.scale
+        return samples.astype(np.float32, copy=False)
+
+
+class LiveTranscriptionSession:
+    """
+    Transkrypcja na żywo ze strumienia PCM (16kHz mono float32).
+
+    ASR liczony jest przyrostowo na oknie od ostatniego zatwierdzonego słowa do końca bufora:
+    słowa kończące się wcześniej niż commit_lag przed końcem audio są zatwierdzane (zdarzenie 'final'),
+    reszta wysyłana jest jako 'partial' (zastępowana przy kolejnym kroku).
+    Co diarize_every_seconds audio uruchamiana jest diaryzacja ostatniego fragmentu, a etykiety
+    Pyannote są mapowane na stabilne etykiety sesji - zmiany mówców wysyłane są jako 'speaker_update'.
+    """
+
+    def __init__(self, ai_engine: Optional[AIEngine] = None, session_id: Optional[str] = None,
+                 step_seconds: float = 1.0, window_seconds: float = 20.0, commit_lag_seconds: float = 2.0,
+                 diarize_every_seconds: float = 15.0, diarization_window_seconds: float = 120.0,
+                 engine_lease: Optional[Callable[[], ContextManager[AIEngine]]] = None):
+        """
+        :param ai_engine: Silnik na wyłączność sesji (gdy nie podano engine_lease).
+        :param step_seconds: Minimalna ilość nowego audio między kolejnymi wywołaniami ASR.
+        :param window_seconds: Maksymalna długość niezatwierdzonego okna (po przekroczeniu wymuszamy zatwierdzenie).
+        :param commit_lag_seconds: Słowa bliżej końca bufora niż ta wartość pozostają częściowe.
+        :param diarize_every_seconds: Co ile sekund audio uzgadniać mówców (0 = bez diaryzacji).
+        :param diarization_window_seconds: Jak daleko wstecz diaryzacja obejmuje audio.
+        :param engine_lease: Wypożycza silnik na jedno wywołanie ASR/diaryzacji (np. ModelPool.inference) -
+                             sesja nie trzyma repliki między krokami i respektuje sloty urządzenia.
+        """
+        if ai_engine is None and engine_lease is None:
+            raise ValueError("Sesja na żywo wymaga ai_engine lub engine_lease.")
+        self.session_id = session_id or uuid.uuid4().hex
+        self.ai_engine = ai_engine
+        self.engine_lease = engine_lease
+        self.step_seconds = step_seconds
+        self.window_seconds = window_seconds
+        self.commit_lag_seconds = commit_lag_seconds
+        self.diarize_every_seconds = diarize_every_seconds
+        self.diarization_window_seconds = diarization_window_seconds
+        self.alignment_engine = IntervalAlignmentEngine()
+
+        self._lock = threading.Lock()
+        # Bufor trzyma tylko ogon nagrania potrzebny do ASR i diaryzacji (stała pamięć)
+        self._audio = np.empty(0, dtype=np.float32)
+        self._incoming: List[np.ndarray] = []  # porcje dołączane do bufora dopiero w kroku (bez kopiowania przy każdej)
+        self._audio_offset = 0          # indeks (globalny) pierwszej próbki w buforze
+        self._total_samples = 0
+        # Czas nadejścia kolejnych porcji audio: (globalny koniec porcji w próbkach, zegar monotoniczny)
+        self._arrival_ends: List[int] = []
+        self._arrival_times: List[float] = []
+
+        self._committed_until = 0.0     # sekundy - wszystko wcześniej jest zatwierdzone
+        self._last_asr_samples = 0
+        self._last_diarization_samples = 0
+        self._partial_text = ""
+
+        # Zatwierdzone słowa i segmenty z okna diaryzacji (do ponownego przypisania mówców)
+        self._words: List[Dict[str, Any]] = []
+        self._segments: List[Dict[str, Any]] = []
+        self._segment_offset = 0        # segment_id pierwszego segmentu w self._segments
+        self._next_speaker = 0
+
+        # Metryki
+        self._started_at: Optional[float] = None
+        self._first_text_at: Optional[float] = None
+        self._latencies: List[float] = []
+        self._asr_calls = 0
+        self._asr_seconds = 0.0
+        self._diarization_runs = 0
+        self._diarization_seconds = 0.0
+
+    # --- Wejście ---
+
+    def append_audio(self, samples: np.ndarray):
+        """Dokłada porcję audio (szybkie - wywoływane z pętli odbierającej)."""
+        now = time.monotonic()
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = now
+            self._incoming.append(np.asarray(samples, dtype=np.float32))
+            self._total_samples += len(samples)
+            self._arrival_ends.append(self._total_samples)
+            self._arrival_times.append(now)
+
+    def has_pending_step(self) -> bool:
+        with self._lock:
+            return self._total_samples - self._last_asr_samples >= self.step_seconds * SAMPLE_RATE
+
+    # --- Przetwarzanie ---
+
+    def step(self, force_final: bool = False) -> List[Dict[str, Any]]:
+        """
+        Jeden krok przyrostowy: ASR na niezatwierdzonym oknie (+ ewentualnie diaryzacja).
+        :param force_final: Zatwierdź wszystkie słowa (koniec strumienia).
+        :return: Lista zdarzeń do wysłania klientowi.
+        """
+        with self._lock:
+            if self._incoming:
+                self._audio = np.concatenate([self._audio, *self._incoming])
+                self._incoming = []
+            total = self._total_samples
+            window_start = max(int(self._committed_until * SAMPLE_RATE), self._audio_offset)
+            window = self._audio[window_start - self._audio_offset:].copy()
+            self._last_asr_samples = total
+
+        events: List[Dict[str, Any]] = []
+        if len(window) > 0:
+            events.extend(self._transcribe_window(window, window_start, total, force_final))
+
+        if self.diarize_every_seconds and (
+            force_final or total - self._last_diarization_samples >= self.diarize_every_seconds * SAMPLE_RATE
+        ):
+            events.extend(self._reconcile_speakers(total))
+
+        self._trim_buffer()
+        return events
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Zamyka strumień: zatwierdza resztę słów i uzgadnia mówców."""
+        events = self.step(force_final=True)
+        events.append({"type": "metrics", **self.metrics()})
+        return events
+
+    def _transcribe_window(self, window: np.ndarray, window_start: int, total: int, force_final: bool):
+        with self._engine() as engine:
+            t0 = time.perf_counter()
+            result = engine.transcribe(AudioBuffer(window, name=f"live-{self.session_id[:8]}"))
+        self._asr_calls += 1
+        self._asr_seconds += time.perf_counter() - t0
+
+        offset = window_start / SAMPLE_RATE
+        words = [
+            {"word": w['word'].strip(), "start": w['start'] + offset, "end": w['end'] + offset}
+            for seg in result.get('segments', []) for w in seg.get('words', [])
+        ]
+
+        audio_end = total / SAMPLE_RATE
+        commit_before = audio_end if force_final else audio_end - self.commit_lag_seconds
+        if not force_final and audio_end - offset > self.window_seconds:
+            if not words:
+                # Długa cisza - przesuwamy początek okna, żeby nie rosło bez końca
+                self._committed_until = audio_end - self.commit_lag_seconds
+                return []
+            # Okno za długie - zatwierdzamy wszystko poza ostatnim słowem
+            commit_before = max(commit_before, words[-1]['start'])
+
+        num_final = 0
+        while num_final < len(words) and words[num_final]['end'] <= commit_before:
+            num_final += 1
+        final_words, partial_words = words[:num_final], words[num_final:]
+        events = []
+
+        if final_words:
+            segment = self._commit(final_words)
+            events.append(self._with_latency({"type": "final", **segment}, final_words[-1]['end']))
+
+        partial_text = " ".join(w['word'] for w in partial_words)
+        if partial_text != self._partial_text:
+            self._partial_text = partial_text
+            event = {"type": "partial", "text": partial_text,
+                     "start": partial_words[0]['start'] if partial_words else audio_end, "end": audio_end}
+            events.append(self._with_latency(event, partial_words[-1]['end'] if partial_words else None))
+        return events
+
+    def _commit(self, words: List[Dict[str, Any]]) -> Dict[str, Any]:
+        segment_id = self._segment_offset + len(self._segments)
+        for w in words:
+            w['segment_id'] = segment_id
+        self._words.extend(words)
+        self._committed_until = words[-1]['end']
+
+        segment = {
+            "segment_id": segment_id,
+            "start": words[0]['start'],
+            "end": words[-1]['end'],
+            "text": " ".join(w['word'] for w in words),
+            # Etykieta tymczasowa - ostatni znany mówca; uzgadniana po kolejnej diaryzacji
+            "speaker": self._segments[-1]['speaker'] if self._segments else "SPEAKER_?",
+            "provisional": True,
+        }
+        self._segments.append(segment)
+        return segment
+
+    def _engine(self) -> ContextManager[AIEngine]:
+        return self.engine_lease() if self.engine_lease is not None else nullcontext(self.ai_engine)
+
+    # --- Mówcy ---
+
+    def _reconcile_speakers(self, total: int) -> List[Dict[str, Any]]:
+        self._last_diarization_samples = total
+        with self._lock:
+            start = max(self._audio_offset, total - int(self.diarization_window_seconds * SAMPLE_RATE))
+            audio = self._audio[start - self._audio_offset:].copy()
+        if len(audio) < SAMPLE_RATE:
+            return []
+
+        with self._engine() as engine:
+            t0 = time.perf_counter()
+            raw_turns = engine.diarize(AudioBuffer(audio, name=f"live-{self.session_id[:8]}"))
+        offset = start / SAMPLE_RATE
+        turns = [{**turn, "start": turn['start'] + offset, "end": turn['end'] + offset} for turn in raw_turns]
+        self._diarization_runs += 1
+        self._diarization_seconds += time.perf_counter() - t0
+
+        words = [w for w in self._words if w['end'] > offset]
+        if not turns or not words:
+            return []
+
+        timeline = SpeakerTimeline.from_segments(turns)
+        codes = self.alignment_engine.assign(
+            np.array([w['start'] for w in words]), np.array([w['end'] for w in words]), timeline
+        )
+        mapping = self._map_to_session_labels(words, codes, timeline.speakers)
+
+        # Większość słów segmentu decyduje o mówcy
+        votes: Dict[int, Dict[str, float]] = {}
+        for w, code in zip(words, codes.tolist()):
+            if code == UNKNOWN_CODE:
+                continue
+            w['speaker'] = mapping[timeline.speakers[code]]
+            seg_votes = votes.setdefault(w['segment_id'], {})
+            seg_votes[w['speaker']] = seg_votes.get(w['speaker'], 0.0) + (w['end'] - w['start'])
+
+        events = []
+        for segment_id, seg_votes in sorted(votes.items()):
+            segment = self._segments[segment_id - self._segment_offset]
+            speaker = max(seg_votes, key=seg_votes.get)
+            if speaker != segment['speaker'] or segment['provisional']:
+                segment['speaker'] = speaker
+                segment['provisional'] = False
+                events.append({"type": "speaker_update", "segment_id": segment_id, "speaker": speaker})
+        return events
+
+    def _map_to_session_labels(self, words, codes: np.ndarray, labels: List[str]) -> Dict[str, str]:
+        """
+        Etykiety Pyannote nie są stabilne między przebiegami - mapujemy je na etykiety sesji
+        według największego pokrycia ze słowami, którym sesja już nadała mówcę.
+        """
+        overlap: Dict[tuple, float] = {}
+        for w, code in zip(words, codes.tolist()):
+            previous = w.get('speaker')
+            if code != UNKNOWN_CODE and previous:
+                key = (labels[code], previous)
+                overlap[key] = overlap.get(key, 0.0) + (w['end'] - w['start'])
+
+        mapping: Dict[str, str] = {}
+        used = set()
+        for (label, session_label), _ in sorted(overlap.items(), key=lambda kv: -kv[1]):
+            if label not in mapping and session_label not in used:
+                mapping[label] = session_label
+                used.add(session_label)
+        for label in labels:
+            if label not in mapping:
+                mapping[label] = f"SPEAKER_{self._next_speaker:02d}"
+                self._next_speaker += 1
+        return mapping
+
+    # --- Metryki ---
+
+    def _with_latency(self, event: Dict[str, Any], audio_time: Optional[float]) -> Dict[str, Any]:
+        """Dopisuje opóźnienie: od nadejścia audio z końcem ostatniego słowa do wysłania tekstu."""
+        now = time.monotonic()
+        if self._first_text_at is None and event.get("text"):
+            self._first_text_at = now
+        if audio_time is not None:
+            with self._lock:
+                idx = int(np.searchsorted(self._arrival_ends, int(audio_time * SAMPLE_RATE), side="left"))
+                idx = min(idx, len(self._arrival_times) - 1)
+                arrived = self._arrival_times[idx]
+            latency = now - arrived
+            self._latencies.append(latency)
+            event["latency_ms"] = round(latency * 1000, 1)
+        return event
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = np.array(self._latencies) * 1000 if self._latencies else None
+        audio_seconds = self._total_samples / SAMPLE_RATE
+        return {
+            "session_id": self.session_id,
+            "audio_seconds": round(audio_seconds, 2),
+            "first_text_latency_ms": round((self._first_text_at - self._started_at) * 1000, 1)
+            if self._first_text_at is not None and self._started_at is not None else None,
+            "latency_ms": {
+                "count": len(self._latencies),
+                "mean": round(float(latencies.mean()), 1),
+                "p50": round(float(np.percentile(latencies, 50)), 1),
+                "p95": round(float(np.percentile(latencies, 95)), 1),
+                "max": round(float(latencies.max()), 1),
+            } if latencies is not None else None,
+            "asr_calls": self._asr_calls,
+            "asr_real_time_factor": round(self._asr_seconds / audio_seconds, 3) if audio_seconds else None,
+            "diarization_runs": self._diarization_runs,
+            "diarization_seconds": round(self._diarization_seconds, 2),
+            "segments": self._segment_offset + len(self._segments),
+        }
+
+    # --- Pamięć ---
+
+    def _trim_buffer(self):
+        """Usuwa z bufora audio, którego nie potrzebuje już ani ASR, ani diaryzacja."""
+        with self._lock:
+            keep_from = int(self._committed_until * SAMPLE_RATE)
+            if self.diarize_every_seconds:
+                keep_from = min(keep_from, self._total_samples - int(self.diarization_window_seconds * SAMPLE_RATE))
+            keep_from = max(keep_from, self._audio_offset)
+            if keep_from > self._audio_offset:
+                self._audio = self._audio[keep_from - self._audio_offset:].copy()
+                self._audio_offset = keep_from
+                # Czasy nadejścia potrzebne są tylko dla audio, które może jeszcze dać tekst
+                drop = int(np.searchsorted(self._arrival_ends, keep_from, side="left"))
+                if drop:
+                    del self._arrival_ends[:drop]
+                    del self._arrival_times[:drop]
+            # Stare słowa poza oknem diaryzacji nie zmienią już mówcy
+            horizon = (self._total_samples / SAMPLE_RATE) - self.diarization_window_seconds
+            if self._words and self._words[0]['end'] < horizon:
+                self._words = [w for w in self._words if w['end'] >= horizon]
+            # Segmenty bez słów w oknie też - zostaje ostatni (jego mówca przechodzi na nowe segmenty)
+            first_kept = self._words[0]['segment_id'] if self._words else self._segment_offset + len(self._segments)
+            drop = min(first_kept - self._segment_offset, len(self._segments) - 1)
+            if drop > 0:
+                del self._segments[:drop]
+                self._segment_offset += drop
@@ -1,13 +1,71 @@
 import os
+import time
+import uuid
+import sqlite3
 import logging
-from typing import List, Dict, Any
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Callable
 
-from src.infrastructure.ai_engine import AIEngine
+import numpy as np
+
+from src.infrastructure.ai_engine import AIEngine, validate_speaker_hints
+from src.infrastructure.artifact_store import ArtifactStore, MeetingNotFoundError
+from src.infrastructure.asr_backends import create_asr_backend
+from src.infrastructure.asr_batching import ASRBatcher
+from src.infrastructure.audio_loader import AudioBuffer, SAMPLE_RATE, load_audio
+from src.infrastructure.model_manager import ModelManager
+from src.infrastructure.metrics import (
+    AUDIO_SECONDS_TOTAL, MEETINGS_TOTAL, REAL_TIME_FACTOR, VAD_SAVED_SECONDS_TOTAL, VAD_SKIPPED_SECONDS_TOTAL,
+    record_stages, span, timed_wait
+)
+from src.infrastructure.result_cache import ResultCache, hash_file, make_key
+from src.infrastructure.search_index import TranscriptSearchIndex
+from src.infrastructure.transcript_store import TranscriptStore
+from src.infrastructure.settings import Settings
+from src.infrastructure.speaker_index import SpeakerIndex
+from src.infrastructure.vad import MIN_SKIPPED_SECONDS, EnergyVAD, SpeechMap
 from src.core.alignment_service import AlignmentService
-from src.domain.models.models import MeetingTranscript, TranscriptionSegment
+from src.core.segmentation import SubtitleSegmenter
+from src.domain.models.columnar import ColumnarTranscript
+from src.domain.models.models import MeetingTranscript, SpeakerIdentity
 
 logger = logging.getLogger(__name__)
 
+EXECUTION_MODES = ("auto", "parallel", "sequential")
+EXECUTOR_KINDS = ("thread", "process")
+
+# (etap, postęp całości 0..1)
+ProgressCallback = Callable[[str, float], None]
+
+# --- Funkcje robocze dla ProcessPoolExecutor ---
+# Każdy proces roboczy trzyma własny AIEngine (modele ładują się raz na proces).
+_worker_engine: Optional[AIEngine] = None
+
+
+def _init_worker(engine_config: Dict[str, Any]):
+    global _worker_engine
+    _worker_engine = AIEngine(**engine_config)
+
+
+def _worker_transcribe(audio: AudioBuffer) -> Tuple[Dict[str, Any], float]:
+    start = time.perf_counter()
+    result = _worker_engine.transcribe(audio)
+    return result, time.perf_counter() - start
+
+
+def _worker_diarize(audio: AudioBuffer, speaker_hints: Optional[Dict[str, int]] = None,
+                    return_embeddings: bool = False) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = _worker_engine.diarize(audio, speaker_hints, return_embeddings)
+    return result, time.perf_counter() - start
+
+
+def _no_progress(stage: str, progress: float):
+    pass
+
+
 class MeetingService:
     """
     Serwis aplikacyjny (Use Case).
@@ -15,45 +73,721 @@ class MeetingService:
     Audio -> ASR -> Diaryzacja -> Alignment -> Model Domenowy.
     """
 
-    def __init__(self):
-        # Wstrzykiwanie zależności (na razie hardcoded, później można użyć Dependency Injection)
-        self.ai_engine = AIEngine()
-        self.alignment_service = AlignmentService()
+    def __init__(self, ai_engine: Optional[AIEngine] = None, execution_mode: str = "auto", executor: str = "thread",
+                 cache: Optional[ResultCache] = None, inference_slots: Optional[threading.Semaphore] = None,
+                 artifacts: Optional[ArtifactStore] = None, speaker_index: Optional[SpeakerIndex] = None,
+                 speaker_threshold: float = 0.6, vad: Optional[EnergyVAD] = None,
+                 search_index: Optional[TranscriptSearchIndex] = None,
+                 transcript_store: Optional[TranscriptStore] = None,
+                 segmenter: Optional[SubtitleSegmenter] = None):
+        """
+        :param execution_mode: 'parallel' - ASR i diaryzacja równolegle, 'sequential' - jedno po drugim,
+                               'auto' - równolegle, chyba że oba etapy liczą na tym samym urządzeniu.
+        :param executor: 'thread' lub 'process' - na czym uruchamiać etapy w trybie równoległym.
+        :param cache: Cache wyników adresowany treścią audio (None = bez cache).
+        :param inference_slots: Semafor ograniczający liczbę równoczesnych inferencji na urządzeniu
+                                (współdzielony między instancjami serwisu). Dekodowanie i cache go nie zajmują.
+        :param artifacts: Magazyn surowych wyników etapów per spotkanie (None = bez rediarize/realign).
+        :param speaker_index: Indeks głosów zapisanych osób - mówcy rozpoznani powyżej speaker_threshold
+                              (podobieństwo cosinusowe) dostają w transkrypcie nazwę osoby.
+        :param vad: Detekcja mowy - modele dostają tylko fragmenty z mową, a czasy słów i tur
+                    wracają na oś oryginalnego nagrania przed alignmentem (None = całe audio).
+        :param search_index: Indeks pełnotekstowy - każdy nowy lub przeliczony transkrypt trafia do niego od razu.
+        :param transcript_store: Trwały magazyn transkryptów (odczyt fragmentów wg czasu i mówcy) - zapis jak do indeksu.
+        :param segmenter: Podział wypowiedzi na segmenty o długości napisów (None = tylko przy zmianie mówcy).
+        """
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Nieznany tryb wykonania: {execution_mode} (dostępne: {EXECUTION_MODES})")
+        if executor not in EXECUTOR_KINDS:
+            raise ValueError(f"Nieznany rodzaj executora: {executor} (dostępne: {EXECUTOR_KINDS})")
+
+        # Wstrzykiwanie zależności (domyślnie tworzymy własny silnik)
+        self.ai_engine = ai_engine or AIEngine()
+        self.alignment_service = AlignmentService(segmenter=segmenter)
+        self.execution_mode = execution_mode
+        self.executor_kind = executor
+        self.cache = cache
+        self.inference_slots = inference_slots
+        self.artifacts = artifacts
+        self.speaker_index = speaker_index
+        self.speaker_threshold = speaker_threshold
+        self.vad = vad
+        self.search_index = search_index
+        self.transcript_store = transcript_store
+
+        # Osobny, jednowątkowy/jednoprocesowy executor na każdy etap - dzięki temu
+        # w trybie 'process' każdy proces ładuje tylko swój model.
+        self._executors: Dict[str, Executor] = {}
+
+        # Rozbicie czasu ostatniego przebiegu na etapy (sekundy)
+        self.last_timings: Dict[str, float] = {}
+        # Przyrost pamięci procesu (RSS, bajty) w trakcie etapów ostatniego przebiegu
+        self.last_memory: Dict[str, int] = {}
+        # Długość ostatniego nagrania (s); None, gdy wynik pochodził z cache bez dekodowania
+        self.last_audio_duration: Optional[float] = None
+        # Sekundy ciszy wycięte przez VAD w ostatnim przebiegu (0.0, gdy nic nie wycięto)
+        self.last_skipped_audio: float = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings, cache: Optional[ResultCache] = None,
+                      inference_slots: Optional[threading.Semaphore] = None,
+                      artifacts: Optional[ArtifactStore] = None,
+                      speaker_index: Optional[SpeakerIndex] = None,
+                      search_index: Optional[TranscriptSearchIndex] = None,
+                      transcript_store: Optional[TranscriptStore] = None,
+                      asr_batcher: Optional[ASRBatcher] = None,
+                      model_manager: Optional[ModelManager] = None) -> "MeetingService":
+        """
+        Buduje serwis na podstawie konfiguracji (zmienne środowiskowe CORETRANSCRIPT_*).
+        :param cache: Współdzielony cache (np. między replikami w puli); domyślnie tworzony z ustawień.
+        :param inference_slots: Współdzielony semafor urządzenia; domyślnie nowy z settings.device_slots.
+        :param artifacts: Współdzielony magazyn artefaktów spotkań; domyślnie tworzony z ustawień.
+        :param speaker_index: Współdzielony indeks głosów; domyślnie wczytywany z ustawień (jeśli włączony).
+        :param search_index: Współdzielony indeks wyszukiwania; domyślnie otwierany z ustawień (jeśli włączony).
+        :param transcript_store: Współdzielony magazyn transkryptów; domyślnie otwierany z ustawień (jeśli włączony).
+        :param asr_batcher: Współdzielona kolejka partii ASR; domyślnie tworzona, gdy settings.asr_batch_size > 1.
+        :param model_manager: Współdzielony menedżer pamięci modeli; domyślnie tworzony z ustawień.
+        """
+        if cache is None and settings.cache_enabled:
+            cache = ResultCache(settings.cache_dir, max_bytes=settings.cache_max_mb * 1024 * 1024)
+        if artifacts is None and settings.artifacts_enabled:
+            artifacts = ArtifactStore(settings.artifacts_dir, max_bytes=settings.artifacts_max_mb * 1024 * 1024)
+        if speaker_index is None and settings.speaker_index_enabled:
+            speaker_index = SpeakerIndex(settings.speaker_index_path, approximate=settings.speaker_index_approximate)
+        if search_index is None and settings.search_index_enabled:
+            search_index = TranscriptSearchIndex(settings.search_index_path)
+        if transcript_store is None and settings.transcript_store_enabled:
+            transcript_store = TranscriptStore(settings.transcript_store_path)
+        if model_manager is None:
+            model_manager = cls.create_model_manager(settings)
+        if asr_batcher is None and settings.asr_batch_size > 1:
+            asr_batcher = cls.create_asr_batcher(settings)
+        return cls(
+            ai_engine=AIEngine(
+                asr_model=settings.asr_model,
+                asr_chunk_seconds=settings.asr_chunk_seconds,
+                asr_chunk_overlap=settings.asr_chunk_overlap,
+                asr_workers=settings.asr_workers,
+                asr_backend=settings.asr_backend,
+                asr_threads=settings.asr_threads,
+                asr_compute_type=settings.asr_compute_type,
+                asr_batcher=asr_batcher,
+                model_manager=model_manager
+            ),
+            execution_mode=settings.execution_mode,
+            executor=settings.executor,
+            cache=cache,
+            artifacts=artifacts,
+            speaker_index=speaker_index,
+            speaker_threshold=settings.speaker_match_threshold,
+            vad=EnergyVAD(
+                threshold_db=settings.vad_threshold_db,
+                min_silence_seconds=settings.vad_min_silence_seconds,
+                padding_seconds=settings.vad_padding_seconds
+            ) if settings.vad_enabled else None,
+            search_index=search_index,
+            transcript_store=transcript_store,
+            segmenter=SubtitleSegmenter(
+                max_duration=settings.segment_max_seconds,
+                max_pause=settings.segment_max_pause_seconds,
+                split_sentences=settings.segment_split_sentences
+            ),
+            # Sloty urządzenia: równoległe zadania czekają w kolejce zamiast przeciążać model
+            inference_slots=inference_slots or threading.BoundedSemaphore(settings.device_slots)
+        )
+
+    @staticmethod
+    def create_model_manager(settings: Settings) -> ModelManager:
+        """Menedżer pamięci modeli z budżetem i czasem bezczynności z ustawień (0 = bez limitu)."""
+        return ModelManager(budget_bytes=settings.models_memory_budget_mb * 1024 * 1024,
+                            idle_seconds=settings.models_idle_seconds)
+
+    @staticmethod
+    def create_asr_batcher(settings: Settings) -> ASRBatcher:
+        """Kolejka partii ASR z własnym backendem - jeden model ASR dla wszystkich korzystających z niej serwisów."""
+        backend = create_asr_backend(settings.asr_backend, settings.asr_model, threads=settings.asr_threads,
+                                     compute_type=settings.asr_compute_type, workers=settings.asr_workers)
+        return ASRBatcher(backend, max_batch_size=settings.asr_batch_size, max_wait_ms=settings.asr_batch_wait_ms)
 
-    def process_meeting(self, file_path: str) -> MeetingTranscript:
+    def process_meeting(self, file_path: str, content_hash: Optional[str] = None,
+                        progress_callback: Optional[ProgressCallback] = None,
+                        filename: Optional[str] = None) -> MeetingTranscript:
         """
         Przetwarza plik audio i zwraca gotowy obiekt MeetingTranscript.
+        Plik jest dekodowany raz, a ten sam bufor PCM trafia do ASR i diaryzacji.
+        :param content_hash: SHA-256 zawartości pliku, jeśli już znany (np. policzony przy uploadzie).
+        :param progress_callback: Wywoływany z (etap, postęp 0..1) na granicach etapów.
+        :param filename: Nazwa pliku w wyniku (domyślnie nazwa pliku z file_path).
         """
+        report = progress_callback or _no_progress
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Nie znaleziono pliku: {file_path}")
 
         logger.info(f"Rozpoczynam przetwarzanie spotkania: {file_path}")
+        filename = filename or os.path.basename(file_path)
+        self.last_audio_duration = None
+        timings: Dict[str, float] = {}
+        memory: Dict[str, int] = {}
+        total_start = time.perf_counter()
+
+        # 0. Cache: to samo nagranie z tymi samymi parametrami nie przechodzi ponownie przez modele
+        if self.cache is not None:
+            report("hash", 0.0)
+            with span("hash", timings):
+                content_hash = content_hash or hash_file(file_path)
+            with span("cache", timings):
+                cached = self._get_cached_transcript(content_hash, filename)
+            if cached is not None:
+                return self._finish(cached, timings, memory, total_start, source="cache")
+
+        report("decode", 0.02)
+        # Procesy robocze dostają bufor przez plik mapowany w pamięć (bez kopiowania próbek)
+        force_memmap = self.executor_kind == "process" and self._use_parallel()
+        with span("decode", timings, memory):
+            audio = load_audio(file_path, force_memmap=force_memmap)
+        with audio:
+            transcript = self._process_uncached(audio, filename, content_hash, report, timings, memory)
+        return self._finish(transcript, timings, memory, total_start, source="pipeline")
+
+    def process_audio(self, audio: AudioBuffer, filename: str, content_hash: Optional[str] = None,
+                      progress_callback: Optional[ProgressCallback] = None,
+                      keep_artifacts: bool = True) -> MeetingTranscript:
+        """
+        Przetwarza już zdekodowane audio (16kHz mono float32) i zwraca MeetingTranscript.
+        :param content_hash: Hash treści nagrania - włącza cache etapów (ASR, diaryzacja, transkrypt).
+        :param keep_artifacts: Czy zapisać artefakty etapów (False np. dla klipu rozgrzewającego).
+        """
+        self.last_audio_duration = audio.duration
+        timings: Dict[str, float] = {}
+        memory: Dict[str, int] = {}
+        total_start = time.perf_counter()
+        if self.cache is not None and content_hash is not None:
+            with span("cache", timings):
+                cached = self._get_cached_transcript(content_hash, filename)
+            if cached is not None:
+                return self._finish(cached, timings, memory, total_start, source="cache")
+        transcript = self._process_uncached(audio, filename, content_hash, progress_callback or _no_progress,
+                                            timings, memory, keep_artifacts)
+        return self._finish(transcript, timings, memory, total_start, source="pipeline", searchable=keep_artifacts)
+
+    # --- Ponowne przeliczenie etapów (bez ASR) ---
+
+    def rediarize(self, meeting_id: str, num_speakers: Optional[int] = None, min_speakers: Optional[int] = None,
+                  max_speakers: Optional[int] = None,
+                  progress_callback: Optional[ProgressCallback] = None) -> MeetingTranscript:
+        """
+        Ponowna diaryzacja zapisanego spotkania z podpowiedziami liczby mówców, a potem alignment
+        z zapisanym wynikiem ASR - Whisper nie jest uruchamiany, audio nie jest dekodowane.
+        Nowa diaryzacja zastępuje zapisaną (kolejny realign użyje już jej).
+        """
+        report = progress_callback or _no_progress
+        store = self._require_artifacts()
+        hints = validate_speaker_hints(
+            {"num_speakers": num_speakers, "min_speakers": min_speakers, "max_speakers": max_speakers}
+        )
+        self.last_skipped_audio = 0.0
+        timings: Dict[str, float] = {}
+        memory: Dict[str, int] = {}
+        total_start = time.perf_counter()
+
+        with span("load_artifacts", timings):
+            metadata = store.metadata(meeting_id)
+            raw_transcription = store.load_stage(meeting_id, "asr")
+            audio = store.open_audio(meeting_id)
+        self.last_audio_duration = audio.duration
+        with audio, self._speech_only(audio, timings, memory) as (model_audio, speech_map):
+            with self._inference_slot(report):
+                report("diarization", 0.05)
+                with span("diarization", timings, memory):
+                    raw_diarization, speaker_embeddings = self._diarize(model_audio, hints)
+            if speech_map is not None:
+                raw_diarization = speech_map.map_turns(raw_diarization)
+                self._record_vad_savings(speech_map, timings)
+        self._record_real_time_factor(timings, audio.duration)
+
+        store.save_stage(meeting_id, "diarization", raw_diarization)
+        if speaker_embeddings is not None:
+            store.save_stage(meeting_id, "embeddings", speaker_embeddings)
+        store.update_metadata(meeting_id, {"diarization": self.ai_engine.diarization_fingerprint(hints)})
+        transcript = self._align_stored(meeting_id, metadata, raw_transcription, raw_diarization, speaker_embeddings,
+                                        self._stored_alignment(metadata), report, timings, memory)
+        if self.last_skipped_audio:
+            transcript = transcript.model_copy(update={"skipped_audio": round(self.last_skipped_audio, 2)})
+        return self._finish(transcript, timings, memory, total_start, source="rediarize")
+
+    def realign(self, meeting_id: str, tolerance: Optional[float] = None,
+                progress_callback: Optional[ProgressCallback] = None) -> MeetingTranscript:
+        """
+        Ponowny alignment zapisanych wyników ASR i diaryzacji (bez modeli).
+        :param tolerance: Nowa tolerancja alignmentu (s); None = zapisana dla spotkania (lub domyślna serwisu).
+        """
+        report = progress_callback or _no_progress
+        store = self._require_artifacts()
+        if tolerance is not None and tolerance < 0:
+            raise ValueError("Tolerancja alignmentu nie może być ujemna.")
+        timings: Dict[str, float] = {}
+        memory: Dict[str, int] = {}
+        total_start = time.perf_counter()
+
+        with span("load_artifacts", timings):
+            metadata = store.metadata(meeting_id)
+            raw_transcription = store.load_stage(meeting_id, "asr")
+            raw_diarization = store.load_stage(meeting_id, "diarization")
+            speaker_embeddings = self._load_embeddings(meeting_id)
+        self.last_audio_duration = metadata.get("audio_duration")
+        alignment = (AlignmentService(tolerance, self.alignment_service.segmenter) if tolerance is not None
+                     else self._stored_alignment(metadata))
+        transcript = self._align_stored(meeting_id, metadata, raw_transcription, raw_diarization, speaker_embeddings,
+                                        alignment, report, timings, memory)
+        return self._finish(transcript, timings, memory, total_start, source="realign")
+
+    # --- Rozpoznawanie mówców (indeks głosów) ---
+
+    def enroll_speaker(self, meeting_id: str, speaker: str, identity: str) -> int:
+        """
+        Zapisuje głos mówcy z zapisanego spotkania jako tożsamość w indeksie głosów.
+        Kolejne spotkania (oraz realign tego) podpiszą tego mówcę nazwą osoby.
+        :param speaker: Etykieta z diaryzacji (pole label w transcript.speakers, np. SPEAKER_01).
+        :return: Liczba głosów zapisanych dla tej tożsamości.
+        """
+        index = self._require_speaker_index()
+        embeddings = self._load_embeddings(meeting_id)
+        if not embeddings:
+            raise MeetingNotFoundError(f"Brak embeddingów mówców dla spotkania: {meeting_id}")
+        if speaker not in embeddings:
+            raise ValueError(f"Nieznany mówca {speaker} (dostępni: {sorted(embeddings)})")
+        voices = index.enroll(identity, [embeddings[speaker]])
+        logger.info(f"Zapisano głos {speaker} ze spotkania {meeting_id} jako '{identity}' ({voices} głosów)")
+        return voices
+
+    def _require_speaker_index(self) -> SpeakerIndex:
+        if self.speaker_index is None:
+            raise RuntimeError("Indeks głosów jest wyłączony (CORETRANSCRIPT_SPEAKER_INDEX_ENABLED=false).")
+        return self.speaker_index
+
+    def _load_embeddings(self, meeting_id: str) -> Optional[Dict[str, List[float]]]:
+        store = self._require_artifacts()
+        store.metadata(meeting_id)  # MeetingNotFoundError dla nieznanego spotkania
+        try:
+            return store.load_stage(meeting_id, "embeddings")
+        except MeetingNotFoundError:
+            return None  # spotkanie przetworzone bez indeksu głosów
+
+    def _identify_speakers(self, raw_diarization: List[Dict[str, Any]],
+                           speaker_embeddings: Optional[Dict[str, List[float]]],
+                           timings: Dict[str, float]) -> Tuple[List[Dict[str, Any]], Optional[List[SpeakerIdentity]]]:
+        """Zamienia etykiety rozpoznanych mówców na nazwy osób (surowa diaryzacja pozostaje bez zmian)."""
+        if self.speaker_index is None or not speaker_embeddings:
+            return raw_diarization, None
+        with span("speaker_id", timings):
+            matches = self.speaker_index.identify(speaker_embeddings, self.speaker_threshold)
+        speakers = [
+            SpeakerIdentity(label=label, identity=match[0], score=round(match[1], 4)) if match
+            else SpeakerIdentity(label=label)
+            for label, match in sorted(matches.items())
+        ]
+        names = {label: match[0] for label, match in matches.items() if match is not None}
+        if not names:
+            return raw_diarization, speakers
+        logger.info("Rozpoznani mówcy: " + ", ".join(f"{k}={v}" for k, v in sorted(names.items())))
+        return [{**turn, "speaker": names.get(turn["speaker"], turn["speaker"])} for turn in raw_diarization], speakers
+
+    def _require_artifacts(self) -> ArtifactStore:
+        if self.artifacts is None:
+            raise RuntimeError("Magazyn artefaktów jest wyłączony (CORETRANSCRIPT_ARTIFACTS_ENABLED=false).")
+        return self.artifacts
 
-        # 1. Pobierz surowe dane z infrastruktury
-        # (Tu jest miejsce na optymalizację: można by to puścić równolegle, ale Pyannote i Whisper i tak walczą o GPU)
-        raw_transcription = self.ai_engine.transcribe(file_path)
-        raw_diarization = self.ai_engine.diarize(file_path)
+    def _stored_alignment(self, metadata: Dict[str, Any]) -> AlignmentService:
+        tolerance = (metadata.get("alignment") or {}).get("tolerance")
+        if tolerance is None or tolerance == self.alignment_service.tolerance:
+            return self.alignment_service
+        return AlignmentService(tolerance, self.alignment_service.segmenter)
+
+    def _align_stored(self, meeting_id: str, metadata: Dict[str, Any], raw_transcription: Dict[str, Any],
+                      raw_diarization: List[Dict[str, Any]], speaker_embeddings: Optional[Dict[str, List[float]]],
+                      alignment: AlignmentService, report: ProgressCallback,
+                      timings: Dict[str, float], memory: Dict[str, int]) -> MeetingTranscript:
+        labelled_diarization, speakers = self._identify_speakers(raw_diarization, speaker_embeddings, timings)
+        report("alignment", 0.9)
+        with span("alignment", timings, memory):
+            columnar = alignment.align_columnar(raw_transcription, labelled_diarization, metadata.get("filename", meeting_id))
+        self._save_columnar(meeting_id, columnar, timings)
+
+        report("mapping", 0.95)
+        with span("mapping", timings, memory):
+            transcript = columnar.to_meeting_transcript()
+        self.artifacts.update_metadata(meeting_id, {"alignment": alignment.params()})
+        logger.info(f"Przeliczono spotkanie {meeting_id}: {len(transcript.segments)} segmentów.")
+        return transcript.model_copy(update={"meeting_id": meeting_id, "speakers": speakers})
+
+    def _diarize(self, audio: AudioBuffer, speaker_hints: Dict[str, int]):
+        """Zwraca (segmenty, embeddingi mówców lub None)."""
+        if self.executor_kind == "process":
+            # Model diaryzacji żyje w procesie roboczym - audio z magazynu przechodzi jako ścieżka memmap
+            embed = self.speaker_index is not None
+            result, _ = self._get_executor("diarization").submit(_worker_diarize, audio, speaker_hints, embed).result()
+        else:
+            result = self._call_diarize(audio, speaker_hints)
+        return self._split_diarization(result)
+
+    def _call_diarize(self, audio: AudioBuffer, speaker_hints: Optional[Dict[str, int]] = None):
+        if self.speaker_index is None:
+            return self.ai_engine.diarize(audio, speaker_hints)
+        return self.ai_engine.diarize(audio, speaker_hints, return_embeddings=True)
+
+    def _split_diarization(self, result):
+        """Wynik diarize() to segmenty albo (segmenty, embeddingi) - gdy włączony indeks głosów."""
+        if self.speaker_index is None:
+            return result, None
+        return result
+
+    @contextmanager
+    def _speech_only(self, audio: AudioBuffer, timings: Dict[str, float], memory: Dict[str, int],
+                     enabled: bool = True):
+        """
+        Daje (audio dla modeli, SpeechMap lub None). Gdy VAD znajdzie dość ciszy, modele dostają
+        skompaktowaną kopię samej mowy (zamykaną po wyjściu); inaczej oryginał i None.
+        """
+        if self.vad is None or not enabled:
+            yield audio, None
+            return
+        with span("vad", timings, memory):
+            speech_map = self.vad.detect(audio.samples, audio.sample_rate)
+            worthwhile = speech_map.regions > 0 and speech_map.skipped_seconds >= MIN_SKIPPED_SECONDS
+            if worthwhile:
+                # Procesy robocze czytają bufor z pliku mapowanego w pamięć
+                compacted = speech_map.compact(audio, force_memmap=self.executor_kind == "process")
+        if not worthwhile:
+            logger.debug(f"VAD: mowa w {speech_map.speech_seconds:.1f}s z {speech_map.total_seconds:.1f}s - bez wycinania.")
+            yield audio, None
+            return
+        logger.info(
+            f"VAD: {speech_map.regions} fragmentów mowy, pominięto {speech_map.skipped_seconds:.1f}s ciszy "
+            f"z {speech_map.total_seconds:.1f}s ({speech_map.skipped_seconds / speech_map.total_seconds:.0%})"
+        )
+        with compacted:
+            yield compacted, speech_map
+
+    def _record_vad_savings(self, speech_map: SpeechMap, timings: Dict[str, float], record_metrics: bool = True):
+        """Szacuje zaoszczędzony czas etapów przy założeniu kosztu liniowego względem długości audio."""
+        self.last_skipped_audio = speech_map.skipped_seconds
+        if not record_metrics:
+            return
+        VAD_SKIPPED_SECONDS_TOTAL.inc(speech_map.skipped_seconds)
+        if speech_map.speech_seconds <= 0:
+            return
+        ratio = speech_map.skipped_seconds / speech_map.speech_seconds
+        saved = {stage: timings[stage] * ratio for stage in ("asr", "diarization") if stage in timings}
+        for stage, seconds in saved.items():
+            VAD_SAVED_SECONDS_TOTAL.inc(seconds, stage=stage)
+        if saved:
+            logger.info("VAD: szacowana oszczędność " + ", ".join(f"{k}≈{v:.1f}s" for k, v in saved.items()))
+
+    def _vad_params(self) -> Optional[Dict[str, Any]]:
+        return self.vad.params() if self.vad is not None else None
+
+    def _save_artifacts(self, audio: AudioBuffer, filename: str, content_hash: Optional[str],
+                        raw_transcription: Dict[str, Any], raw_diarization: List[Dict[str, Any]],
+                        speaker_embeddings: Optional[Dict[str, List[float]]],
+                        timings: Dict[str, float]) -> Optional[str]:
+        """Zapisuje surowe wyniki etapów; błąd zapisu nie przerywa przetwarzania (brak tylko rediarize/realign)."""
+        if content_hash is not None:
+            # To samo nagranie i ten sam ASR -> ten sam identyfikator (ponowny upload nadpisuje artefakty)
+            meeting_id = make_key(content_hash, self.ai_engine.asr_fingerprint())[:16]
+        else:
+            meeting_id = uuid.uuid4().hex[:16]
+        try:
+            with span("artifacts", timings):
+                self.artifacts.save(meeting_id, audio, raw_transcription, raw_diarization, {
+                    "filename": filename,
+                    "content_hash": content_hash,
+                    "asr": self.ai_engine.asr_fingerprint(),
+                    "diarization": self.ai_engine.diarization_fingerprint(),
+                    "alignment": self.alignment_service.params(),
+                    "vad": self._vad_params(),
+                }, speaker_embeddings)
+        except OSError as e:
+            logger.warning(f"Nie udało się zapisać artefaktów spotkania {meeting_id}: {e}")
+            return None
+        return meeting_id
+
+    def _save_columnar(self, meeting_id: str, columnar: ColumnarTranscript, timings: Dict[str, float]):
+        """Czasy słów do eksportu (ArtifactStore.load_columnar); błąd zapisu nie przerywa przetwarzania."""
+        try:
+            with span("words", timings):
+                self.artifacts.save_columnar(meeting_id, columnar)
+        except OSError as e:
+            logger.warning(f"Nie udało się zapisać czasów słów spotkania {meeting_id}: {e}")
+
+    def _process_uncached(self, audio: AudioBuffer, filename: str, content_hash: Optional[str],
+                          report: ProgressCallback, timings: Dict[str, float], memory: Dict[str, int],
+                          keep_artifacts: bool = True, record_metrics: bool = True) -> MeetingTranscript:
+        """
+        Pełny potok dla zdekodowanego audio. Czasy i przyrosty pamięci etapów trafiają do timings/memory.
+        :param record_metrics: False - bez RTF i liczników VAD (klip rozgrzewający nie jest ruchem produkcyjnym).
+        """
+        self.last_audio_duration = audio.duration
+        self.last_skipped_audio = 0.0
+
+        raw_transcription = raw_diarization = speaker_embeddings = None
+        use_cache = self.cache is not None and content_hash is not None
+        if use_cache:
+            # Pojedyncze etapy mogą być w cache nawet, gdy transkrypt nie jest (np. inna tolerancja alignmentu)
+            raw_transcription = self.cache.get_json("asr", self._asr_key(content_hash))
+            raw_diarization = self.cache.get_json("diarization", self._diarization_key(content_hash))
+            if self.speaker_index is not None and raw_diarization is not None:
+                # Embeddingi liczy ta sama diaryzacja - bez nich etap trzeba powtórzyć
+                speaker_embeddings = self.cache.get_json("speaker_embeddings", self._diarization_key(content_hash))
+                if speaker_embeddings is None:
+                    raw_diarization = None
+
+        # 1. Pobierz surowe dane z infrastruktury (równolegle lub sekwencyjnie, tylko brakujące etapy)
+        need_asr, need_diarization = raw_transcription is None, raw_diarization is None
+        # Modele dostają tylko mowę (VAD); wyniki wracają na oś nagrania, zanim trafią do cache i artefaktów
+        with self._speech_only(audio, timings, memory, enabled=need_asr or need_diarization) as (model_audio, speech_map):
+            with self._inference_slot(report):
+                with span("inference_wall", timings, memory):
+                    raw_transcription, raw_diarization, embeddings = self._run_inference(
+                        model_audio, timings, raw_transcription, raw_diarization, report
+                    )
+        if speech_map is not None:
+            if need_asr:
+                raw_transcription = speech_map.map_transcription(raw_transcription)
+            if need_diarization:
+                raw_diarization = speech_map.map_turns(raw_diarization)
+            self._record_vad_savings(speech_map, timings, record_metrics)
+        if need_diarization:
+            speaker_embeddings = embeddings
+        if record_metrics:
+            self._record_real_time_factor(timings, audio.duration)
+
+        if use_cache:
+            if need_asr:
+                self.cache.put_json("asr", self._asr_key(content_hash), raw_transcription)
+            if need_diarization:
+                self.cache.put_json("diarization", self._diarization_key(content_hash), raw_diarization)
+                if speaker_embeddings is not None:
+                    self.cache.put_json("speaker_embeddings", self._diarization_key(content_hash), speaker_embeddings)
+
+        meeting_id = None
+        if self.artifacts is not None and keep_artifacts:
+            meeting_id = self._save_artifacts(audio, filename, content_hash, raw_transcription, raw_diarization,
+                                              speaker_embeddings, timings)
 
         # 2. Wykonaj logikę biznesową (Core)
-        aligned_data = self.alignment_service.align(raw_transcription, raw_diarization)
+        # Rozpoznani mówcy dostają nazwy osób jeszcze przed alignmentem
+        labelled_diarization, speakers = self._identify_speakers(raw_diarization, speaker_embeddings, timings)
+        # Wynik kolumnowy zachowuje czasy słów; wypowiedzi to zakresy słów tego samego mówcy
+        report("alignment", 0.9)
+        with span("alignment", timings, memory):
+            columnar = self.alignment_service.align_columnar(raw_transcription, labelled_diarization, filename)
+        if meeting_id is not None:
+            self._save_columnar(meeting_id, columnar, timings)
 
         # 3. Mapowanie na Model Domenowy (Domain)
-        # Zamieniamy brudne słowniki na czyste obiekty Pydantic
-        segments_models = []
-        for item in aligned_data:
-            segment = TranscriptionSegment(
-                start=item['start'],
-                end=item['end'],
-                speaker=item['speaker'],
-                text=item['text']
+        # Kolumny konwertowane hurtem - bez walidacji Pydantic per wypowiedź
+        report("mapping", 0.95)
+        with span("mapping", timings, memory):
+            transcript = columnar.to_meeting_transcript()
+        skipped_audio = round(self.last_skipped_audio, 2) or None
+        if meeting_id is not None or speakers is not None or skipped_audio is not None:
+            transcript = transcript.model_copy(
+                update={"meeting_id": meeting_id, "speakers": speakers, "skipped_audio": skipped_audio}
             )
-            segments_models.append(segment)
 
-        # 4. Budowa finalnego obiektu
-        transcript = MeetingTranscript(
-            filename=os.path.basename(file_path),
-            segments=segments_models
+        if use_cache:
+            with span("serialization", timings, memory):
+                payload = transcript.model_dump_json().encode("utf-8")
+            self.cache.put("transcript", self._transcript_key(content_hash), payload)
+
+        logger.info(f"Przetwarzanie zakończone. Utworzono transkrypt z {len(transcript.segments)} segmentami.")
+        return transcript
+
+    def _finish(self, transcript: MeetingTranscript, timings: Dict[str, float], memory: Dict[str, int],
+                total_start: float, source: str, searchable: bool = True) -> MeetingTranscript:
+        """
+        Zamyka pomiary: metryki, log etapów i zwięzłe podsumowanie czasów dołączone do transkryptu.
+        Nowe i przeliczone transkrypty trafiają do indeksu wyszukiwania i magazynu transkryptów
+        (trafienia w cache już tam są). Rozgrzewanie (source='warmup') nie trafia do metryk.
+        """
+        if searchable and source not in ("cache", "warmup"):
+            self._index_transcript(transcript, timings)
+        timings["total"] = time.perf_counter() - total_start
+        self.last_timings = timings
+        self.last_memory = memory
+        if source != "warmup":
+            record_stages(timings, memory)
+            MEETINGS_TOTAL.inc(source=source)
+            if source == "pipeline" and self.last_audio_duration:
+                AUDIO_SECONDS_TOTAL.inc(self.last_audio_duration)
+
+        logger.info("Czasy etapów: " + ", ".join(f"{k}={v:.2f}s" for k, v in timings.items()))
+        if memory:
+            logger.info("Przyrost pamięci (RSS): " + ", ".join(f"{k}={v / 1024 ** 2:+.0f}MB" for k, v in memory.items()))
+        return transcript.model_copy(update={"timings": {k: round(v, 4) for k, v in timings.items()}})
+
+    def _index_transcript(self, transcript: MeetingTranscript, timings: Dict[str, float]):
+        """Błąd indeksu lub magazynu nie przerywa przetwarzania - transkrypt po prostu nie będzie tam dostępny."""
+        if self.search_index is not None:
+            try:
+                with span("search_index", timings):
+                    self.search_index.add(transcript)
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"Nie udało się dodać {transcript.filename} do indeksu wyszukiwania: {e}")
+        if self.transcript_store is not None:
+            try:
+                with span("transcript_store", timings):
+                    self.transcript_store.save(transcript)
+            except sqlite3.Error as e:
+                logger.warning(f"Nie udało się zapisać {transcript.filename} w magazynie transkryptów: {e}")
+
+    def _record_real_time_factor(self, timings: Dict[str, float], audio_duration: float):
+        if audio_duration <= 0:
+            return
+        if "asr" in timings:
+            REAL_TIME_FACTOR.observe(timings["asr"] / audio_duration, stage="asr", model=self.ai_engine.asr_model_path)
+        if "diarization" in timings:
+            REAL_TIME_FACTOR.observe(timings["diarization"] / audio_duration, stage="diarization",
+                                     model=self.ai_engine.diarization_model)
+
+    def warm_up(self, clip_seconds: float = 2.0) -> float:
+        """
+        Przepuszcza krótki sztuczny klip przez pełny potok (bez cache), żeby załadować modele
+        i skompilować kernele przed pierwszym prawdziwym żądaniem. Zwraca czas w sekundach.
+        W trybie 'process' rozgrzewa także procesy robocze.
+        """
+        # Cichy szum zamiast zer - część modeli pomija zupełnie puste wejście
+        rng = np.random.default_rng(0)
+        samples = (rng.standard_normal(int(clip_seconds * SAMPLE_RATE)) * 1e-3).astype(np.float32)
+        timings: Dict[str, float] = {}
+        memory: Dict[str, int] = {}
+        start = time.perf_counter()
+        with AudioBuffer(samples, name="warmup") as audio:
+            transcript = self._process_uncached(audio, "warmup", None, _no_progress, timings, memory,
+                                                keep_artifacts=False, record_metrics=False)
+        self._finish(transcript, timings, memory, start, source="warmup", searchable=False)
+        return time.perf_counter() - start
+
+    def close(self):
+        """Zamyka executory (w trybie 'process' kończy procesy robocze z modelami)."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+        self._executors.clear()
+
+    # --- Tryby wykonania ---
+
+    def _use_parallel(self) -> bool:
+        if self.execution_mode == "auto":
+            if self.ai_engine.stages_share_device():
+                logger.debug("ASR i diaryzacja używają tego samego urządzenia - tryb sekwencyjny.")
+                return False
+            return True
+        return self.execution_mode == "parallel"
+
+    @contextmanager
+    def _inference_slot(self, report: ProgressCallback):
+        """Zajmuje slot urządzenia na czas inferencji (kolejne zadania czekają, zamiast przeciążać model)."""
+        if self.inference_slots is None:
+            yield
+            return
+        report("waiting_for_device", 0.05)
+        with timed_wait("device"):
+            self.inference_slots.acquire()
+        try:
+            yield
+        finally:
+            self.inference_slots.release()
+
+    def _run_inference(self, audio: AudioBuffer, timings: Dict[str, float],
+                       raw_transcription: Optional[Dict[str, Any]], raw_diarization: Optional[List[Dict[str, Any]]],
+                       report: ProgressCallback):
+        """
+        Uruchamia brakujące etapy (wyniki z cache przekazywane są jako gotowe).
+        Zwraca (transkrypcja, diaryzacja, embeddingi mówców - None, gdy diaryzacja z cache lub indeks wyłączony).
+        """
+        if raw_transcription is None and raw_diarization is None and self._use_parallel():
+            report("asr+diarization", 0.05)
+            return self._run_parallel(audio, timings, lambda p: report("asr+diarization", 0.05 + 0.85 * p))
+
+        if raw_transcription is None:
+            report("asr", 0.05)
+            with span("asr", timings):
+                raw_transcription = self.ai_engine.transcribe(audio, progress_callback=lambda p: report("asr", 0.05 + 0.55 * p))
+
+        speaker_embeddings = None
+        if raw_diarization is None:
+            report("diarization", 0.6)
+            with span("diarization", timings):
+                raw_diarization, speaker_embeddings = self._split_diarization(self._call_diarize(audio))
+        return raw_transcription, raw_diarization, speaker_embeddings
+
+    def _run_parallel(self, audio: AudioBuffer, timings: Dict[str, float], asr_progress: Callable[[float], None]):
+        embed = self.speaker_index is not None
+        if self.executor_kind == "process":
+            asr_future = self._get_executor("asr").submit(_worker_transcribe, audio)
+            diarization_future = self._get_executor("diarization").submit(_worker_diarize, audio, None, embed)
+        else:
+            asr_future = self._get_executor("asr").submit(self._timed, self.ai_engine.transcribe, audio, asr_progress)
+            diarization_future = self._get_executor("diarization").submit(self._timed, self._call_diarize, audio)
+
+        # result() propaguje wyjątek z etapu, który się nie powiódł
+        raw_transcription, timings["asr"] = asr_future.result()
+        diarization_result, timings["diarization"] = diarization_future.result()
+        return (raw_transcription, *self._split_diarization(diarization_result))
+
+    # --- Cache ---
+
+    def _asr_key(self, content_hash: str) -> str:
+        return make_key(content_hash, self.ai_engine.asr_fingerprint(), *self._vad_key_part())
+
+    def _diarization_key(self, content_hash: str) -> str:
+        return make_key(content_hash, self.ai_engine.diarization_fingerprint(), *self._vad_key_part())
+
+    def _vad_key_part(self) -> Tuple[Dict[str, Any], ...]:
+        # Bez VAD klucze jak dotąd - wcześniejsze wpisy cache pozostają ważne
+        return (self.vad.params(),) if self.vad is not None else ()
+
+    def _transcript_key(self, content_hash: str) -> str:
+        # Zmiana indeksu głosów (nowa osoba) lub progu zmienia nazwy mówców - i klucz transkryptu
+        speaker_id = None
+        if self.speaker_index is not None:
+            speaker_id = {"index_version": self.speaker_index.version, "threshold": self.speaker_threshold}
+        return make_key(
+            content_hash,
+            self.ai_engine.asr_fingerprint(),
+            self.ai_engine.diarization_fingerprint(),
+            self.alignment_service.params(),
+            speaker_id,
+            *self._vad_key_part()
         )
 
-        logger.info(f"Przetwarzanie zakończone. Utworzono transkrypt z {len(segments_models)} segmentami.")
-        return transcript
\ No newline at end of file
+    def _get_cached_transcript(self, content_hash: str, filename: str) -> Optional[MeetingTranscript]:
+        data = self.cache.get("transcript", self._transcript_key(content_hash))
+        if data is None:
+            return None
+        logger.info(f"Trafienie w cache dla {filename} ({content_hash[:12]})")
+        transcript = MeetingTranscript.model_validate_json(data)
+        meeting_id = transcript.meeting_id
+        if meeting_id is not None and (self.artifacts is None or not self.artifacts.exists(meeting_id)):
+            meeting_id = None  # artefakty usunięte (limit rozmiaru) - ponowne przeliczenie niedostępne
+        return transcript.model_copy(update={"filename": filename, "meeting_id": meeting_id})
+
+    def _get_executor(self, stage: str) -> Executor:
+        executor = self._executors.get(stage)
+        if executor is None:
+            if self.executor_kind == "process":
+                executor = ProcessPoolExecutor(
+                    max_workers=1,
+                    initializer=_init_worker,
+                    initargs=(self.ai_engine.config(),)
+                )
+            else:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"meeting-{stage}")
+            self._executors[stage] = executor
+        return executor
+
+    @staticmethod
+    def _timed(fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - start
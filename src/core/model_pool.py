@@ -0,0 +1,215 @@
+# File: src/core/model_pool.py
+
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.core.meeting_service import MeetingService
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.metrics import timed_wait
+from src.infrastructure.artifact_store import ArtifactStore
+from src.infrastructure.asr_batching import ASRBatcher
+from src.infrastructure.model_manager import ModelManager
+from src.infrastructure.result_cache import ResultCache
+from src.infrastructure.settings import Settings
+from src.infrastructure.search_index import TranscriptSearchIndex
+from src.infrastructure.transcript_store import TranscriptStore
+from src.infrastructure.speaker_index import SpeakerIndex
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Żadna replika nie zwolniła się w zadanym czasie."""
+
+
+class ModelPool:
+    """
+    Pula N replik MeetingService (każda z własnym AIEngine) rozgrzewanych przy starcie.
+    Żądanie wypożycza replikę na czas przetwarzania (checkout), więc repliki nie dzielą stanu.
+    Replika trafia do puli dopiero po rozgrzaniu - wcześniejsze żądania czekają zamiast płacić za zimny start.
+    """
+
+    def __init__(self, factory: Callable[[], MeetingService], size: int = 1,
+                 warm_up: bool = True, warmup_clip_seconds: float = 2.0, asr_batcher: Optional[ASRBatcher] = None,
+                 model_manager: Optional[ModelManager] = None):
+        """
+        :param factory: Tworzy nową replikę serwisu (ładowanie modeli następuje dopiero przy rozgrzewaniu).
+        :param size: Liczba replik.
+        :param warm_up: Czy przepuścić przez każdą replikę sztuczny klip przed przyjęciem ruchu.
+        :param asr_batcher: Wspólna kolejka partii ASR replik - zamykana razem z pulą.
+        :param model_manager: Wspólny menedżer pamięci modeli replik (budżet obejmuje wszystkie repliki).
+        """
+        if size < 1:
+            raise ValueError("Pula musi mieć co najmniej jedną replikę")
+        self.size = size
+        self.warm_up = warm_up
+        self.warmup_clip_seconds = warmup_clip_seconds
+        self.asr_batcher = asr_batcher
+        self.model_manager = model_manager
+        self.replicas: List[MeetingService] = [factory() for _ in range(size)]
+
+        self._available: "queue.Queue[MeetingService]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._pooled_count = 0
+        self._checkouts = 0
+        self._in_use = 0
+        # Czasy rozgrzewania per replika: cold = pierwsze wywołanie (ładowanie + inferencja), warm = kolejne
+        self._warmup: List[Dict[str, Any]] = [{} for _ in range(size)]
+        self._startup_seconds: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ModelPool":
+        """
+        Repliki współdzielą cache wyników, artefakty spotkań, indeks głosów, indeks wyszukiwania,
+        magazyn transkryptów, kolejkę partii ASR (CORETRANSCRIPT_ASR_BATCH_SIZE > 1), budżet pamięci modeli
+        (CORETRANSCRIPT_MODELS_MEMORY_BUDGET_MB) i sloty urządzenia (CORETRANSCRIPT_DEVICE_SLOTS).
+        """
+        cache = artifacts = speaker_index = search_index = transcript_store = asr_batcher = None
+        if settings.cache_enabled:
+            cache = ResultCache(settings.cache_dir, max_bytes=settings.cache_max_mb * 1024 * 1024)
+        if settings.artifacts_enabled:
+            artifacts = ArtifactStore(settings.artifacts_dir, max_bytes=settings.artifacts_max_mb * 1024 * 1024)
+        if settings.speaker_index_enabled:
+            speaker_index = SpeakerIndex(settings.speaker_index_path, approximate=settings.speaker_index_approximate)
+        if settings.search_index_enabled:
+            search_index = TranscriptSearchIndex(settings.search_index_path)
+        if settings.transcript_store_enabled:
+            transcript_store = TranscriptStore(settings.transcript_store_path)
+        if settings.asr_batch_size > 1:
+            asr_batcher = MeetingService.create_asr_batcher(settings)
+        model_manager = MeetingService.create_model_manager(settings)
+        slots = threading.BoundedSemaphore(settings.device_slots)
+        return cls(
+            lambda: MeetingService.from_settings(settings, cache=cache, inference_slots=slots, artifacts=artifacts,
+                                                 speaker_index=speaker_index, search_index=search_index,
+                                                 transcript_store=transcript_store, asr_batcher=asr_batcher,
+                                                 model_manager=model_manager),
+            size=settings.pool_replicas,
+            warm_up=settings.warmup_on_start,
+            warmup_clip_seconds=settings.warmup_clip_seconds,
+            asr_batcher=asr_batcher,
+            model_manager=model_manager
+        )
+
+    @property
+    def primary(self) -> MeetingService:
+        """
+        Pierwsza replika - tylko do zasobów współdzielonych przez repliki (cache, artefakty, indeksy, magazyn).
+        Przetwarzanie (także realign i sesje na żywo) idzie przez checkout/inference.
+        """
+        return self.replicas[0]
+
+    @property
+    def ready(self) -> bool:
+        """Czy wszystkie repliki są rozgrzane (bez błędów) i przyjmują ruch."""
+        with self._lock:
+            return self._is_ready()
+
+    def start(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Rozgrzewa repliki i udostępnia je w puli.
+        :param background: True - w wątku w tle (API od razu odpowiada na /health/live).
+        """
+        with self._lock:
+            if self._started:
+                return None
+            self._started = True
+        if not background:
+            self._start_all()
+            return None
+        thread = threading.Thread(target=self._start_all, name="model-pool-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[MeetingService]:
+        """Wypożycza wolną replikę na czas bloku `with` (czeka, aż któraś się zwolni)."""
+        try:
+            with timed_wait("model_pool"):
+                replica = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(f"Brak wolnej repliki po {timeout}s") from None
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+        try:
+            yield replica
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._available.put(replica)
+
+    @contextmanager
+    def inference(self, timeout: Optional[float] = None) -> Iterator[AIEngine]:
+        """
+        Wypożycza replikę i zajmuje slot urządzenia na czas bloku `with` - dla krótkich inferencji
+        poza potokiem (np. krok sesji na żywo), które nie mogą omijać limitu równoczesnych inferencji.
+        """
+        with self.checkout(timeout) as replica:
+            slots = replica.inference_slots
+            if slots is None:
+                yield replica.ai_engine
+                return
+            with timed_wait("device"):
+                slots.acquire()
+            try:
+                yield replica.ai_engine
+            finally:
+                slots.release()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self._is_ready(),
+                "replicas": self.size,
+                "pooled": self._pooled_count,
+                "in_use": self._in_use,
+                "available": self._available.qsize(),
+                "checkouts": self._checkouts,
+                "startup_seconds": self._startup_seconds,
+                "warmup": [dict(entry) for entry in self._warmup],
+            }
+
+    def close(self):
+        for replica in self.replicas:
+            replica.close()
+        if self.asr_batcher is not None:
+            self.asr_batcher.close()
+        if self.model_manager is not None:
+            self.model_manager.close()
+
+    # --- Wewnętrzne ---
+
+    def _is_ready(self) -> bool:
+        return self._started and self._pooled_count == self.size and not any("error" in e for e in self._warmup)
+
+    def _start_all(self):
+        start = time.perf_counter()
+        for index, replica in enumerate(self.replicas):
+            if self.warm_up:
+                self._warm_replica(index, replica)
+            with self._lock:
+                self._pooled_count += 1
+            self._available.put(replica)
+        with self._lock:
+            self._startup_seconds = time.perf_counter() - start
+        logger.info(f"Pula modeli gotowa: {self.size} replik w {self._startup_seconds:.1f}s")
+
+    def _warm_replica(self, index: int, replica: MeetingService):
+        entry = self._warmup[index]
+        try:
+            entry["cold_start_seconds"] = replica.warm_up(self.warmup_clip_seconds)
+            entry["warm_start_seconds"] = replica.warm_up(self.warmup_clip_seconds)
+            logger.info(
+                f"Replika {index} rozgrzana: zimny start {entry['cold_start_seconds']:.2f}s, "
+                f"ciepły {entry['warm_start_seconds']:.2f}s"
+            )
+        except Exception as e:
+            # Replika i tak trafia do puli - modele załadują się przy pierwszym żądaniu
+            entry["error"] = str(e)
+            logger.error(f"Rozgrzewanie repliki {index} nie powiodło się: {e}")
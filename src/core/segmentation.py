@@ -0,0 +1,96 @@
+# File: src/core/segmentation.py
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+# Słowa kończące zdanie i dowolny fragment zdania (miejsca, w których podział wypowiedzi brzmi naturalnie)
+SENTENCE_END = (".", "!", "?", "…")
+CLAUSE_END = SENTENCE_END + (",", ";", ":")
+
+
+class SubtitleSegmenter:
+    """
+    Podział wypowiedzi na segmenty o długości napisów - jednym przejściem po słowach.
+
+    Zawsze dzieli przy zmianie mówcy. Dodatkowo (każda reguła opcjonalna):
+    - przerwa między słowami dłuższa niż max_pause,
+    - koniec zdania, gdy segment trwa już co najmniej min_duration (split_sentences),
+    - segment dłuższy niż max_duration - cięcie po ostatnim znaku interpunkcyjnym w segmencie,
+      a gdy go nie ma, przed słowem przekraczającym limit.
+    Zmiany mówcy i przerwy liczone są wektorowo; pętla po słowach nie cofa się, więc koszt jest liniowy.
+    """
+
+    def __init__(self, max_duration: Optional[float] = None, max_pause: Optional[float] = None,
+                 split_sentences: bool = False, min_duration: float = 1.0):
+        """
+        :param max_duration: Najdłuższy segment w sekundach (None/0 = bez limitu).
+        :param max_pause: Przerwa między słowami (s), po której zaczyna się nowy segment (None/0 = bez podziału).
+        :param split_sentences: Czy kończyć segment na końcu zdania.
+        :param min_duration: Segment krótszy niż tyle sekund nie jest kończony na końcu zdania.
+        """
+        if max_duration is not None and max_duration < 0 or max_pause is not None and max_pause < 0:
+            raise ValueError("Limity segmentacji nie mogą być ujemne.")
+        self.max_duration = max_duration or None
+        self.max_pause = max_pause or None
+        self.split_sentences = split_sentences
+        self.min_duration = min_duration
+
+    @property
+    def enabled(self) -> bool:
+        """Czy segmenter dzieli coś poza zmianami mówcy."""
+        return bool(self.max_duration or self.max_pause or self.split_sentences)
+
+    def params(self) -> Dict[str, Any]:
+        """Parametry wpływające na podział (np. do klucza cache)."""
+        return {"max_duration": self.max_duration, "max_pause": self.max_pause,
+                "split_sentences": self.split_sentences, "min_duration": self.min_duration}
+
+    def boundaries(self, words: Sequence[str], starts: np.ndarray, ends: np.ndarray,
+                   speaker_codes: np.ndarray) -> np.ndarray:
+        """
+        Indeksy słów rozpoczynających nowy segment (bez 0) - ten sam format co np.flatnonzero(np.diff(codes)) + 1.
+        :param speaker_codes: Kod mówcy każdego słowa (dowolne liczby całkowite - liczy się tylko zmiana).
+        """
+        n = len(starts)
+        if n < 2:
+            return np.empty(0, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        codes = np.asarray(speaker_codes)
+
+        # Granice twarde (przed słowem i + 1): zmiana mówcy lub długa przerwa
+        hard = codes[1:] != codes[:-1]
+        if self.max_pause:
+            hard |= (starts[1:] - ends[:-1]) > self.max_pause
+        if not self.max_duration and not self.split_sentences:
+            return (np.flatnonzero(hard) + 1).astype(np.int64)
+
+        max_duration, min_duration = self.max_duration, self.min_duration
+        hard_list = hard.tolist()
+        start_list, end_list = starts.tolist(), ends.tolist()
+        sentence = [w.endswith(SENTENCE_END) for w in words] if self.split_sentences else None
+        clause = [w.endswith(CLAUSE_END) for w in words] if max_duration else None
+
+        result = []
+        first = 0  # pierwsze słowo bieżącego segmentu
+        soft = 0   # ostatnie miejsce po interpunkcji w bieżącym segmencie (<= first - brak)
+        for i in range(1, n):
+            if clause is not None and clause[i - 1]:
+                soft = i
+            if hard_list[i - 1] or (sentence is not None and sentence[i - 1]
+                                    and end_list[i - 1] - start_list[first] >= min_duration):
+                pass
+            elif max_duration and end_list[i] - start_list[first] > max_duration:
+                if soft > first:
+                    # Cięcie po interpunkcji; reszta zostaje w nowym segmencie, jeśli mieści się w limicie
+                    result.append(soft)
+                    first = soft
+                    # Cięcie tuż przed słowem i: słowo dłuższe niż limit zostaje samo (bez pustego segmentu)
+                    if first == i or end_list[i] - start_list[first] <= max_duration:
+                        continue
+            else:
+                continue
+            result.append(i)
+            first = i
+        return np.asarray(result, dtype=np.int64)
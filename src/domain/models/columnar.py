@@ -0,0 +1,316 @@
+# File: src/domain/models/columnar.py
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from src.domain.models.models import MeetingTranscript, TranscriptionSegment
+
+# Separator słów w buforze tekstu - tekst wypowiedzi to wycinek bufora, bez sklejania
+WORD_SEPARATOR = " "
+
+
+class SegmentView:
+    """Lekki widok wypowiedzi - pola czytane z tablic dopiero przy dostępie."""
+
+    __slots__ = ("_transcript", "index")
+
+    def __init__(self, transcript: "ColumnarTranscript", index: int):
+        self._transcript = transcript
+        self.index = index
+
+    @property
+    def start(self) -> float:
+        return float(self._transcript.segment_starts[self.index])
+
+    @property
+    def end(self) -> float:
+        return float(self._transcript.segment_ends[self.index])
+
+    @property
+    def speaker(self) -> str:
+        return self._transcript.speakers[self._transcript.segment_speakers[self.index]]
+
+    @property
+    def text(self) -> str:
+        t = self._transcript
+        first, last = t.segment_word_starts[self.index], t.segment_word_ends[self.index]
+        return t.text[t.word_offsets[first]:t.word_offsets[last] - len(WORD_SEPARATOR)]
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def words(self) -> List[Dict[str, Any]]:
+        t = self._transcript
+        return [t.word(i) for i in range(t.segment_word_starts[self.index], t.segment_word_ends[self.index])]
+
+    def to_model(self) -> TranscriptionSegment:
+        return TranscriptionSegment.model_construct(start=self.start, end=self.end, speaker=self.speaker, text=self.text)
+
+    def __repr__(self) -> str:
+        return f"SegmentView({self.start:.2f}-{self.end:.2f}, {self.speaker}, {self.text[:30]!r})"
+
+
+class _SegmentsView(Sequence):
+    def __init__(self, transcript: "ColumnarTranscript"):
+        self._transcript = transcript
+
+    def __len__(self) -> int:
+        return len(self._transcript.segment_starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [SegmentView(self._transcript, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return SegmentView(self._transcript, index)
+
+
+class ColumnarTranscript:
+    """
+    Transkrypt w układzie kolumnowym (struct-of-arrays) z czasami na poziomie słów.
+    Słowa i wypowiedzi to tablice NumPy, mówcy są internowani (kod -> etykieta w `speakers`),
+    a cały tekst to jeden napis: słowo i = text[word_offsets[i]:word_offsets[i+1] - 1].
+    Wypowiedź to ciągły zakres słów, więc jej tekst jest wycinkiem bufora.
+    Obiekty Pydantic powstają dopiero na żądanie (segments[i].to_model(), to_meeting_transcript()).
+    """
+
+    def __init__(self, filename: str, speakers: List[str], text: str, word_offsets: np.ndarray,
+                 word_starts: np.ndarray, word_ends: np.ndarray, word_speakers: np.ndarray,
+                 segment_word_starts: np.ndarray, segment_word_ends: np.ndarray,
+                 processed_at: Optional[datetime] = None):
+        self.filename = filename
+        self.processed_at = processed_at or datetime.now()
+        self.speakers = speakers
+        self.text = text
+        self.word_offsets = word_offsets
+        self.word_starts = word_starts
+        self.word_ends = word_ends
+        self.word_speakers = word_speakers
+        self.segment_word_starts = segment_word_starts
+        self.segment_word_ends = segment_word_ends
+        # Kolumny wypowiedzi wyliczane z zakresów słów (bez kopiowania tekstu)
+        self.segment_starts = word_starts[segment_word_starts] if len(segment_word_starts) else np.empty(0)
+        self.segment_ends = word_ends[segment_word_ends - 1] if len(segment_word_ends) else np.empty(0)
+        self.segment_speakers = word_speakers[segment_word_starts] if len(segment_word_starts) else np.empty(0, np.int32)
+
+    # --- Budowa ---
+
+    @classmethod
+    def from_words(cls, filename: str, words: Sequence[str], starts: np.ndarray, ends: np.ndarray,
+                   speaker_codes: np.ndarray, speakers: List[str],
+                   boundaries: Optional[np.ndarray] = None) -> "ColumnarTranscript":
+        """
+        Buduje transkrypt z kolumn słów. Wypowiedź = ciąg kolejnych słów tego samego mówcy, granice liczone wektorowo.
+        :param speaker_codes: Indeksy do `speakers`; -1 oznacza nieznanego mówcę (mapowany na "UNKNOWN").
+        :param boundaries: Indeksy słów rozpoczynających wypowiedź (bez 0), np. z SubtitleSegmenter -
+                           muszą obejmować każdą zmianę mówcy; None - podział tylko przy zmianie mówcy.
+        """
+        codes = np.asarray(speaker_codes, dtype=np.int32)
+        speakers = list(speakers)
+        if len(codes) and codes.min() < 0:
+            unknown = len(speakers)
+            speakers.append("UNKNOWN")
+            codes = np.where(codes < 0, unknown, codes).astype(np.int32)
+
+        text, offsets = _pack_words(words)
+        if boundaries is None:
+            boundaries = np.flatnonzero(np.diff(codes)) + 1
+        boundaries = np.asarray(boundaries, dtype=np.int64)
+        segment_word_starts = np.concatenate([[0], boundaries]).astype(np.int64) if len(codes) else np.empty(0, np.int64)
+        segment_word_ends = np.concatenate([boundaries, [len(codes)]]).astype(np.int64) if len(codes) else np.empty(0, np.int64)
+        return cls(
+            filename, speakers, text, offsets,
+            np.asarray(starts, dtype=np.float64), np.asarray(ends, dtype=np.float64), codes,
+            segment_word_starts, segment_word_ends
+        )
+
+    # --- Dostęp ---
+
+    @property
+    def num_words(self) -> int:
+        return len(self.word_starts)
+
+    @property
+    def segments(self) -> Sequence[SegmentView]:
+        return _SegmentsView(self)
+
+    @property
+    def total_duration(self) -> float:
+        return float(self.segment_ends[-1]) if len(self.segment_ends) else 0.0
+
+    def word(self, index: int) -> Dict[str, Any]:
+        return {
+            "word": self.text[self.word_offsets[index]:self.word_offsets[index + 1] - len(WORD_SEPARATOR)],
+            "start": float(self.word_starts[index]),
+            "end": float(self.word_ends[index]),
+            "speaker": self.speakers[self.word_speakers[index]],
+        }
+
+    def word_texts(self) -> List[str]:
+        offsets = self.word_offsets.tolist()
+        sep = len(WORD_SEPARATOR)
+        return [self.text[a:b - sep] for a, b in zip(offsets[:-1], offsets[1:])]
+
+    def iter_segments(self) -> Iterator[Dict[str, Any]]:
+        """Wypowiedzi jako słowniki (start, end, speaker, text) - kolumny konwertowane hurtem."""
+        offsets = self.word_offsets
+        text = self.text
+        sep = len(WORD_SEPARATOR)
+        first_offsets = offsets[self.segment_word_starts].tolist()
+        last_offsets = offsets[self.segment_word_ends].tolist()
+        for start, end, code, a, b in zip(self.segment_starts.tolist(), self.segment_ends.tolist(),
+                                          self.segment_speakers.tolist(), first_offsets, last_offsets):
+            yield {"start": start, "end": end, "speaker": self.speakers[code], "text": text[a:b - sep]}
+
+    def to_meeting_transcript(self) -> MeetingTranscript:
+        """Konwersja do modelu domenowego bez ponownej walidacji (dane pochodzą z typowanych tablic)."""
+        segments = [TranscriptionSegment.model_construct(**item) for item in self.iter_segments()]
+        return MeetingTranscript.model_construct(filename=self.filename, processed_at=self.processed_at, segments=segments)
+
+    # --- Serializacja ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Kolumnowy słownik (listy zamiast obiektów per słowo) - podstawa eksportu JSON.
+        Czasy zapisywane jako całkowite milisekundy - krótszy zapis i szybsza serializacja niż repr floatów.
+        """
+        return {
+            "format": "coretranscript.columnar/1",
+            "filename": self.filename,
+            "processed_at": self.processed_at.isoformat(),
+            "speakers": self.speakers,
+            "text": self.text,
+            "word_offsets": self.word_offsets.tolist(),
+            "word_starts_ms": _to_ms(self.word_starts),
+            "word_ends_ms": _to_ms(self.word_ends),
+            "word_speakers": self.word_speakers.tolist(),
+            "segment_word_starts": self.segment_word_starts.tolist(),
+            "segment_word_ends": self.segment_word_ends.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ColumnarTranscript":
+        return cls(
+            data["filename"], list(data["speakers"]), data["text"],
+            np.asarray(data["word_offsets"], dtype=np.int64),
+            np.asarray(data["word_starts_ms"], dtype=np.float64) / 1000.0,
+            np.asarray(data["word_ends_ms"], dtype=np.float64) / 1000.0,
+            np.asarray(data["word_speakers"], dtype=np.int32),
+            np.asarray(data["segment_word_starts"], dtype=np.int64),
+            np.asarray(data["segment_word_ends"], dtype=np.int64),
+            processed_at=datetime.fromisoformat(data["processed_at"])
+        )
+
+    def to_json(self) -> bytes:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "ColumnarTranscript":
+        return cls.from_dict(json.loads(data))
+
+    def to_msgpack(self) -> bytes:
+        """MessagePack z kolumnami jako surowe bajty little-endian (bez konwersji per element). Wymaga: pip install msgpack."""
+        msgpack = _require("msgpack")
+        payload = {
+            "format": "coretranscript.columnar/1",
+            "filename": self.filename,
+            "processed_at": self.processed_at.isoformat(),
+            "speakers": self.speakers,
+            "text": self.text,
+        }
+        for name, dtype in _COLUMNS.items():
+            payload[name] = np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes()
+        return msgpack.packb(payload, use_bin_type=True)
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> "ColumnarTranscript":
+        msgpack = _require("msgpack")
+        payload = msgpack.unpackb(data, raw=False)
+        columns = {name: np.frombuffer(payload[name], dtype=dtype) for name, dtype in _COLUMNS.items()}
+        return cls(
+            payload["filename"], list(payload["speakers"]), payload["text"],
+            processed_at=datetime.fromisoformat(payload["processed_at"]), **columns
+        )
+
+    def to_arrow(self):
+        """Tabela Arrow słów (mówca jako kolumna słownikowa) z metadanymi transkryptu. Wymaga: pip install pyarrow."""
+        pa = _require("pyarrow")
+        segment_ids = np.repeat(np.arange(len(self.segment_word_starts), dtype=np.int32),
+                                self.segment_word_ends - self.segment_word_starts)
+        table = pa.table({
+            "word": pa.array(self.word_texts(), type=pa.string()),
+            "start": pa.array(self.word_starts),
+            "end": pa.array(self.word_ends),
+            "speaker": pa.DictionaryArray.from_arrays(pa.array(self.word_speakers), pa.array(self.speakers, type=pa.string())),
+            "segment": pa.array(segment_ids),
+        })
+        metadata = {"filename": self.filename, "processed_at": self.processed_at.isoformat(), "format": "coretranscript.columnar/1"}
+        return table.replace_schema_metadata({k: v.encode("utf-8") for k, v in metadata.items()})
+
+    @classmethod
+    def from_arrow(cls, table) -> "ColumnarTranscript":
+        metadata = {k.decode("utf-8"): v.decode("utf-8") for k, v in (table.schema.metadata or {}).items()}
+        speaker_column = table.column("speaker").combine_chunks()
+        # Granice wypowiedzi z kolumny segment (nie tylko ze zmian mówcy)
+        segments = table.column("segment").to_numpy()
+        boundaries = np.flatnonzero(np.diff(segments)) + 1
+        n = table.num_rows
+        text, offsets = _pack_words(table.column("word").to_pylist())
+        return cls(
+            metadata.get("filename", ""), speaker_column.dictionary.to_pylist(), text, offsets,
+            table.column("start").to_numpy(), table.column("end").to_numpy(),
+            speaker_column.indices.to_numpy().astype(np.int32),
+            np.concatenate([[0], boundaries]).astype(np.int64) if n else np.empty(0, np.int64),
+            np.concatenate([boundaries, [n]]).astype(np.int64) if n else np.empty(0, np.int64),
+            processed_at=datetime.fromisoformat(metadata["processed_at"]) if "processed_at" in metadata else None
+        )
+
+    def to_parquet(self, path):
+        """:param path: Ścieżka pliku albo binarny obiekt plikowy (np. io.BytesIO)."""
+        _require("pyarrow")
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path, compression="zstd")
+
+    @classmethod
+    def from_parquet(cls, path: str) -> "ColumnarTranscript":
+        _require("pyarrow")
+        import pyarrow.parquet as pq
+        return cls.from_arrow(pq.read_table(path))
+
+
+# Kolumny binarne (nazwa atrybutu -> typ little-endian)
+_COLUMNS = {
+    "word_offsets": "<i8",
+    "word_starts": "<f8",
+    "word_ends": "<f8",
+    "word_speakers": "<i4",
+    "segment_word_starts": "<i8",
+    "segment_word_ends": "<i8",
+}
+
+
+def _pack_words(words: Sequence[str]):
+    """Zwraca (bufor tekstu, przesunięcia początków słów + koniec bufora)."""
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+    offsets = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum(lengths + len(WORD_SEPARATOR), out=offsets[1:])
+    text = WORD_SEPARATOR.join(words) + WORD_SEPARATOR if len(words) else ""
+    return text, offsets
+
+
+def _to_ms(seconds: np.ndarray) -> List[int]:
+    return np.rint(seconds * 1000.0).astype(np.int64).tolist()
+
+
+def _require(module: str):
+    """Import opcjonalnej zależności z czytelnym komunikatem."""
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise ImportError(f"Eksport wymaga pakietu '{module}' (pip install {module})") from e
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
+from enum import Enum
 
 class TranscriptionSegment(BaseModel):
     """
@@ -15,19 +16,81 @@ class TranscriptionSegment(BaseModel):
     def duration(self) -> float:
         return self.end - self.start
 
+class SpeakerIdentity(BaseModel):
+    """
+    Dopasowanie mówcy z diaryzacji do zapisanej tożsamości (indeks głosów).
+    """
+    label: str = Field(..., description="Etykieta z diaryzacji (np. SPEAKER_01)")
+    identity: Optional[str] = Field(None, description="Rozpoznana osoba (None - poniżej progu pewności)")
+    score: Optional[float] = Field(None, description="Podobieństwo cosinusowe najlepszego dopasowania")
+
 class MeetingTranscript(BaseModel):
     """
     Pełny zapis spotkania zawierający metadane i listę wypowiedzi.
     """
     filename: str
+    # Identyfikator artefaktów etapów (ponowna diaryzacja / alignment bez ASR); None, gdy nie zapisano
+    meeting_id: Optional[str] = None
     processed_at: datetime = Field(default_factory=datetime.now)
     segments: List[TranscriptionSegment]
     
+    # Mówcy rozpoznani w indeksie głosów (segmenty rozpoznanych mają speaker = nazwa osoby)
+    speakers: Optional[List[SpeakerIdentity]] = None
+
+    # Cisza wycięta przez VAD przed modelami (s); None, gdy VAD wyłączony lub nic nie wycięto
+    skipped_audio: Optional[float] = Field(None, description="Sekundy ciszy pominięte przed ASR i diaryzacją")
+
     # Opcjonalnie: miejsce na podsumowanie AI, które dodamy w przyszłości
     summary: Optional[str] = None 
 
+    # Czasy etapów przetwarzania w sekundach (np. decode, asr, diarization, alignment, total)
+    timings: Optional[Dict[str, float]] = Field(None, description="Czasy etapów przetwarzania (s)")
+
     @property
     def total_duration(self) -> float:
         if not self.segments:
             return 0.0
-        return self.segments[-1].end
\ No newline at end of file
+        return self.segments[-1].end
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobInfo(BaseModel):
+    """
+    Stan zadania przetwarzania w tle (kolejka /jobs).
+    """
+    job_id: str
+    filename: str
+    status: JobState = JobState.QUEUED
+    stage: Optional[str] = Field(None, description="Aktualny etap (np. asr, diarization, alignment)")
+    progress: float = Field(0.0, description="Postęp 0..1")
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[MeetingTranscript] = None
+
+class SearchHit(BaseModel):
+    """
+    Trafienie wyszukiwania pełnotekstowego: wypowiedź w konkretnym spotkaniu i momencie nagrania.
+    """
+    meeting_id: str = Field(..., description="Klucz spotkania w indeksie (meeting_id transkryptu, jeśli był)")
+    filename: str
+    speaker: str
+    start: float = Field(..., description="Początek wypowiedzi w nagraniu (s)")
+    end: float = Field(..., description="Koniec wypowiedzi w nagraniu (s)")
+    text: str
+    snippet: str = Field(..., description="Fragment z dopasowanymi słowami w [nawiasach]")
+    score: float = Field(..., description="Trafność BM25 (większa = lepsza)")
+
+class SegmentPage(BaseModel):
+    """
+    Strona segmentów z zapisanego transkryptu (okno czasu / mówcy), stronicowana kursorem.
+    """
+    segments: List[TranscriptionSegment]
+    next_cursor: Optional[str] = Field(None, description="Kursor następnej strony (None - to ostatnia strona)")
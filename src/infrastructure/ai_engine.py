@@ -1,78 +1,230 @@
-import mlx_whisper
-import torch
-from pyannote.audio import Pipeline
 import os
+import time
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union, Callable
+
+from src.infrastructure.asr_backends import ASRBackend, create_asr_backend
+from src.infrastructure.asr_batching import ASRBatcher
+from src.infrastructure.audio_loader import AudioBuffer, load_audio
+from src.infrastructure.chunked_asr import ChunkedTranscriber
+from src.infrastructure.metrics import MODEL_LOAD_SECONDS
+from src.infrastructure.model_manager import ModelManager
 
 # Konfiguracja loggera
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SPEAKER_HINTS = ("num_speakers", "min_speakers", "max_speakers")
+
+
+def validate_speaker_hints(speaker_hints: Optional[Dict[str, Optional[int]]]) -> Dict[str, int]:
+    """Zwraca podane (nie-None) podpowiedzi liczby mówców; ValueError przy sprzecznych wartościach."""
+    hints = {k: int(v) for k, v in (speaker_hints or {}).items() if v is not None}
+    unknown = set(hints) - set(SPEAKER_HINTS)
+    if unknown:
+        raise ValueError(f"Nieznane podpowiedzi mówców: {sorted(unknown)} (dostępne: {SPEAKER_HINTS})")
+    if any(v < 1 for v in hints.values()):
+        raise ValueError("Liczba mówców musi być dodatnia.")
+    if "num_speakers" in hints and ("min_speakers" in hints or "max_speakers" in hints):
+        raise ValueError("num_speakers wyklucza min_speakers/max_speakers.")
+    if hints.get("min_speakers", 1) > hints.get("max_speakers", float("inf")):
+        raise ValueError("min_speakers nie może być większe niż max_speakers.")
+    return hints
+
+
 class AIEngine:
     """
     Fasada infrastrukturalna dla silników AI (ASR + Diaryzacja).
     Odpowiedzialność: Tylko i wyłącznie interakcja z modelami ML.
+    Biblioteki modeli (MLX, torch, pyannote) importowane są dopiero przy pierwszym użyciu.
     """
 
-    def __init__(self, asr_model: str = "mlx-community/whisper-large-v3-turbo"):
-        self.asr_model_path = asr_model
+    def __init__(self, asr_model: Optional[str] = None,
+                 diarization_model: str = "pyannote/speaker-diarization-3.1",
+                 asr_chunk_seconds: Optional[float] = None, asr_chunk_overlap: float = 1.0, asr_workers: int = 1,
+                 asr_backend: str = "mlx", asr_threads: int = 0, asr_compute_type: str = "int8",
+                 asr_batcher: Optional[ASRBatcher] = None, model_manager: Optional[ModelManager] = None):
+        """
+        :param asr_model: Model ASR (None = domyślny model wybranego backendu).
+        :param asr_chunk_seconds: Długość fragmentu dla długich nagrań (None = całość w jednym wywołaniu).
+        :param asr_chunk_overlap: Zakładka między fragmentami (s), usuwana przy sklejaniu.
+        :param asr_workers: Liczba fragmentów transkrybowanych równocześnie.
+        :param asr_backend: 'mlx' (Apple Silicon), 'cpu' (faster-whisper int8) lub 'fake' (deterministyczny, bez modelu).
+        :param asr_threads: Wątki CPU na jedno wywołanie backendu 'cpu' (0 = automatycznie).
+        :param asr_compute_type: Precyzja backendu 'cpu' (domyślnie int8).
+        :param asr_batcher: Wspólna kolejka partii ASR (np. dla wszystkich replik) - okna z równoczesnych
+                            wywołań liczone są razem na backendzie batchera zamiast na własnym.
+        :param model_manager: Wspólny menedżer pamięci modeli (budżet, zwalnianie bezczynnych);
+                              domyślnie własny, bez limitów - modele zostają załadowane na zawsze.
+        """
+        if asr_batcher is not None:
+            self.asr: ASRBackend = asr_batcher.backend
+        else:
+            self.asr = create_asr_backend(
+                asr_backend, asr_model, threads=asr_threads, compute_type=asr_compute_type, workers=asr_workers
+            )
+        self.asr_batcher = asr_batcher
+        self.models = model_manager or ModelManager()
+        if self.asr.models is None:
+            self.asr.models = self.models
+        self.asr_backend = asr_backend
+        self.asr_threads = asr_threads
+        self.asr_compute_type = asr_compute_type
+        self.asr_model_path = self.asr.model
+        self.diarization_model = diarization_model
+        self.asr_chunk_seconds = asr_chunk_seconds
+        self.asr_chunk_overlap = asr_chunk_overlap
+        self.asr_workers = asr_workers
         self.hf_token = os.getenv("HF_TOKEN")
-        self._diarization_pipeline: Optional[Pipeline] = None
+        # Każdy silnik (replika) ma własną instancję pipeline'u - klucz obejmuje właściciela
+        self._diarization_key = ("diarization", diarization_model, id(self))
         
-        logger.info(f"Zainicjowano AIEngine. Model ASR: {self.asr_model_path}")
+        logger.info(f"Zainicjowano AIEngine. Backend ASR: {self.asr_backend}, model: {self.asr_model_path}")
+
+    def config(self) -> Dict[str, Any]:
+        """Argumenty konstruktora - pozwalają odtworzyć silnik w procesie roboczym."""
+        return {
+            "asr_model": self.asr_model_path,
+            "diarization_model": self.diarization_model,
+            "asr_chunk_seconds": self.asr_chunk_seconds,
+            "asr_chunk_overlap": self.asr_chunk_overlap,
+            "asr_workers": self.asr_workers,
+            "asr_backend": self.asr_backend,
+            "asr_threads": self.asr_threads,
+            "asr_compute_type": self.asr_compute_type,
+        }
+
+    def asr_fingerprint(self) -> Dict[str, Any]:
+        """Parametry wpływające na wynik ASR (klucz cache). Liczba wątków nie zmienia wyniku."""
+        return {
+            **self.asr.fingerprint(),
+            "chunk_seconds": self.asr_chunk_seconds,
+            "chunk_overlap": self.asr_chunk_overlap,
+        }
+
+    def diarization_fingerprint(self, speaker_hints: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Parametry wpływające na wynik diaryzacji (klucz cache)."""
+        fingerprint = {"model": self.diarization_model}
+        if speaker_hints:
+            fingerprint["speakers"] = dict(speaker_hints)
+        return fingerprint
 
     @property
-    def diarization_pipeline(self) -> Pipeline:
-        if self._diarization_pipeline is None:
-            logger.info("Ładowanie modelu Pyannote (Lazy Load)...")
-            if not self.hf_token:
-                logger.warning("Brak HF_TOKEN! Diaryzacja modelu zamkniętego się nie uda.")
-
-            try:
-                # Wymaga: pip install "huggingface_hub<0.25.0"
-                pipeline = Pipeline.from_pretrained(
-                    "pyannote/speaker-diarization-3.1",
-                    use_auth_token=self.hf_token
-                )
-                
-                if torch.backends.mps.is_available():
-                    device = torch.device("mps")
-                    pipeline.to(device)
-                    logger.info("Pyannote załadowano na: MPS (Apple GPU) 🚀")
-                else:
-                    pipeline.to(torch.device("cpu"))
-                    logger.info("Pyannote załadowano na: CPU 🐢")
-                
-                self._diarization_pipeline = pipeline
-            except Exception as e:
-                logger.error(f"Krytyczny błąd ładowania Pyannote: {e}")
-                raise RuntimeError("Błąd ładowania modelu diaryzacji.") from e
-        
-        return self._diarization_pipeline
+    def diarization_pipeline(self):
+        """Pipeline Pyannote (ładowany przy pierwszym użyciu; menedżer pamięci może go później zwolnić)."""
+        return self.models.get(self._diarization_key, self._load_diarization_pipeline, name=self.diarization_model)
+
+    def _load_diarization_pipeline(self):
+        import torch
+        from pyannote.audio import Pipeline
+
+        logger.info("Ładowanie modelu Pyannote (Lazy Load)...")
+        if not self.hf_token:
+            logger.warning("Brak HF_TOKEN! Diaryzacja modelu zamkniętego się nie uda.")
 
-    def transcribe(self, audio_file_path: str) -> Dict[str, Any]:
-        """Zwraca surowy wynik z Whispera."""
-        self._validate_file(audio_file_path)
-        logger.info(f"Start ASR: {os.path.basename(audio_file_path)}")
+        load_start = time.perf_counter()
         try:
-            return mlx_whisper.transcribe(
-                audio_file_path, 
-                path_or_hf_repo=self.asr_model_path,
-                word_timestamps=True
+            # Wymaga: pip install "huggingface_hub<0.25.0"
+            pipeline = Pipeline.from_pretrained(
+                self.diarization_model,
+                use_auth_token=self.hf_token
             )
+            
+            if self.diarization_device == "mps":
+                pipeline.to(torch.device("mps"))
+                logger.info("Pyannote załadowano na: MPS (Apple GPU) 🚀")
+            else:
+                pipeline.to(torch.device("cpu"))
+                logger.info("Pyannote załadowano na: CPU 🐢")
+            
+            MODEL_LOAD_SECONDS.observe(time.perf_counter() - load_start, model=self.diarization_model)
+            return pipeline
+        except Exception as e:
+            logger.error(f"Krytyczny błąd ładowania Pyannote: {e}")
+            raise RuntimeError("Błąd ładowania modelu diaryzacji.") from e
+
+    @property
+    def asr_device(self) -> str:
+        """Urządzenie, na którym liczy ASR (MLX - GPU Apple Silicon, faster-whisper - CPU)."""
+        return self.asr.device
+
+    @property
+    def diarization_device(self) -> str:
+        """Urządzenie, na którym liczy Pyannote (bez ładowania modelu)."""
+        try:
+            import torch
+        except ImportError:
+            return "cpu"
+        return "mps" if torch.backends.mps.is_available() else "cpu"
+
+    def stages_share_device(self) -> bool:
+        """Czy ASR i diaryzacja walczą o ten sam akcelerator (wtedy równoległość nic nie daje)."""
+        return self.asr_device == self.diarization_device
+
+    def transcribe(self, audio: Union[str, AudioBuffer],
+                   progress_callback: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
+        """
+        Zwraca surowy wynik z Whispera.
+        :param audio: Ścieżka do pliku lub zdekodowany AudioBuffer (bez ponownego dekodowania).
+        :param progress_callback: Wywoływany z postępem 0..1 (w trybie fragmentów po każdym fragmencie).
+        """
+        if self.asr_chunk_seconds:
+            if isinstance(audio, AudioBuffer):
+                return self._transcribe_chunked(audio, progress_callback)
+            self._validate_file(audio)
+            with load_audio(audio) as buffer:
+                return self._transcribe_chunked(buffer, progress_callback)
+
+        audio_input, name = self._prepare_input(audio)
+        logger.info(f"Start ASR: {name}")
+        result = self._transcribe_input(audio_input)
+        if progress_callback:
+            progress_callback(1.0)
+        return result
+
+    def _transcribe_chunked(self, audio: AudioBuffer, progress_callback=None) -> Dict[str, Any]:
+        transcriber = ChunkedTranscriber(
+            self._transcribe_input,
+            max_workers=self.asr_workers,
+            chunk_seconds=self.asr_chunk_seconds,
+            overlap_seconds=self.asr_chunk_overlap
+        )
+        return transcriber.transcribe(audio, progress_callback)
+
+    def _transcribe_input(self, audio_input) -> Dict[str, Any]:
+        try:
+            if self.asr_batcher is not None:
+                return self.asr_batcher.transcribe(audio_input)
+            return self.asr.transcribe(audio_input)
         except Exception as e:
             logger.error(f"Błąd transkrypcji: {e}")
             raise
 
-    def diarize(self, audio_file_path: str) -> List[Dict[str, Any]]:
-        """Zwraca surowe segmenty czasowe mówców."""
-        self._validate_file(audio_file_path)
-        logger.info(f"Start Diaryzacji: {os.path.basename(audio_file_path)}")
-        
-        pipeline = self.diarization_pipeline
+    def diarize(self, audio: Union[str, AudioBuffer], speaker_hints: Optional[Dict[str, int]] = None,
+                return_embeddings: bool = False):
+        """
+        Zwraca surowe segmenty czasowe mówców.
+        :param audio: Ścieżka do pliku lub zdekodowany AudioBuffer (bez ponownego dekodowania).
+        :param speaker_hints: Podpowiedzi dla Pipeline Pyannote: num_speakers / min_speakers / max_speakers.
+        :param return_embeddings: Zwróć też embeddingi mówców liczone przez Pipeline w trakcie diaryzacji
+                                  - wynik to wtedy (segmenty, {etykieta: embedding}).
+        """
+        audio_input, name = self._prepare_input(audio)
+        hints = validate_speaker_hints(speaker_hints)
+        logger.info(f"Start Diaryzacji: {name}" + (f" ({hints})" if hints else ""))
+
+        with self.models.use(self._diarization_key, self._load_diarization_pipeline,
+                             name=self.diarization_model) as pipeline:
+            return self._run_diarization(pipeline, audio, audio_input, hints, return_embeddings)
+
+    def _run_diarization(self, pipeline, audio, audio_input, hints: Dict[str, int], return_embeddings: bool):
         try:
-            diarization = pipeline(audio_file_path)
+            if isinstance(audio, AudioBuffer):
+                audio_input = audio.as_pyannote_input()
+            if return_embeddings:
+                diarization, embeddings = pipeline(audio_input, return_embeddings=True, **hints)
+            else:
+                diarization = pipeline(audio_input, **hints)
             segments = []
             for turn, _, speaker in diarization.itertracks(yield_label=True):
                 segments.append({
@@ -81,11 +233,30 @@ class AIEngine:
                     "speaker": speaker
                 })
             logger.info(f"Znaleziono {len(segments)} segmentów mówców.")
-            return segments
+            if not return_embeddings:
+                return segments
+            return segments, self._speaker_embeddings(diarization.labels(), embeddings)
         except Exception as e:
             logger.error(f"Błąd diaryzacji: {e}")
             raise
 
+    @staticmethod
+    def _speaker_embeddings(labels: List[str], embeddings) -> Dict[str, List[float]]:
+        """Wiersze macierzy Pyannote odpowiadają kolejno diarization.labels(); mówcy bez embeddingu (NaN) są pomijani."""
+        result = {}
+        for label, row in zip(labels, embeddings):
+            vector = [float(v) for v in row]
+            if vector and all(v == v for v in vector):
+                result[label] = vector
+        return result
+
+    def _prepare_input(self, audio: Union[str, AudioBuffer]):
+        """Zwraca (wejście dla modelu, nazwa do logów). Bufory są przekazywane bez kopiowania."""
+        if isinstance(audio, AudioBuffer):
+            return audio.samples, audio.name
+        self._validate_file(audio)
+        return audio, os.path.basename(audio)
+
     def _validate_file(self, path: str):
         if not os.path.exists(path):
             raise FileNotFoundError(f"Nie znaleziono pliku: {path}")
\ No newline at end of file
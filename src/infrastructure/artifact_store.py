@@ -0,0 +1,195 @@
+# File: src/infrastructure/artifact_store.py
+
+import os
+import json
+import time
+import shutil
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.domain.models.columnar import ColumnarTranscript
+from src.infrastructure.audio_loader import AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+AUDIO_FILE = "audio.f32"
+META_FILE = "meeting.json"
+WORDS_FILE = "words.json"
+STAGES = ("asr", "diarization", "embeddings")
+
+
+class MeetingNotFoundError(LookupError):
+    """Brak artefaktów spotkania (nieznany identyfikator albo usunięte przy przekroczeniu limitu)."""
+
+
+class ArtifactStore:
+    """
+    Surowe wyniki etapów per spotkanie - podstawa ponownej diaryzacji / alignmentu bez ponownego ASR.
+    Układ: <root>/<meeting_id>/{meeting.json, asr.json, diarization.json, audio.f32, words.json}
+    (+ embeddings.json - embeddingi mówców, gdy włączony indeks głosów).
+    words.json to transkrypt kolumnowy z czasami słów z ostatniego alignmentu (eksport JSON/MessagePack/Parquet).
+    audio.f32 to zdekodowane PCM (16kHz mono float32, ok. 230 MB/h) - ponowna diaryzacja mapuje je w pamięć
+    bez dekodowania. Po przekroczeniu limitu rozmiaru usuwane są spotkania najdawniej używane.
+    """
+
+    def __init__(self, root_dir: str, max_bytes: int = 8 * 1024 ** 3):
+        self.root_dir = os.path.abspath(os.path.expanduser(root_dir))
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    # --- API ---
+
+    def exists(self, meeting_id: str) -> bool:
+        return os.path.exists(os.path.join(self._dir(meeting_id), META_FILE))
+
+    def save(self, meeting_id: str, audio: AudioBuffer, raw_transcription: Dict[str, Any],
+             raw_diarization: List[Dict[str, Any]], metadata: Dict[str, Any],
+             speaker_embeddings: Optional[Dict[str, List[float]]] = None):
+        """Zapisuje komplet artefaktów; metadane na końcu - spotkanie istnieje dopiero po pełnym zapisie."""
+        meeting_dir = self._dir(meeting_id)
+        os.makedirs(meeting_dir, exist_ok=True)
+        self._write_audio(meeting_dir, audio)
+        self.save_stage(meeting_id, "asr", raw_transcription)
+        self.save_stage(meeting_id, "diarization", raw_diarization)
+        if speaker_embeddings is not None:
+            self.save_stage(meeting_id, "embeddings", speaker_embeddings)
+        self.update_metadata(meeting_id, {
+            **metadata,
+            "meeting_id": meeting_id,
+            "audio_duration": audio.duration,
+            "created_at": time.time(),
+        })
+        self._evict(keep=meeting_id)
+
+    def save_stage(self, meeting_id: str, stage: str, data: Any):
+        if stage not in STAGES:
+            raise ValueError(f"Nieznany etap: {stage} (dostępne: {STAGES})")
+        self._write_atomic(os.path.join(self._dir(meeting_id), f"{stage}.json"),
+                           json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    def load_stage(self, meeting_id: str, stage: str) -> Any:
+        path = os.path.join(self._dir(meeting_id), f"{stage}.json")
+        if not self.exists(meeting_id) or not os.path.exists(path):
+            raise MeetingNotFoundError(f"Brak artefaktu '{stage}' dla spotkania: {meeting_id}")
+        self._touch(meeting_id)
+        with open(path, "rb") as f:
+            return json.loads(f.read())
+
+    def save_columnar(self, meeting_id: str, columnar: ColumnarTranscript):
+        """Zapisuje wynik alignmentu z czasami słów (nadpisywany przy rediarize/realign)."""
+        self._write_atomic(os.path.join(self._dir(meeting_id), WORDS_FILE), columnar.to_json())
+
+    def load_columnar(self, meeting_id: str) -> ColumnarTranscript:
+        path = os.path.join(self._dir(meeting_id), WORDS_FILE)
+        if not self.exists(meeting_id) or not os.path.exists(path):
+            raise MeetingNotFoundError(f"Brak transkryptu z czasami słów dla spotkania: {meeting_id}")
+        self._touch(meeting_id)
+        with open(path, "rb") as f:
+            return ColumnarTranscript.from_json(f.read())
+
+    def open_audio(self, meeting_id: str) -> AudioBuffer:
+        """Audio spotkania mapowane w pamięć (plik należy do magazynu - close() go nie usuwa)."""
+        path = os.path.join(self._dir(meeting_id), AUDIO_FILE)
+        if not self.exists(meeting_id) or not os.path.exists(path):
+            raise MeetingNotFoundError(f"Brak audio dla spotkania: {meeting_id}")
+        metadata = self.metadata(meeting_id)
+        return AudioBuffer.from_file(path, name=metadata.get("filename", meeting_id))
+
+    def metadata(self, meeting_id: str) -> Dict[str, Any]:
+        path = os.path.join(self._dir(meeting_id), META_FILE)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise MeetingNotFoundError(f"Nie znaleziono spotkania: {meeting_id}") from None
+
+    def update_metadata(self, meeting_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            try:
+                metadata = self.metadata(meeting_id)
+            except MeetingNotFoundError:
+                metadata = {}
+            metadata.update(updates)
+            self._write_atomic(os.path.join(self._dir(meeting_id), META_FILE),
+                               json.dumps(metadata, ensure_ascii=False, indent=2).encode("utf-8"))
+        return metadata
+
+    def delete(self, meeting_id: str) -> bool:
+        meeting_dir = self._dir(meeting_id)
+        if not os.path.isdir(meeting_dir):
+            return False
+        shutil.rmtree(meeting_dir, ignore_errors=True)
+        return True
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadane zapisanych spotkań, od najnowszych."""
+        found = []
+        for meeting_id in os.listdir(self.root_dir):
+            try:
+                found.append(self.metadata(meeting_id))
+            except (MeetingNotFoundError, NotADirectoryError, ValueError):
+                continue
+        return sorted(found, key=lambda m: m.get("created_at", 0), reverse=True)
+
+    # --- Wewnętrzne ---
+
+    def _dir(self, meeting_id: str) -> str:
+        # Identyfikator trafia do ścieżki - tylko znaki bezpieczne (hex / uuid)
+        if not meeting_id or not meeting_id.replace("-", "").isalnum():
+            raise MeetingNotFoundError(f"Nieprawidłowy identyfikator spotkania: {meeting_id!r}")
+        return os.path.join(self.root_dir, meeting_id)
+
+    def _write_audio(self, meeting_dir: str, audio: AudioBuffer):
+        target = os.path.join(meeting_dir, AUDIO_FILE)
+        fd, tmp_path = tempfile.mkstemp(dir=meeting_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            if audio.backing_path is not None:
+                # Bufor już jest plikiem PCM - kopia bez ładowania próbek do pamięci
+                shutil.copyfile(audio.backing_path, tmp_path)
+            else:
+                np.ascontiguousarray(audio.samples, dtype=np.float32).tofile(tmp_path)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _touch(self, meeting_id: str):
+        try:
+            os.utime(os.path.join(self._dir(meeting_id), META_FILE))  # pozycja LRU
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, keep: str):
+        entries = []
+        total = 0
+        for meeting_id in os.listdir(self.root_dir):
+            meeting_dir = os.path.join(self.root_dir, meeting_id)
+            meta_path = os.path.join(meeting_dir, META_FILE)
+            if not os.path.exists(meta_path):
+                continue
+            size = sum(e.stat().st_size for e in os.scandir(meeting_dir) if e.is_file())
+            entries.append((os.stat(meta_path).st_mtime, meeting_id, size))
+            total += size
+
+        for _, meeting_id, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if meeting_id == keep:
+                continue
+            self.delete(meeting_id)
+            total -= size
+            logger.info(f"Artefakty: usunięto spotkanie {meeting_id} (limit {self.max_bytes / 1e9:.1f} GB)")
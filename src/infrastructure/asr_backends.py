@@ -0,0 +1,225 @@
+# File: src/infrastructure/asr_backends.py
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from src.infrastructure.metrics import MODEL_LOAD_SECONDS
+from src.infrastructure.model_manager import ModelManager
+
+logger = logging.getLogger(__name__)
+
+# Wejście backendu: ścieżka do pliku albo próbki 16kHz mono float32
+ASRInput = Union[str, np.ndarray]
+
+
+class ASRBackend:
+    """
+    Wspólny interfejs silników ASR.
+    Każdy backend zwraca słownik w formacie Whispera, który konsumuje AlignmentService:
+    {"text": str, "language": str, "segments": [{"id", "start", "end", "text", "words": [{"word", "start", "end", "probability"}]}]}
+    Biblioteki modeli importowane są dopiero przy pierwszym użyciu - moduł działa bez nich.
+    """
+
+    name = "base"
+    default_model = ""
+    device = "cpu"
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or self.default_model
+        # Menedżer pamięci modeli (ustawiany przez AIEngine) - backendy ładujące wagi samodzielnie ładują je przez niego
+        self.models: Optional[ModelManager] = None
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """Parametry wpływające na wynik (klucz cache)."""
+        return {"backend": self.name, "model": self.model}
+
+    def transcribe(self, audio: ASRInput) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def transcribe_batch(self, audios: List[ASRInput]) -> List[Dict[str, Any]]:
+        """
+        Transkrybuje partię okien (ASRBatcher); wyniki w kolejności wejścia.
+        Domyślnie okno po oknie - backendy z równoległą lub wsadową inferencją nadpisują tę metodę.
+        """
+        return [self.transcribe(audio) for audio in audios]
+
+
+class MLXWhisperBackend(ASRBackend):
+    """Whisper na MLX - GPU Apple Silicon (Metal)."""
+
+    name = "mlx"
+    default_model = "mlx-community/whisper-large-v3-turbo"
+    device = "mps"
+
+    def __init__(self, model: Optional[str] = None):
+        super().__init__(model)
+        self._loaded = False
+
+    def transcribe(self, audio: ASRInput) -> Dict[str, Any]:
+        import mlx_whisper
+        if self._loaded:
+            return mlx_whisper.transcribe(audio, path_or_hf_repo=self.model, word_timestamps=True)
+
+        # mlx_whisper ładuje wagi wewnątrz pierwszego wywołania - jego czas (z inferencją) liczymy jako ładowanie
+        start = time.perf_counter()
+        result = mlx_whisper.transcribe(audio, path_or_hf_repo=self.model, word_timestamps=True)
+        self._loaded = True
+        MODEL_LOAD_SECONDS.observe(time.perf_counter() - start, model=self.model)
+        return result
+
+
+class FasterWhisperBackend(ASRBackend):
+    """
+    Whisper na CTranslate2 (faster-whisper) - kwantyzowana inferencja int8 na CPU (serwery Linux).
+    Model ładowany jest raz, przy pierwszym wywołaniu; jedna instancja obsługuje num_workers wywołań naraz.
+    """
+
+    name = "cpu"
+    default_model = "large-v3-turbo"
+    device = "cpu"
+
+    def __init__(self, model: Optional[str] = None, compute_type: str = "int8", cpu_threads: int = 0,
+                 num_workers: int = 1, beam_size: int = 5):
+        """
+        :param compute_type: Precyzja CTranslate2 (int8, int8_float32, float32...).
+        :param cpu_threads: Wątki na jedno wywołanie (0 = domyślne CTranslate2).
+        :param num_workers: Liczba równoległych wywołań transcribe (np. fragmentów długich nagrań).
+        """
+        super().__init__(model)
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.beam_size = beam_size
+        self._model = None
+
+    def fingerprint(self) -> Dict[str, Any]:
+        # Liczba wątków nie zmienia wyniku, precyzja i beam search - tak
+        return {**super().fingerprint(), "compute_type": self.compute_type, "beam_size": self.beam_size}
+
+    @property
+    def whisper_model(self):
+        if self.models is not None:
+            return self.models.get(("asr", self.model, id(self)), self._load_model, name=self.model)
+        if self._model is None:
+            self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        from faster_whisper import WhisperModel
+        start = time.perf_counter()
+        logger.info(f"Ładowanie modelu faster-whisper: {self.model} ({self.compute_type}, wątki: {self.cpu_threads or 'auto'})")
+        model = WhisperModel(
+            self.model,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+            num_workers=self.num_workers
+        )
+        MODEL_LOAD_SECONDS.observe(time.perf_counter() - start, model=self.model)
+        return model
+
+    @contextmanager
+    def _model_in_use(self) -> Iterator[Any]:
+        """Model zablokowany przed zwolnieniem przez menedżera pamięci do końca transkrypcji."""
+        if self.models is None:
+            yield self.whisper_model
+            return
+        with self.models.use(("asr", self.model, id(self)), self._load_model, name=self.model) as model:
+            yield model
+
+    def transcribe(self, audio: ASRInput) -> Dict[str, Any]:
+        with self._model_in_use() as whisper_model:
+            # Segmenty są generowane leniwie - model musi zostać w pamięci do końca iteracji
+            segments_iter, info = whisper_model.transcribe(audio, beam_size=self.beam_size, word_timestamps=True)
+            segments = []
+            for index, segment in enumerate(segments_iter):
+                segments.append({
+                    "id": index,
+                    "start": segment.start,
+                    "end": segment.end,
+                    "text": segment.text,
+                    "words": [
+                        {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                        for w in (segment.words or [])
+                    ],
+                })
+        return {"text": "".join(s["text"] for s in segments), "language": info.language, "segments": segments}
+
+    def transcribe_batch(self, audios: List[ASRInput]) -> List[Dict[str, Any]]:
+        # CTranslate2 liczy równocześnie do num_workers wywołań z różnych wątków (wspólne wagi modelu)
+        if self.num_workers <= 1 or len(audios) <= 1:
+            return super().transcribe_batch(audios)
+        # Ładowanie raz, przed rozdzieleniem partii na wątki
+        with self._model_in_use(), ThreadPoolExecutor(max_workers=min(self.num_workers, len(audios)),
+                                                      thread_name_prefix="asr-batch") as pool:
+            return list(pool.map(self.transcribe, audios))
+
+
+class FakeASRBackend(ASRBackend):
+    """
+    Deterministyczny backend bez modelu (testy, benchmarki infrastruktury).
+    Emituje słowa w stałym rytmie tylko tam, gdzie sygnał przekracza próg energii
+    (ten sam sygnał zawsze daje ten sam wynik).
+    """
+
+    name = "fake"
+    default_model = "fake"
+    device = "cpu"
+
+    def __init__(self, model: Optional[str] = None, word_seconds: float = 0.4, energy_threshold: float = 0.01):
+        super().__init__(model)
+        self.word_seconds = word_seconds
+        self.energy_threshold = energy_threshold
+
+    def transcribe(self, audio: ASRInput) -> Dict[str, Any]:
+        samples, sample_rate = self._load(audio)
+        step = int(self.word_seconds * sample_rate)
+        frames = samples[:len(samples) // step * step].reshape(-1, step)
+        voiced = np.flatnonzero(np.sqrt(np.mean(frames ** 2, axis=1)) >= self.energy_threshold)
+        words: List[Dict[str, Any]] = []
+        for index in voiced.tolist():
+            start = index * self.word_seconds
+            words.append({"word": f" w{index}", "start": start, "end": start + self.word_seconds * 0.8, "probability": 1.0})
+
+        segments = []
+        for index in range(0, len(words), 10):
+            group = words[index:index + 10]
+            segments.append({
+                "id": len(segments),
+                "start": group[0]["start"],
+                "end": group[-1]["end"],
+                "text": "".join(w["word"] for w in group),
+                "words": group,
+            })
+        return {"text": "".join(s["text"] for s in segments), "language": "pl", "segments": segments}
+
+    @staticmethod
+    def _load(audio: ASRInput):
+        if isinstance(audio, str):
+            import soundfile as sf
+            samples, sample_rate = sf.read(audio, dtype="float32", always_2d=True)
+            return samples.mean(axis=1), sample_rate
+        return np.asarray(audio, dtype=np.float32), 16000
+
+
+ASR_BACKENDS = {
+    MLXWhisperBackend.name: MLXWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    FakeASRBackend.name: FakeASRBackend,
+}
+
+
+def create_asr_backend(name: str, model: Optional[str] = None, threads: int = 0,
+                       compute_type: str = "int8", workers: int = 1) -> ASRBackend:
+    """Tworzy backend po nazwie z konfiguracji (CORETRANSCRIPT_ASR_BACKEND)."""
+    if name not in ASR_BACKENDS:
+        raise ValueError(f"Nieznany backend ASR: {name} (dostępne: {tuple(ASR_BACKENDS)})")
+    if name == FasterWhisperBackend.name:
+        return FasterWhisperBackend(model, compute_type=compute_type, cpu_threads=threads,
+                                    num_workers=max(1, workers))
+    return ASR_BACKENDS[name](model)
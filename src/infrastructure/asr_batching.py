@@ -0,0 +1,133 @@
+# File: src/infrastructure/asr_batching.py
+
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from src.infrastructure.asr_backends import ASRBackend, ASRInput
+from src.infrastructure.metrics import ASR_BATCH_FILL, ASR_BATCH_SIZE, QUEUE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_MAX_WAIT_MS = 10.0
+
+
+class _Request:
+    __slots__ = ("audio", "future", "enqueued")
+
+    def __init__(self, audio: ASRInput):
+        self.audio = audio
+        self.future: Future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class ASRBatcher:
+    """
+    Łączy okna audio z równoczesnych żądań (spotkania, fragmenty długich nagrań) w partie dla jednego backendu ASR.
+
+    Partia rusza, gdy zbierze max_batch_size okien albo gdy od przyjścia pierwszego minie max_wait_ms -
+    pojedyncze żądanie czeka najwyżej max_wait_ms dłużej niż bez łączenia. Wyniki wracają do wywołujących
+    w tej samej kolejności. Wszystkie repliki korzystające z batchera współdzielą jeden model ASR.
+    Metryki: rozmiar i wypełnienie partii oraz czas oczekiwania (coretranscript_queue_wait_seconds{queue="asr_batch"}).
+    """
+
+    def __init__(self, backend: ASRBackend, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        """
+        :param backend: Backend wykonujący partie (ASRBackend.transcribe_batch).
+        :param max_batch_size: Maksymalna liczba okien w partii.
+        :param max_wait_ms: Ile najdłużej czekać na dopełnienie partii od przyjścia pierwszego okna.
+        """
+        if max_batch_size < 1:
+            raise ValueError("Rozmiar partii ASR musi być dodatni.")
+        if max_wait_ms < 0:
+            raise ValueError("Czas oczekiwania na partię nie może być ujemny.")
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, name="asr-batcher", daemon=True)
+        self._thread.start()
+
+    def transcribe(self, audio: ASRInput) -> Dict[str, Any]:
+        """Transkrybuje okno w najbliższej partii (blokuje do czasu wyniku; błąd backendu jest propagowany)."""
+        request = _Request(audio)
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("Batcher ASR jest zamknięty.")
+            self._queue.put(request)
+        return request.future.result()
+
+    def close(self):
+        """Kończy wątek po obsłużeniu okien, które już są w kolejce."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    # --- Wewnętrzne ---
+
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = first.enqueued + self.max_wait
+            while len(batch) < self.max_batch_size:
+                # Po terminie dobieramy już tylko okna czekające w kolejce
+                remaining = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+            self._run(batch)
+
+        # Zamknięcie: okna, które i tak trafiły do kolejki, są jeszcze obsługiwane
+        leftovers = []
+        while not self._queue.empty():
+            request = self._queue.get_nowait()
+            if request is not None:
+                leftovers.append(request)
+        for index in range(0, len(leftovers), self.max_batch_size):
+            self._run(leftovers[index:index + self.max_batch_size])
+
+    def _run(self, batch: List[_Request]):
+        started = time.perf_counter()
+        for request in batch:
+            QUEUE_WAIT_SECONDS.observe(started - request.enqueued, queue="asr_batch")
+        ASR_BATCH_SIZE.observe(len(batch))
+        ASR_BATCH_FILL.observe(len(batch) / self.max_batch_size)
+
+        try:
+            results = self.backend.transcribe_batch([request.audio for request in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Backend zwrócił {len(results)} wyników dla {len(batch)} okien.")
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].future.set_exception(e)
+                return
+            # Jedno złe okno nie może zepsuć wyników pozostałych żądań - powtarzamy pojedynczo
+            logger.warning(f"Partia ASR ({len(batch)} okien) nie powiodła się ({e}) - powtórka pojedynczo.")
+            for request in batch:
+                try:
+                    request.future.set_result(self.backend.transcribe(request.audio))
+                except Exception as single_error:
+                    request.future.set_exception(single_error)
+            return
+
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
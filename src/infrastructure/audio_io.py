@@ -4,7 +4,10 @@ import sounddevice as sd
 from scipy.io.wavfile import write
 import numpy as np
 import os
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Callable, Any
+
+from src.infrastructure.streaming_recorder import StreamingRecorder
+
 
 class AudioIOManager:
     """
@@ -44,6 +47,23 @@ class AudioIOManager:
         # Spłaszczamy tablicę (N, 1) -> (N,) bo scipy/whisper wolą płaskie wektory mono
         return recording.flatten()
 
+    def start_recording(self, file_path: str, device_index: Optional[int] = None,
+                        buffer_seconds: float = 10.0, stream_factory: Optional[Callable[..., Any]] = None) -> StreamingRecorder:
+        """
+        Nieblokujące nagrywanie o dowolnej długości prosto do pliku (.wav lub .flac).
+        Zużycie pamięci jest stałe - zwracany rejestrator kończy się przez stop().
+        """
+        recorder = StreamingRecorder(
+            file_path,
+            samplerate=self.SAMPLE_RATE,
+            channels=self.channels,
+            dtype=self.dtype,
+            device=device_index,
+            buffer_seconds=buffer_seconds,
+            stream_factory=stream_factory
+        )
+        return recorder.start()
+
     def save_to_wav(self, audio_data: np.ndarray, file_path: str) -> str:
         """
         Zrzuca surowe dane numpy do pliku .wav
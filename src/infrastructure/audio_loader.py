@@ -0,0 +1,152 @@
+# File: src/infrastructure/audio_loader.py
+
+import os
+import subprocess
+import tempfile
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 16kHz mono float32 - format wejściowy zarówno Whispera, jak i Pyannote
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 4
+
+# Powyżej tego rozmiaru (ok. 17 minut audio) PCM trafia do pliku tymczasowego mapowanego w pamięć
+DEFAULT_MEMMAP_THRESHOLD_BYTES = 64 * 1024 * 1024
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+class AudioBuffer:
+    """
+    Zdekodowane audio (16kHz, mono, float32) współdzielone przez ASR i diaryzację.
+    Duże nagrania są trzymane w pliku tymczasowym (np.memmap) - przy przekazaniu do innego
+    procesu serializowana jest tylko ścieżka, a nie próbki.
+    """
+
+    def __init__(self, samples: np.ndarray, name: str = "audio", sample_rate: int = SAMPLE_RATE,
+                 backing_path: Optional[str] = None, owns_backing_file: bool = False):
+        self.samples = samples
+        self.name = name
+        self.sample_rate = sample_rate
+        self.backing_path = backing_path
+        self._owns_backing_file = owns_backing_file
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    @property
+    def is_memmap(self) -> bool:
+        return self.backing_path is not None
+
+    @classmethod
+    def from_file(cls, backing_path: str, name: str = "audio", owns_backing_file: bool = False) -> "AudioBuffer":
+        """Mapuje w pamięć surowy plik float32 (bez kopiowania próbek)."""
+        return cls(_open_memmap(backing_path), name=name, backing_path=backing_path,
+                   owns_backing_file=owns_backing_file)
+
+    def as_pyannote_input(self) -> dict:
+        """Format wejściowy Pipeline Pyannote: {'waveform': (kanały, próbki), 'sample_rate'}."""
+        import torch
+        return {"waveform": torch.from_numpy(self.samples).unsqueeze(0), "sample_rate": self.sample_rate}
+
+    def close(self):
+        """Zwalnia bufor i usuwa plik tymczasowy (tylko w procesie, który go utworzył)."""
+        self.samples = np.empty(0, dtype=np.float32)
+        if self._owns_backing_file and self.backing_path and os.path.exists(self.backing_path):
+            os.remove(self.backing_path)
+            logger.info(f"Usunięto bufor PCM: {self.backing_path}")
+        self._owns_backing_file = False
+
+    def __enter__(self) -> "AudioBuffer":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Serializacja (ProcessPoolExecutor) ---
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.backing_path is not None:
+            # Proces roboczy mapuje ten sam plik - zero kopii próbek
+            state["samples"] = None
+        state["_owns_backing_file"] = False
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.samples is None:
+            self.samples = _open_memmap(self.backing_path)
+
+
+def load_audio(file_path: str, memmap_threshold_bytes: int = DEFAULT_MEMMAP_THRESHOLD_BYTES,
+               force_memmap: bool = False, tmp_dir: Optional[str] = None) -> AudioBuffer:
+    """
+    Dekoduje plik (dowolny format obsługiwany przez ffmpeg) jednokrotnie do 16kHz mono float32.
+    Wyjście ffmpeg czytane jest strumieniowo; po przekroczeniu progu dane trafiają do pliku
+    tymczasowego, który na końcu jest mapowany w pamięć.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Nie znaleziono pliku: {file_path}")
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-threads", "0", "-i", file_path,
+        "-f", "f32le", "-ac", "1", "-acodec", "pcm_f32le", "-ar", str(SAMPLE_RATE), "-"
+    ]
+    threshold = 0 if force_memmap else memmap_threshold_bytes
+    name = os.path.basename(file_path)
+
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError as e:
+        raise RuntimeError("Nie znaleziono ffmpeg (brew install ffmpeg).") from e
+
+    in_memory = bytearray()
+    spill_file = None
+    try:
+        while True:
+            chunk = process.stdout.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            if spill_file is None and len(in_memory) + len(chunk) > threshold:
+                spill_file = tempfile.NamedTemporaryFile(delete=False, suffix=".f32", dir=tmp_dir)
+                spill_file.write(in_memory)
+                in_memory = bytearray()
+            if spill_file is not None:
+                spill_file.write(chunk)
+            else:
+                in_memory.extend(chunk)
+
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"Błąd dekodowania audio ({name}): {stderr.decode(errors='ignore').strip()}")
+    except BaseException:
+        process.kill()
+        if spill_file is not None:
+            spill_file.close()
+            os.remove(spill_file.name)
+        raise
+
+    if spill_file is not None:
+        spill_file.close()
+        buffer = AudioBuffer.from_file(spill_file.name, name=name, owns_backing_file=True)
+        logger.info(f"Zdekodowano {name}: {buffer.duration:.1f}s (memmap: {spill_file.name})")
+    else:
+        usable = len(in_memory) - len(in_memory) % BYTES_PER_SAMPLE
+        samples = np.frombuffer(in_memory, dtype=np.float32, count=usable // BYTES_PER_SAMPLE)
+        buffer = AudioBuffer(samples, name=name)
+        logger.info(f"Zdekodowano {name}: {buffer.duration:.1f}s (w pamięci)")
+    return buffer
+
+
+def _open_memmap(path: str) -> np.ndarray:
+    num_samples = os.path.getsize(path) // BYTES_PER_SAMPLE
+    if num_samples == 0:
+        return np.empty(0, dtype=np.float32)
+    # Tryb 'c' (copy-on-write): strony współdzielone z plikiem, a tablica pozostaje zapisywalna
+    # (torch.from_numpy nie akceptuje buforów tylko do odczytu bez ostrzeżeń).
+    return np.memmap(path, dtype=np.float32, mode="c", shape=(num_samples,))
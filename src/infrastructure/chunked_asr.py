@@ -0,0 +1,174 @@
+# File: src/infrastructure/chunked_asr.py
+
+import copy
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Any, Callable, Optional
+
+import numpy as np
+
+from src.infrastructure.audio_loader import AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[float], None]
+
+
+class AudioChunk:
+    """
+    Fragment nagrania do osobnej transkrypcji (indeksy w próbkach).
+    [own_start, own_end) - zakres, za który fragment "odpowiada" na globalnej osi czasu,
+    [window_start, window_end) - zakres faktycznie podawany do modelu (z zakładką).
+    """
+
+    def __init__(self, index: int, own_start: int, own_end: int, window_start: int, window_end: int):
+        self.index = index
+        self.own_start = own_start
+        self.own_end = own_end
+        self.window_start = window_start
+        self.window_end = window_end
+
+    def __repr__(self) -> str:
+        return f"AudioChunk({self.index}, own=[{self.own_start}, {self.own_end}), window=[{self.window_start}, {self.window_end}))"
+
+
+def plan_chunks(samples: np.ndarray, sample_rate: int, chunk_seconds: float, overlap_seconds: float = 1.0,
+                search_seconds: float = 5.0, frame_seconds: float = 0.03) -> List[AudioChunk]:
+    """
+    Dzieli nagranie na fragmenty ~chunk_seconds, tnąc w najcichszym miejscu w oknie ±search_seconds
+    wokół docelowej granicy. Energia liczona jest tylko w oknach wyszukiwania, więc koszt i pamięć
+    nie zależą od długości nagrania.
+    """
+    total = len(samples)
+    chunk = int(chunk_seconds * sample_rate)
+    if total <= chunk:
+        return [AudioChunk(0, 0, total, 0, total)]
+
+    search = int(search_seconds * sample_rate)
+    frame = max(1, int(frame_seconds * sample_rate))
+    overlap = int(overlap_seconds * sample_rate)
+
+    boundaries = [0]
+    while total - boundaries[-1] > chunk:
+        target = boundaries[-1] + chunk
+        lo, hi = max(boundaries[-1] + frame, target - search), min(total, target + search)
+        window = np.asarray(samples[lo:hi], dtype=np.float32)
+        num_frames = len(window) // frame
+        if num_frames == 0:
+            boundaries.append(target)
+            continue
+        energy = np.square(window[:num_frames * frame].reshape(num_frames, frame)).mean(axis=1)
+        boundaries.append(lo + int(np.argmin(energy)) * frame + frame // 2)
+    boundaries.append(total)
+
+    return [
+        AudioChunk(i, start, end, max(0, start - overlap), min(total, end + overlap))
+        for i, (start, end) in enumerate(zip(boundaries[:-1], boundaries[1:]))
+    ]
+
+
+class ChunkedTranscriber:
+    """
+    Transkrypcja długich nagrań we fragmentach na puli wątków.
+    Wynik ma tę samą strukturę co pojedyncze wywołanie Whispera (segments -> words),
+    ze znacznikami czasu na globalnej osi i bez duplikatów słów z zakładek.
+    """
+
+    def __init__(self, transcribe_fn: Callable[[np.ndarray], Dict[str, Any]], max_workers: int = 2,
+                 chunk_seconds: float = 120.0, overlap_seconds: float = 1.0, search_seconds: float = 5.0):
+        """
+        :param transcribe_fn: Funkcja transkrybująca tablicę próbek (16kHz float32) w wynik Whispera.
+        :param max_workers: Liczba fragmentów przetwarzanych równocześnie.
+        """
+        self.transcribe_fn = transcribe_fn
+        self.max_workers = max_workers
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.search_seconds = search_seconds
+
+    def transcribe(self, audio: AudioBuffer, progress_callback: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        chunks = plan_chunks(audio.samples, audio.sample_rate, self.chunk_seconds,
+                             self.overlap_seconds, self.search_seconds)
+        logger.info(f"ASR fragmentami: {audio.name}, {len(chunks)} fragmentów, {self.max_workers} wątków")
+
+        # Ograniczamy liczbę fragmentów "w locie" - w pamięci są tylko aktualnie przetwarzane okna
+        in_flight = threading.BoundedSemaphore(self.max_workers)
+        progress_lock = threading.Lock()
+        done = [0]
+        failed = threading.Event()
+        callback_errors: List[BaseException] = []
+
+        def on_done(future: Future):
+            in_flight.release()
+            if future.cancelled() or future.exception() is not None:
+                failed.set()
+                return
+            with progress_lock:
+                done[0] += 1
+                if progress_callback:
+                    try:
+                        progress_callback(done[0] / len(chunks))
+                    except Exception as e:
+                        # Np. anulowanie zadania - przestajemy wysyłać kolejne fragmenty
+                        callback_errors.append(e)
+                        failed.set()
+
+        futures: List[Future] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asr-chunk") as pool:
+            for chunk in chunks:
+                in_flight.acquire()
+                if failed.is_set():
+                    break
+                future = pool.submit(self._transcribe_chunk, audio, chunk)
+                future.add_done_callback(on_done)
+                futures.append(future)
+
+        # result() propaguje pierwszy błąd fragmentu
+        results = [future.result() for future in futures]
+        if callback_errors:
+            raise callback_errors[0]
+        return self._stitch(results)
+
+    def _transcribe_chunk(self, audio: AudioBuffer, chunk: AudioChunk) -> Dict[str, Any]:
+        window = np.ascontiguousarray(audio.samples[chunk.window_start:chunk.window_end], dtype=np.float32)
+        return self._merge_chunk(self.transcribe_fn(window), chunk, audio.sample_rate)
+
+    def _merge_chunk(self, result: Dict[str, Any], chunk: AudioChunk, sample_rate: int) -> Dict[str, Any]:
+        """Przesuwa czasy fragmentu na globalną oś i zostawia tylko słowa z jego zakresu własnego."""
+        offset = chunk.window_start / sample_rate
+        own_start, own_end = chunk.own_start / sample_rate, chunk.own_end / sample_rate
+
+        segments = []
+        for segment in result.get('segments', []):
+            words = []
+            for word in segment.get('words', []):
+                start, end = word['start'] + offset, word['end'] + offset
+                # Słowo należy do fragmentu, w którego zakresie własnym leży jego środek
+                if own_start <= (start + end) / 2 < own_end:
+                    words.append({**word, "start": start, "end": end})
+            if not words:
+                continue
+            merged = copy.copy(segment)
+            merged.update(
+                start=words[0]['start'],
+                end=words[-1]['end'],
+                text="".join(w['word'] for w in words),
+                words=words
+            )
+            segments.append(merged)
+        return {"segments": segments, "language": result.get('language')}
+
+    @staticmethod
+    def _stitch(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        segments = []
+        for result in results:
+            for segment in result['segments']:
+                segment['id'] = len(segments)
+                segments.append(segment)
+        language = next((r['language'] for r in results if r.get('language')), None)
+        return {
+            "text": "".join(s['text'] for s in segments),
+            "segments": segments,
+            "language": language
+        }
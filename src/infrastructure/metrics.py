@@ -0,0 +1,263 @@
+# File: src/infrastructure/metrics.py
+
+import os
+import sys
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Kubełki czasu (s) - od milisekund (alignment) do godzin (ASR długich nagrań)
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+# Kubełki RTF (czas przetwarzania / długość audio)
+RTF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+
+LabelKey = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: oczekiwane etykiety {self.labelnames}, otrzymano {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = TIME_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # etykiety -> (liczniki kubełków (nieskumulowane), suma, liczba)
+        self._values: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in self._values.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Minimalny rejestr metryk w formacie tekstowym Prometheusa (bez zależności od prometheus_client).
+    Metryki są w pamięci procesu - w trybie executora 'process' czasy etapów wracają do procesu głównego
+    razem z wynikiem i tam są rejestrowane.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = TIME_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Ponowny import modułu (np. reload w uvicorn) - zwracamy istniejącą metrykę
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "coretranscript_stage_seconds", "Czas etapu przetwarzania spotkania", ["stage"]
+)
+STAGE_MEMORY_BYTES = REGISTRY.histogram(
+    "coretranscript_stage_rss_delta_bytes", "Przyrost pamięci procesu (RSS) w trakcie etapu", ["stage"],
+    buckets=(1e6, 1e7, 5e7, 1e8, 2.5e8, 5e8, 1e9, 2e9, 4e9, 8e9)
+)
+REAL_TIME_FACTOR = REGISTRY.histogram(
+    "coretranscript_real_time_factor", "Czas inferencji / długość audio", ["stage", "model"], buckets=RTF_BUCKETS
+)
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "coretranscript_queue_wait_seconds", "Czas oczekiwania w kolejce (zadania, pula modeli, sloty urządzenia)", ["queue"]
+)
+MODEL_LOAD_SECONDS = REGISTRY.histogram(
+    "coretranscript_model_load_seconds", "Czas ładowania modelu", ["model"]
+)
+MEETINGS_TOTAL = REGISTRY.counter(
+    "coretranscript_meetings_total", "Przetworzone spotkania", ["source"]
+)
+AUDIO_SECONDS_TOTAL = REGISTRY.counter(
+    "coretranscript_audio_seconds_total", "Łączna długość przetworzonego audio (bez trafień w cache)"
+)
+VAD_SKIPPED_SECONDS_TOTAL = REGISTRY.counter(
+    "coretranscript_vad_skipped_seconds_total", "Cisza wycięta przez VAD przed ASR i diaryzacją (s audio)"
+)
+VAD_SAVED_SECONDS_TOTAL = REGISTRY.counter(
+    "coretranscript_vad_saved_seconds_total", "Szacowany czas inferencji zaoszczędzony dzięki VAD (s)", ["stage"]
+)
+MODEL_LOADS_TOTAL = REGISTRY.counter(
+    "coretranscript_model_loads_total", "Załadowania modeli (także ponowne po zwolnieniu)", ["model"]
+)
+MODEL_UNLOADS_TOTAL = REGISTRY.counter(
+    "coretranscript_model_unloads_total", "Zwolnienia modeli z pamięci", ["model", "reason"]
+)
+MODEL_RESIDENT_BYTES = REGISTRY.gauge(
+    "coretranscript_model_resident_bytes", "Szacowana pamięć załadowanych modeli", ["model"]
+)
+ASR_BATCH_SIZE = REGISTRY.histogram(
+    "coretranscript_asr_batch_size", "Okna audio w jednej partii ASR", buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+ASR_BATCH_FILL = REGISTRY.histogram(
+    "coretranscript_asr_batch_fill_ratio", "Wypełnienie partii ASR (rozmiar / maksymalny rozmiar)",
+    buckets=(0.125, 0.25, 0.5, 0.75, 1)
+)
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Bieżąca pamięć rezydentna procesu (Linux: /proc; macOS: szczytowa z getrusage)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS raportuje bajty, Linux kilobajty
+        return usage if sys.platform == "darwin" else usage * 1024
+    except (ImportError, OSError):
+        return None
+
+
+@contextmanager
+def span(stage: str, timings: Dict[str, float], memory: Optional[Dict[str, int]] = None) -> Iterator[None]:
+    """
+    Mierzy czas (i przyrost RSS) bloku i zapisuje go w słownikach etapów.
+    Histogramy uzupełnia się osobno (record_stages), żeby objąć też etapy policzone w procesach roboczych.
+    """
+    rss_before = current_rss_bytes() if memory is not None else None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = time.perf_counter() - start
+        if memory is not None and rss_before is not None:
+            rss_after = current_rss_bytes()
+            if rss_after is not None:
+                memory[stage] = rss_after - rss_before
+
+
+def record_stages(timings: Dict[str, float], memory: Optional[Dict[str, int]] = None):
+    for stage, seconds in timings.items():
+        STAGE_SECONDS.observe(seconds, stage=stage)
+    for stage, delta in (memory or {}).items():
+        STAGE_MEMORY_BYTES.observe(max(0, delta), stage=stage)
+
+
+@contextmanager
+def timed_wait(queue: str) -> Iterator[None]:
+    """Rejestruje czas oczekiwania na zasób (blok `with` obejmuje samo oczekiwanie)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        QUEUE_WAIT_SECONDS.observe(time.perf_counter() - start, queue=queue)
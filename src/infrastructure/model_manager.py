@@ -0,0 +1,229 @@
+# File: src/infrastructure/model_manager.py
+
+import gc
+import sys
+import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from src.infrastructure.metrics import (
+    MODEL_LOADS_TOTAL, MODEL_RESIDENT_BYTES, MODEL_UNLOADS_TOTAL, current_rss_bytes
+)
+
+logger = logging.getLogger(__name__)
+
+# Najrzadziej co tyle sekund wątek w tle sprawdza modele bezczynne dłużej niż idle_seconds
+MAX_REAPER_INTERVAL = 30.0
+
+
+class _Entry:
+    __slots__ = ("name", "model", "size", "users", "last_used", "load_lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.model: Any = None
+        self.size = 0
+        self.users = 0
+        self.last_used = time.monotonic()
+        self.load_lock = threading.Lock()
+
+
+class ModelManager:
+    """
+    Załadowane modele (pipeline diaryzacji, Whisper) z limitem pamięci, usuwaniem LRU i po bezczynności.
+
+    Model jest ładowany przy pierwszym użyciu i zwalniany, gdy suma rozmiarów przekroczy budżet (najdawniej
+    używane najpierw) albo gdy nie był używany przez idle_seconds - kolejne użycie ładuje go ponownie.
+    Model w trakcie użycia (blok `with use(...)`) nigdy nie jest zwalniany. Rozmiar to przyrost RSS procesu
+    w trakcie ładowania (przybliżony, gdy kilka modeli ładuje się naraz) albo wynik size_fn.
+    Bez budżetu i TTL modele zostają w pamięci na zawsze - jak przed wprowadzeniem menedżera.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None, idle_seconds: Optional[float] = None):
+        """
+        :param budget_bytes: Limit łącznego rozmiaru załadowanych modeli (None = bez limitu).
+        :param idle_seconds: Zwalniaj modele nieużywane dłużej niż tyle sekund (None = nigdy).
+        """
+        self.budget_bytes = budget_bytes or None
+        self.idle_seconds = idle_seconds or None
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()  # od najdawniej używanych
+        self._known_sizes: Dict[Hashable, int] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._stop = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+        if self.idle_seconds:
+            self._reaper = threading.Thread(target=self._reap, name="model-reaper", daemon=True)
+            self._reaper.start()
+
+    @contextmanager
+    def use(self, key: Hashable, loader: Callable[[], Any], name: Optional[str] = None,
+            size_fn: Optional[Callable[[Any], int]] = None) -> Iterator[Any]:
+        """
+        Model o danym kluczu (ładowany przez loader, jeśli nie ma go w pamięci), zablokowany przed
+        zwolnieniem do końca bloku `with`.
+        :param key: Klucz instancji modelu (np. rodzaj, nazwa i właściciel - repliki mają osobne instancje).
+        :param name: Nazwa modelu w statystykach i metrykach (domyślnie str(key)).
+        :param size_fn: Rozmiar załadowanego modelu w bajtach (domyślnie przyrost RSS w trakcie ładowania).
+        """
+        self.evict_idle()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(name or str(key))
+            entry.users += 1
+        try:
+            with entry.load_lock:
+                if entry.model is None:
+                    self._load(key, entry, loader, size_fn)
+            yield entry.model
+        finally:
+            with self._lock:
+                entry.users -= 1
+                entry.last_used = time.monotonic()
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+
+    def get(self, key: Hashable, loader: Callable[[], Any], name: Optional[str] = None,
+            size_fn: Optional[Callable[[Any], int]] = None) -> Any:
+        """Jak use(), ale bez blokady - model może zostać zwolniony zaraz po zwróceniu."""
+        with self.use(key, loader, name, size_fn) as model:
+            return model
+
+    def unload(self, key: Hashable) -> bool:
+        """Zwalnia model (jeśli nie jest w użyciu); kolejne use() załaduje go ponownie."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.model is None or entry.users:
+                return False
+            self._evict(key, entry, "manual")
+        self._release_memory()
+        return True
+
+    def evict_idle(self) -> int:
+        """Zwalnia modele nieużywane dłużej niż idle_seconds; zwraca ich liczbę."""
+        if not self.idle_seconds:
+            return 0
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            idle = [(k, e) for k, e in self._entries.items() if e.model is not None and not e.users and e.last_used < cutoff]
+            for key, entry in idle:
+                self._evict(key, entry, "idle")
+        if idle:
+            self._release_memory()
+        return len(idle)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            loaded = [
+                {"model": e.name, "bytes": e.size, "in_use": e.users,
+                 "idle_seconds": round(time.monotonic() - e.last_used, 1)}
+                for e in self._entries.values() if e.model is not None
+            ]
+            counts = {name: dict(c) for name, c in self._counts.items()}
+        return {
+            "budget_bytes": self.budget_bytes,
+            "idle_seconds": self.idle_seconds,
+            "resident_bytes": sum(m["bytes"] for m in loaded),
+            "loaded": loaded,
+            "counts": counts,
+        }
+
+    def close(self):
+        """Zatrzymuje wątek zwalniania bezczynnych modeli (same modele zostają w pamięci)."""
+        self._stop.set()
+        if self._reaper is not None:
+            self._reaper.join()
+
+    # --- Wewnętrzne ---
+
+    def _load(self, key: Hashable, entry: _Entry, loader: Callable[[], Any], size_fn):
+        # Miejsce robimy przed ładowaniem (rozmiar z poprzedniego ładowania) - szczyt pamięci nie przekracza budżetu
+        self._make_room(self._known_sizes.get(key, 0))
+        rss_before = current_rss_bytes()
+        model = loader()
+        if size_fn is not None:
+            size = int(size_fn(model))
+        else:
+            rss_after = current_rss_bytes()
+            size = max(0, rss_after - rss_before) if rss_before is not None and rss_after is not None else 0
+        with self._lock:
+            entry.model, entry.size = model, size
+            self._known_sizes[key] = size
+            self._count(entry.name, "loads", size)
+            MODEL_LOADS_TOTAL.inc(model=entry.name)
+            self._update_gauge(entry.name)
+        logger.info(f"Załadowano model {entry.name} (~{size / 1024 ** 2:.0f} MB); "
+                    f"łącznie {self._resident_bytes() / 1024 ** 2:.0f} MB")
+        self._make_room(0)
+
+    def _make_room(self, incoming: int):
+        """Zwalnia najdawniej używane modele, aż załadowane + incoming zmieszczą się w budżecie."""
+        if not self.budget_bytes:
+            return
+        evicted = False
+        with self._lock:
+            total = sum(e.size for e in self._entries.values() if e.model is not None)
+            for key, entry in list(self._entries.items()):
+                if total + incoming <= self.budget_bytes:
+                    break
+                if entry.model is None or entry.users:
+                    continue
+                total -= entry.size
+                self._evict(key, entry, "budget")
+                evicted = True
+            if total + incoming > self.budget_bytes:
+                logger.warning(f"Modele w użyciu przekraczają budżet pamięci: {(total + incoming) / 1024 ** 2:.0f} MB "
+                               f"> {self.budget_bytes / 1024 ** 2:.0f} MB")
+        if evicted:
+            self._release_memory()
+
+    def _evict(self, key: Hashable, entry: _Entry, reason: str):
+        """Wywoływane pod self._lock."""
+        logger.info(f"Zwalnianie modelu {entry.name} (~{entry.size / 1024 ** 2:.0f} MB, powód: {reason})")
+        self._count(entry.name, "unloads", entry.size)
+        MODEL_UNLOADS_TOTAL.inc(model=entry.name, reason=reason)
+        entry.model, entry.size = None, 0
+        if not entry.users:
+            del self._entries[key]
+        self._update_gauge(entry.name)
+
+    def _count(self, name: str, event: str, size: int):
+        counts = self._counts.setdefault(name, {"loads": 0, "unloads": 0, "loads_bytes": 0, "unloads_bytes": 0})
+        counts[event] += 1
+        counts[f"{event}_bytes"] += size
+
+    def _update_gauge(self, name: str):
+        MODEL_RESIDENT_BYTES.set(
+            sum(e.size for e in self._entries.values() if e.name == name and e.model is not None), model=name
+        )
+
+    def _resident_bytes(self) -> int:
+        with self._lock:
+            return sum(e.size for e in self._entries.values() if e.model is not None)
+
+    @staticmethod
+    def _release_memory():
+        # Modele PyTorch trzymają cykle referencji; pamięć akceleratora wraca dopiero po opróżnieniu cache
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            try:
+                if torch.backends.mps.is_available():
+                    torch.mps.empty_cache()
+                elif torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except (AttributeError, RuntimeError):
+                pass
+
+    def _reap(self):
+        interval = min(self.idle_seconds / 2, MAX_REAPER_INTERVAL)
+        while not self._stop.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.error(f"Błąd zwalniania bezczynnych modeli: {e}")
+
@@ -0,0 +1,146 @@
+# File: src/infrastructure/result_cache.py
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 zawartości pliku (czytany strumieniowo, stała pamięć)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _json_default(obj: Any) -> Any:
+    # Wyniki modeli potrafią zawierać skalary/tablice NumPy
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Nieserializowalny typ: {type(obj).__name__}")
+
+
+def make_key(*parts: Any) -> str:
+    """Deterministyczny klucz z dowolnych części serializowalnych do JSON (np. hash + parametry modeli)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Dyskowy cache wyników adresowany treścią.
+    Wpisy to pliki <kind>/<key[:2]>/<key>.json, usuwane w kolejności LRU po przekroczeniu limitu rozmiaru.
+    Kolejność LRU odtwarzana jest przy starcie z czasów modyfikacji plików (odświeżanych przy trafieniu).
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # ścieżka -> rozmiar, od najstarszego
+        self._total_bytes = 0
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+        logger.info(f"Cache wyników: {self.cache_dir} ({len(self._entries)} wpisów, {self._total_bytes / 1e6:.1f} MB)")
+
+    # --- API ---
+
+    def get(self, kind: str, key: str) -> Optional[bytes]:
+        path = self._path(kind, key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._misses[kind] = self._misses.get(kind, 0) + 1
+                self._forget(path)
+            return None
+        try:
+            os.utime(path)  # odświeżenie pozycji LRU (przetrwa restart)
+        except FileNotFoundError:
+            pass
+
+        with self._lock:
+            self._hits[kind] = self._hits.get(kind, 0) + 1
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        return data
+
+    def put(self, kind: str, key: str, data: bytes):
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Zapis atomowy: czytelnik nigdy nie zobaczy połowy pliku
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._forget(path)
+            self._entries[path] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def get_json(self, kind: str, key: str) -> Optional[Any]:
+        data = self.get(kind, key)
+        return json.loads(data) if data is not None else None
+
+    def put_json(self, kind: str, key: str, value: Any):
+        self.put(kind, key, json.dumps(value, ensure_ascii=False, default=_json_default).encode("utf-8"))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": dict(self._hits),
+                "misses": dict(self._misses),
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    # --- Wewnętrzne ---
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.cache_dir, kind, key[:2], f"{key}.json")
+
+    def _forget(self, path: str):
+        size = self._entries.pop(path, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            logger.info(f"Cache: usunięto (LRU) {os.path.basename(path)}")
+
+    def _load_index(self):
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                found.append((st.st_mtime, path, st.st_size))
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._total_bytes += size
+        self._evict()
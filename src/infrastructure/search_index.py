@@ -0,0 +1,254 @@
+# File: src/infrastructure/search_index.py
+
+import os
+import re
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.domain.models.models import MeetingTranscript, SearchHit
+from src.infrastructure.result_cache import make_key
+
+logger = logging.getLogger(__name__)
+
+# Ile transkryptów w jednej transakcji przy ładowaniu hurtowym
+DEFAULT_BATCH_SIZE = 500
+# rowid segmentu = doc_id spotkania << 20 | numer segmentu - usuwanie i filtr spotkania to zakres rowid
+# (bez skanowania tabeli FTS); limit 2^20 segmentów na spotkanie
+SEGMENT_BITS = 20
+# Słowa zapytania (litery/cyfry, opcjonalnie z * na końcu) - reszta znaków nie trafia do składni FTS5
+_TOKEN = re.compile(r"\w+\*?", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    doc_id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    meeting_id TEXT,
+    filename TEXT NOT NULL,
+    processed_at TEXT,
+    duration REAL,
+    segment_count INTEGER
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+    text,
+    speaker UNINDEXED,
+    start UNINDEXED,
+    end UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def meeting_key(transcript: MeetingTranscript) -> str:
+    """Klucz spotkania w indeksie: meeting_id, a bez niego nazwa pliku + czas przetworzenia (ponowne dodanie zastępuje)."""
+    if transcript.meeting_id:
+        return transcript.meeting_id
+    return make_key(transcript.filename, transcript.processed_at.isoformat())[:16]
+
+
+def build_match(query: str) -> str:
+    """
+    Zwykłe zapytanie -> wyrażenie FTS5: wszystkie słowa muszą wystąpić (AND); słowo z * na końcu
+    to prefiks ("budż*" znajdzie "budżet"). Cudzysłowy i operatory użytkownika nie psują składni.
+    Prefiks tylko na życzenie - krótki prefiks pasuje do tysięcy słów i spowalnia ranking.
+    """
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        raise ValueError("Puste zapytanie wyszukiwania.")
+    return " ".join(f'"{t[:-1]}"*' if t.endswith("*") else f'"{t}"' for t in tokens)
+
+
+class TranscriptSearchIndex:
+    """
+    Pełnotekstowy indeks wypowiedzi z przetworzonych spotkań (SQLite FTS5, jeden plik).
+    Wiersz indeksu to segment transkryptu z mówcą i czasami - trafienie wskazuje spotkanie i moment nagrania.
+    Wyszukiwanie bez rozróżniania wielkości liter i polskich znaków diakrytycznych (unicode61 remove_diacritics).
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        :param path: Plik bazy (':memory:' - indeks w pamięci, np. w testach).
+        """
+        if path != ":memory:":
+            path = os.path.abspath(os.path.expanduser(path))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        # Jedno połączenie na indeks, dostęp serializowany blokadą; transakcje sterowane jawnie
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")  # kilka procesów (CLI wsadowe) pisze do jednego pliku
+        self._conn.executescript(_SCHEMA)
+
+    # --- Zapis ---
+
+    def add(self, transcript: MeetingTranscript) -> str:
+        """Dodaje (lub zastępuje) spotkanie; zwraca jego klucz w indeksie."""
+        return self.add_many([transcript])[0]
+
+    def add_many(self, transcripts: Iterable[MeetingTranscript], batch_size: int = DEFAULT_BATCH_SIZE) -> List[str]:
+        """Dodaje spotkania partiami - jedna transakcja (i jeden zapis na dysk) na batch_size transkryptów."""
+        keys: List[str] = []
+        batch: List[MeetingTranscript] = []
+        for transcript in transcripts:
+            batch.append(transcript)
+            if len(batch) >= batch_size:
+                keys.extend(self._write_batch(batch))
+                batch = []
+        if batch:
+            keys.extend(self._write_batch(batch))
+        return keys
+
+    def ingest_json_files(self, paths: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Ładowanie hurtowe z eksportów JSON (MeetingTranscript, np. wyniki CLI wsadowego).
+        Pliki nieczytelne lub w innym formacie są pomijane z ostrzeżeniem.
+        """
+        stats = {"meetings": 0, "segments": 0, "skipped": 0}
+
+        def parsed():
+            for path in paths:
+                try:
+                    with open(path, "rb") as f:
+                        transcript = MeetingTranscript.model_validate_json(f.read())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Pominięto {path}: {e}")
+                    stats["skipped"] += 1
+                    continue
+                stats["meetings"] += 1
+                stats["segments"] += len(transcript.segments)
+                yield transcript
+
+        self.add_many(parsed(), batch_size)
+        return stats
+
+    def remove(self, key: str) -> bool:
+        with self._lock, self._transaction():
+            return self._delete(key)
+
+    # --- Odczyt ---
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, speaker: Optional[str] = None,
+               meeting_id: Optional[str] = None, raw: bool = False) -> List[SearchHit]:
+        """
+        Trafienia od najlepiej dopasowanych (BM25).
+        :param raw: Zapytanie w składni FTS5 (frazy "...", OR, NOT, NEAR) zamiast zwykłych słów.
+        :param speaker: Tylko wypowiedzi tego mówcy.
+        :param meeting_id: Tylko w tym spotkaniu (klucz indeksu / meeting_id transkryptu).
+        """
+        match = query if raw else build_match(query)
+        sql = [
+            "SELECT m.key, m.filename, segments.speaker, segments.start, segments.end, segments.text,",
+            "       snippet(segments, 0, '[', ']', '…', 12), bm25(segments)",
+            f"FROM segments JOIN meetings m ON m.doc_id = (segments.rowid >> {SEGMENT_BITS})",
+            "WHERE segments MATCH ?",
+        ]
+        params: List[Any] = [match]
+        if speaker is not None:
+            sql.append("AND segments.speaker = ?")
+            params.append(speaker)
+        try:
+            with self._lock:
+                if meeting_id is not None:
+                    doc_id = self._doc_id(meeting_id)
+                    if doc_id is None:
+                        return []
+                    sql.append("AND segments.rowid BETWEEN ? AND ?")
+                    params.extend(self._rowid_range(doc_id))
+                sql.append("ORDER BY rank LIMIT ? OFFSET ?")
+                params.extend([limit, offset])
+                rows = self._conn.execute("\n".join(sql), params).fetchall()
+        except sqlite3.OperationalError as e:
+            # Błędna składnia zapytania (raw) - błąd użytkownika, nie serwera
+            raise ValueError(f"Nieprawidłowe zapytanie wyszukiwania: {e}") from None
+        return [
+            SearchHit(meeting_id=key, filename=filename, speaker=speaker_, start=start, end=end, text=text,
+                      snippet=snippet, score=round(-score, 4))
+            for key, filename, speaker_, start, end, text, snippet, score in rows
+        ]
+
+    def meetings(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, filename, processed_at, duration, segment_count FROM meetings ORDER BY processed_at DESC"
+            ).fetchall()
+        return [dict(zip(("meeting_id", "filename", "processed_at", "duration", "segments"), row)) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            meetings, segments = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(segment_count), 0) FROM meetings"
+            ).fetchone()
+        size = os.path.getsize(self.path) if self.path != ":memory:" and os.path.exists(self.path) else 0
+        return {"meetings": meetings, "segments": segments, "bytes": size}
+
+    def optimize(self):
+        """Scala segmenty indeksu FTS5 (po dużym ładowaniu hurtowym zapytania są wtedy szybsze)."""
+        with self._lock:
+            self._conn.execute("INSERT INTO segments(segments) VALUES ('optimize')")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Wewnętrzne ---
+
+    def _write_batch(self, batch: List[MeetingTranscript]) -> List[str]:
+        keys = []
+        with self._lock, self._transaction():
+            for transcript in batch:
+                key = meeting_key(transcript)
+                self._delete(key)
+                doc_id = self._conn.execute(
+                    "INSERT INTO meetings (key, meeting_id, filename, processed_at, duration, segment_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, transcript.meeting_id, transcript.filename, transcript.processed_at.isoformat(),
+                     transcript.total_duration, len(transcript.segments))
+                ).lastrowid
+                if len(transcript.segments) >> SEGMENT_BITS:
+                    raise ValueError(f"Za dużo segmentów w spotkaniu {transcript.filename}: {len(transcript.segments)}")
+                self._conn.executemany(
+                    "INSERT INTO segments (rowid, text, speaker, start, end) VALUES (?, ?, ?, ?, ?)",
+                    self._segment_rows(transcript, doc_id)
+                )
+                keys.append(key)
+        return keys
+
+    @staticmethod
+    def _segment_rows(transcript: MeetingTranscript, doc_id: int) -> Iterable[Tuple[int, str, str, float, float]]:
+        base = doc_id << SEGMENT_BITS
+        return ((base + i, s.text, s.speaker, s.start, s.end) for i, s in enumerate(transcript.segments))
+
+    @staticmethod
+    def _rowid_range(doc_id: int) -> Tuple[int, int]:
+        return doc_id << SEGMENT_BITS, ((doc_id + 1) << SEGMENT_BITS) - 1
+
+    def _doc_id(self, key: str) -> Optional[int]:
+        row = self._conn.execute("SELECT doc_id FROM meetings WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _delete(self, key: str) -> bool:
+        doc_id = self._doc_id(key)
+        if doc_id is None:
+            return False
+        self._conn.execute("DELETE FROM segments WHERE rowid BETWEEN ? AND ?", self._rowid_range(doc_id))
+        self._conn.execute("DELETE FROM meetings WHERE doc_id = ?", (doc_id,))
+        return True
+
+    def _transaction(self):
+        return _Transaction(self._conn)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE / COMMIT (ROLLBACK przy wyjątku) - połączenie działa w trybie autocommit."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type is not None else "COMMIT")
@@ -0,0 +1,102 @@
+# File: src/infrastructure/settings.py
+
+import os
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+ENV_PREFIX = "CORETRANSCRIPT_"
+
+
+class Settings(BaseModel):
+    """
+    Konfiguracja aplikacji. Każde pole można nadpisać zmienną środowiskową
+    CORETRANSCRIPT_<NAZWA_POLA> (np. CORETRANSCRIPT_EXECUTION_MODE=sequential).
+    """
+    asr_model: Optional[str] = Field(None, description="Model Whisper (repo HF lub ścieżka; brak = domyślny dla backendu)")
+
+    # --- Backend ASR ---
+    asr_backend: Literal["mlx", "cpu", "fake"] = Field(
+        "mlx", description="mlx = Apple Silicon, cpu = faster-whisper int8 (Linux), fake = deterministyczny bez modelu"
+    )
+    asr_threads: int = Field(0, description="Wątki CPU na wywołanie backendu 'cpu' (0 = automatycznie)")
+    asr_compute_type: str = Field("int8", description="Precyzja backendu 'cpu' (int8, int8_float32, float32)")
+
+    # --- ASR długich nagrań (fragmenty) ---
+    asr_chunk_seconds: Optional[float] = Field(None, description="Długość fragmentu ASR w sekundach (brak = bez podziału)")
+    asr_chunk_overlap: float = Field(1.0, description="Zakładka między fragmentami ASR (s)")
+    asr_workers: int = Field(1, description="Liczba fragmentów ASR przetwarzanych równocześnie")
+
+    # --- Łączenie okien ASR z równoczesnych żądań w partie ---
+    asr_batch_size: int = Field(1, description="Maksymalna liczba okien audio w partii ASR (1 = bez łączenia)")
+    asr_batch_wait_ms: float = Field(10.0, description="Najdłuższe oczekiwanie na dopełnienie partii ASR (ms)")
+
+    # --- Podział wypowiedzi na segmenty (napisy) ---
+    segment_max_seconds: float = Field(0.0, description="Najdłuższy segment wypowiedzi (s), np. 7; 0 = bez limitu")
+    segment_max_pause_seconds: float = Field(0.0, description="Przerwa między słowami, po której zaczyna się nowy segment (s); 0 = bez podziału")
+    segment_split_sentences: bool = Field(False, description="Czy kończyć segment na końcu zdania")
+
+    # --- Detekcja mowy (VAD) przed ASR i diaryzacją ---
+    vad_enabled: bool = Field(False, description="Czy wycinać dłuższą ciszę przed modelami (czasy wracają na oś nagrania); zmienia wejście ASR i klucze cache")
+    vad_threshold_db: float = Field(-50.0, description="Bezwzględny próg energii ramki mowy (dBFS)")
+    vad_min_silence_seconds: float = Field(2.0, description="Najkrótsza przerwa wycinana z audio (s)")
+    vad_padding_seconds: float = Field(0.3, description="Zapas zostawiany wokół fragmentów mowy (s)")
+
+    # --- Pamięć modeli (zwalnianie i ponowne ładowanie na żądanie) ---
+    models_memory_budget_mb: int = Field(0, description="Limit pamięci załadowanych modeli (MB; 0 = bez limitu), nadmiar zwalniany LRU")
+    models_idle_seconds: float = Field(0.0, description="Zwalniaj modele nieużywane dłużej niż tyle sekund (0 = nigdy)")
+
+    # --- Pula modeli (start serwera) ---
+    pool_replicas: int = Field(1, description="Liczba replik modeli (przy >1 zwiększ też device_slots)")
+    warmup_on_start: bool = Field(True, description="Czy rozgrzewać modele sztucznym klipem przy starcie")
+    warmup_clip_seconds: float = Field(2.0, description="Długość klipu rozgrzewającego (s)")
+
+    # --- Tryb wykonania ASR + Diaryzacji ---
+    execution_mode: Literal["auto", "parallel", "sequential"] = Field(
+        "auto", description="auto = równolegle, chyba że oba etapy używają tego samego akceleratora"
+    )
+    executor: Literal["thread", "process"] = Field("thread", description="Rodzaj executora dla trybu równoległego")
+
+    # --- Cache wyników (adresowany treścią audio) ---
+    cache_enabled: bool = Field(True, description="Czy używać dyskowego cache wyników")
+    cache_dir: str = Field("~/.cache/coretranscript", description="Katalog cache")
+    cache_max_mb: int = Field(2048, description="Limit rozmiaru cache (MB), nadmiar usuwany LRU")
+
+    # --- Artefakty etapów per spotkanie (ponowna diaryzacja / alignment bez ASR) ---
+    artifacts_enabled: bool = Field(True, description="Czy zapisywać surowe wyniki etapów i audio spotkań")
+    artifacts_dir: str = Field("~/.cache/coretranscript/meetings", description="Katalog artefaktów spotkań")
+    artifacts_max_mb: int = Field(8192, description="Limit rozmiaru artefaktów (MB; audio ok. 230 MB/h), nadmiar usuwany LRU")
+
+    # --- Indeks głosów (rozpoznawanie mówców między spotkaniami) ---
+    speaker_index_enabled: bool = Field(False, description="Czy liczyć embeddingi mówców i dopasowywać zapisane tożsamości")
+    speaker_index_path: str = Field("~/.cache/coretranscript/speakers.npz", description="Plik indeksu głosów")
+    speaker_match_threshold: float = Field(0.6, description="Minimalne podobieństwo cosinusowe rozpoznania osoby")
+    speaker_index_approximate: bool = Field(True, description="Przybliżone wyszukiwanie (IVF) dla dużych zbiorów głosów")
+
+    # --- Wyszukiwanie pełnotekstowe w transkryptach (SQLite FTS5) ---
+    search_index_enabled: bool = Field(True, description="Czy dodawać transkrypty do indeksu wyszukiwania (/search)")
+    search_index_path: str = Field("~/.cache/coretranscript/search.db", description="Plik indeksu wyszukiwania")
+
+    # --- Trwały magazyn transkryptów (odczyt fragmentów wg czasu i mówcy) ---
+    transcript_store_enabled: bool = Field(True, description="Czy zapisywać transkrypty w magazynie (/transcripts)")
+    transcript_store_path: str = Field("~/.cache/coretranscript/transcripts.db", description="Plik magazynu transkryptów")
+
+    # --- Kolejka zadań API ---
+    job_workers: int = Field(2, description="Liczba zadań przetwarzanych równocześnie")
+    job_queue_size: int = Field(16, description="Maksymalna liczba oczekujących zadań (potem 429)")
+    device_slots: int = Field(1, description="Liczba równoczesnych inferencji na urządzeniu")
+    max_upload_mb: int = Field(2048, description="Limit rozmiaru przesyłanego pliku (MB), powyżej 413")
+
+    # --- Transkrypcja na żywo (WebSocket /ws/live) ---
+    live_step_seconds: float = Field(1.0, description="Minimalna ilość nowego audio między krokami ASR")
+    live_window_seconds: float = Field(20.0, description="Maksymalne niezatwierdzone okno ASR (s)")
+    live_diarize_every_seconds: float = Field(15.0, description="Co ile sekund audio uzgadniać mówców (0 = wyłączone)")
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        overrides = {}
+        for name in cls.model_fields:
+            value = os.getenv(ENV_PREFIX + name.upper())
+            if value is not None:
+                overrides[name] = value
+        return cls(**overrides)
@@ -0,0 +1,264 @@
+# File: src/infrastructure/speaker_index.py
+
+import os
+import logging
+import tempfile
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Poniżej tej liczby głosów wyszukiwanie dokładne jest równie szybkie jak przybliżone
+IVF_MIN_SIZE = 4096
+# Dopisane po zbudowaniu IVF głosy przeszukiwane są dokładnie; po przekroczeniu tej części indeks jest przebudowywany
+IVF_REBUILD_FRACTION = 0.1
+KMEANS_ITERATIONS = 8
+# Centroidy uczone na próbce (tyle głosów na listę) - wszystkie głosy są tylko przypisywane do list
+KMEANS_POINTS_PER_LIST = 64
+
+# (tożsamość, podobieństwo cosinusowe)
+Match = Tuple[str, float]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class _InvertedFileIndex:
+    """
+    Przybliżony indeks IVF: sferyczny k-means dzieli głosy na listy, zapytanie przeszukuje tylko
+    n_probe list o najbliższych centroidach. Wektory list leżą w jednej tablicy (posortowane wg listy),
+    więc zebranie kandydatów to kilka wycinków bez indeksowania per element.
+    """
+
+    def __init__(self, vectors: np.ndarray, n_lists: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        sample = n_lists * KMEANS_POINTS_PER_LIST
+        train = vectors if len(vectors) <= sample else vectors[rng.choice(len(vectors), sample, replace=False)]
+        centroids = train[rng.choice(len(train), n_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(train @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable")
+            lists, starts = np.unique(assignment[order], return_index=True)
+            # Puste listy zachowują poprzedni centroid
+            centroids[lists] = _normalize(np.add.reduceat(train[order], starts, axis=0))
+
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        self.order = np.argsort(assignment, kind="stable")
+        self.offsets = np.searchsorted(assignment[self.order], np.arange(n_lists + 1))
+        self.vectors = np.ascontiguousarray(vectors[self.order])
+        self.centroids = centroids
+        self.size = len(vectors)
+
+    def candidates(self, query: np.ndarray, n_probe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Zwraca (indeksy oryginalne, podobieństwa) głosów z n_probe najbliższych list."""
+        n_probe = min(n_probe, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        slices = [slice(self.offsets[p], self.offsets[p + 1]) for p in probes.tolist()]
+        positions = np.concatenate([np.arange(s.start, s.stop) for s in slices])
+        scores = np.concatenate([self.vectors[s] @ query for s in slices])
+        return self.order[positions], scores
+
+
+class SpeakerIndex:
+    """
+    Trwały indeks głosów (embeddingów mówców) zapisanych tożsamości.
+    Wyszukiwanie to iloczyn skalarny znormalizowanych wektorów (podobieństwo cosinusowe) w NumPy -
+    dokładne dla małych zbiorów, a od IVF_MIN_SIZE głosów (gdy approximate=True) przybliżone przez IVF.
+    Jedna tożsamość może mieć wiele głosów (np. z różnych spotkań); wynik to najlepszy głos tożsamości.
+    Plik: .npz z macierzą embeddingów, kodami tożsamości i listą nazw (zapis atomowy).
+    """
+
+    def __init__(self, path: Optional[str] = None, approximate: bool = True, n_probe: int = 8):
+        """
+        :param path: Plik indeksu (None = tylko w pamięci).
+        :param approximate: Czy używać IVF dla dużych zbiorów (>= IVF_MIN_SIZE głosów).
+        :param n_probe: Liczba list IVF przeszukiwanych na zapytanie (więcej = lepsza trafność, wolniej).
+        """
+        self.path = os.path.abspath(os.path.expanduser(path)) if path else None
+        self.approximate = approximate
+        self.n_probe = n_probe
+        self._lock = threading.Lock()
+        # Bufory z zapasem (podwajane) - dopisywanie głosów bez kopiowania całej macierzy za każdym razem
+        self._vector_buffer = np.empty((0, 0), dtype=np.float32)
+        self._code_buffer = np.empty(0, dtype=np.int32)
+        self._size = 0
+        self._names: List[str] = []
+        self._name_codes: Dict[str, int] = {}
+        self._ivf: Optional[_InvertedFileIndex] = None
+        # Zmienia się przy każdej modyfikacji - część klucza cache transkryptu
+        self.version = 0
+
+        if self.path and os.path.exists(self.path):
+            self._load()
+
+    # --- Zawartość ---
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def _vectors(self) -> np.ndarray:
+        return self._vector_buffer[:self._size]
+
+    @property
+    def _codes(self) -> np.ndarray:
+        return self._code_buffer[:self._size]
+
+    def _set(self, vectors: np.ndarray, codes: np.ndarray):
+        self._vector_buffer = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._code_buffer = np.ascontiguousarray(codes, dtype=np.int32)
+        self._size = len(codes)
+
+    def _append(self, vectors: np.ndarray, code: int):
+        needed = self._size + len(vectors)
+        if not self._size:
+            self._vector_buffer = np.empty((max(needed, 64), vectors.shape[1]), dtype=np.float32)
+            self._code_buffer = np.empty(len(self._vector_buffer), dtype=np.int32)
+        elif needed > len(self._code_buffer):
+            capacity = max(needed, 2 * len(self._code_buffer))
+            vector_buffer = np.empty((capacity, self._vector_buffer.shape[1]), dtype=np.float32)
+            code_buffer = np.empty(capacity, dtype=np.int32)
+            vector_buffer[:self._size] = self._vectors
+            code_buffer[:self._size] = self._codes
+            self._vector_buffer, self._code_buffer = vector_buffer, code_buffer
+        self._vector_buffer[self._size:needed] = vectors
+        self._code_buffer[self._size:needed] = code
+        self._size = needed
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._vectors.shape[1] if len(self) else None
+
+    def identities(self) -> Dict[str, int]:
+        """Tożsamość -> liczba zapisanych głosów."""
+        with self._lock:
+            counts = np.bincount(self._codes, minlength=len(self._names)) if len(self) else np.zeros(len(self._names), int)
+            return {name: int(count) for name, count in zip(self._names, counts.tolist()) if count}
+
+    def enroll(self, identity: str, embeddings: Sequence[Sequence[float]]) -> int:
+        """Dodaje głos(y) tożsamości. Zwraca łączną liczbę głosów tej tożsamości."""
+        if not identity:
+            raise ValueError("Nazwa tożsamości nie może być pusta.")
+        vectors = _normalize(np.atleast_2d(np.asarray(embeddings, dtype=np.float32)))
+        if not np.all(np.isfinite(vectors)):
+            raise ValueError("Embedding zawiera wartości NaN/Inf.")
+        with self._lock:
+            if len(self) and vectors.shape[1] != self.dim:
+                raise ValueError(f"Wymiar embeddingu {vectors.shape[1]} różny od indeksu ({self.dim}).")
+            code = self._name_codes.get(identity)
+            if code is None:
+                code = self._name_codes[identity] = len(self._names)
+                self._names.append(identity)
+            self._append(vectors, code)
+            self.version += 1
+            self._save()
+            return int(np.count_nonzero(self._codes == code))
+
+    def remove(self, identity: str) -> bool:
+        with self._lock:
+            code = self._name_codes.get(identity)
+            if code is None:
+                return False
+            keep = self._codes != code
+            # Kody pozostałych tożsamości przesuwają się, żeby lista nazw nie miała dziur
+            codes = self._codes[keep]
+            codes[codes > code] -= 1
+            self._set(self._vectors[keep], codes)
+            del self._names[code]
+            self._name_codes = {name: i for i, name in enumerate(self._names)}
+            self._ivf = None
+            self.version += 1
+            self._save()
+            return True
+
+    # --- Wyszukiwanie ---
+
+    def search(self, embedding: Sequence[float], k: int = 5) -> List[Match]:
+        """k najbliższych tożsamości (każda raz, z najlepszym głosem), od najbardziej podobnej."""
+        query = _normalize(np.asarray(embedding, dtype=np.float32).ravel())
+        with self._lock:
+            if not len(self):
+                return []
+            if query.shape[0] != self.dim:
+                raise ValueError(f"Wymiar embeddingu {query.shape[0]} różny od indeksu ({self.dim}).")
+            indices, scores = self._candidates(query)
+            codes = self._codes[indices]
+            names = self._names
+
+        return self._best_per_identity(codes, scores, k, names)
+
+    @staticmethod
+    def _best_per_identity(codes: np.ndarray, scores: np.ndarray, k: int, names: List[str]) -> List[Match]:
+        # Wstępna selekcja argpartition - pełne sortowanie tylko, gdy w czołówce jest za mało różnych tożsamości
+        shortlist = min(len(scores), 4 * k + 32)
+        while True:
+            top = np.argpartition(-scores, shortlist - 1)[:shortlist] if shortlist < len(scores) else np.arange(len(scores))
+            order = top[np.argsort(-scores[top], kind="stable")]
+            # Najlepszy głos każdej tożsamości: pierwsze wystąpienie kodu w kolejności malejącej
+            _, first = np.unique(codes[order], return_index=True)
+            best = order[np.sort(first)]
+            if len(best) >= k or shortlist >= len(scores):
+                break
+            shortlist = min(len(scores), shortlist * 4)
+        best = best[:k]
+        return [(names[c], float(s)) for c, s in zip(codes[best].tolist(), scores[best].tolist())]
+
+    def identify(self, embeddings: Dict[str, Sequence[float]], threshold: float) -> Dict[str, Optional[Match]]:
+        """
+        Przypisuje etykietom mówców jednego spotkania zapisane tożsamości.
+        Przypisanie jest jednoznaczne (dwie etykiety nie dostaną tej samej osoby): pary (etykieta, tożsamość)
+        wybierane są zachłannie od największego podobieństwa, tylko powyżej progu.
+        """
+        result: Dict[str, Optional[Match]] = {label: None for label in embeddings}
+        candidates = []
+        for label, embedding in embeddings.items():
+            for identity, score in self.search(embedding, k=len(embeddings)):
+                if score >= threshold:
+                    candidates.append((score, label, identity))
+
+        taken = set()
+        for score, label, identity in sorted(candidates, reverse=True):
+            if result[label] is None and identity not in taken:
+                result[label] = (identity, score)
+                taken.add(identity)
+        return result
+
+    def _candidates(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.approximate or len(self) < IVF_MIN_SIZE:
+            return np.arange(len(self)), self._vectors @ query
+
+        if self._ivf is None or len(self) - self._ivf.size > IVF_REBUILD_FRACTION * self._ivf.size:
+            self._ivf = _InvertedFileIndex(self._vectors, n_lists=int(np.sqrt(len(self))))
+            logger.info(f"Indeks głosów: zbudowano IVF ({len(self)} głosów, {len(self._ivf.centroids)} list)")
+        indices, scores = self._ivf.candidates(query, self.n_probe)
+        if len(self) > self._ivf.size:
+            # Głosy dopisane po zbudowaniu IVF - przeszukiwane dokładnie
+            tail = np.arange(self._ivf.size, len(self))
+            indices = np.concatenate([indices, tail])
+            scores = np.concatenate([scores, self._vectors[self._ivf.size:] @ query])
+        return indices, scores
+
+    # --- Zapis ---
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, vectors=self._vectors, codes=self._codes, names=np.array(self._names, dtype=str),
+                     version=np.int64(self.version))
+        os.replace(tmp_path, self.path)
+
+    def _load(self):
+        with np.load(self.path, allow_pickle=False) as data:
+            self._set(data["vectors"], data["codes"])
+            self._names = data["names"].tolist()
+            self.version = int(data["version"])
+        self._name_codes = {name: i for i, name in enumerate(self._names)}
+        logger.info(f"Indeks głosów: {self.path} ({len(self._names)} tożsamości, {len(self)} głosów)")
@@ -0,0 +1,213 @@
+# File: src/infrastructure/streaming_recorder.py
+
+import os
+import queue
+import threading
+from typing import Any, Callable, Iterator, List, Optional
+
+import numpy as np
+import soundfile as sf
+
+
+class RingBuffer:
+    """
+    Bufor cykliczny jeden-producent/jeden-konsument bez blokad.
+    Producent (callback audio) przesuwa tylko indeks zapisu, konsument (wątek zapisu) tylko indeks odczytu,
+    więc callback nigdy nie czeka na wątek zapisu. Przy przepełnieniu nadmiar jest odrzucany i liczony.
+    """
+
+    def __init__(self, capacity_frames: int, channels: int, dtype: str):
+        self._data = np.zeros((capacity_frames, channels), dtype=dtype)
+        self.capacity = capacity_frames
+        self._write_idx = 0  # łączna liczba zapisanych ramek (monotoniczna)
+        self._read_idx = 0   # łączna liczba odczytanych ramek (monotoniczna)
+        self.dropped_frames = 0
+
+    @property
+    def available(self) -> int:
+        return self._write_idx - self._read_idx
+
+    def write(self, frames: np.ndarray) -> int:
+        free = self.capacity - (self._write_idx - self._read_idx)
+        count = min(len(frames), free)
+        self.dropped_frames += len(frames) - count
+        if count <= 0:
+            return 0
+        start = self._write_idx % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = frames[:first]
+        self._data[:count - first] = frames[first:count]
+        # Publikacja dopiero po skopiowaniu danych
+        self._write_idx += count
+        return count
+
+    def read(self, max_frames: Optional[int] = None) -> np.ndarray:
+        count = self.available if max_frames is None else min(self.available, max_frames)
+        start = self._read_idx % self.capacity
+        first = min(count, self.capacity - start)
+        out = np.concatenate([self._data[start:start + first], self._data[:count - first]])
+        self._read_idx += count
+        return out
+
+
+class StreamingRecorder:
+    """
+    Nagrywanie o nieograniczonej długości i stałym zużyciu pamięci.
+    Callback InputStream wrzuca próbki do RingBuffer, a wątek w tle dopisuje je przyrostowo
+    do pliku WAV/FLAC (nagranie przetrwa awarię do ostatniego flush) i rozsyła do konsumentów frames().
+    """
+
+    # Jak często (s) wymuszać zapis nagłówka/bufora pliku na dysk
+    FLUSH_INTERVAL_SECONDS = 1.0
+
+    def __init__(self, file_path: str, samplerate: int, channels: int, dtype: str,
+                 device: Optional[int] = None, buffer_seconds: float = 10.0, block_frames: int = 1600,
+                 stream_factory: Optional[Callable[..., Any]] = None):
+        """
+        :param buffer_seconds: Pojemność bufora cyklicznego (zapas na chwilowe opóźnienia dysku).
+        :param block_frames: Rozmiar bloku callbacku (1600 ramek = 100 ms przy 16kHz).
+        :param stream_factory: Fabryka strumienia wejściowego (domyślnie sd.InputStream) - w testach fałszywe urządzenie.
+        """
+        self.file_path = file_path
+        self.samplerate = samplerate
+        self.channels = channels
+        self.dtype = dtype
+        self.device = device
+        self.block_frames = block_frames
+        self.frames_written = 0
+        self._ring = RingBuffer(int(buffer_seconds * samplerate), channels, dtype)
+        self._stream_factory = stream_factory
+        self._stream = None
+        self._writer: Optional[threading.Thread] = None
+        self._data_ready = threading.Event()
+        self._stopping = threading.Event()
+        self._consumers: List[queue.Queue] = []
+        self._consumers_lock = threading.Lock()
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._ring.dropped_frames
+
+    @property
+    def duration(self) -> float:
+        return self.frames_written / self.samplerate
+
+    def start(self) -> "StreamingRecorder":
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+        self._writer = threading.Thread(target=self._write_loop, name="audio-writer", daemon=True)
+        self._writer.start()
+        factory = self._stream_factory
+        if factory is None:
+            import sounddevice as sd  # import dopiero przy prawdziwym urządzeniu
+            factory = sd.InputStream
+        self._stream = factory(
+            samplerate=self.samplerate,
+            channels=self.channels,
+            dtype=self.dtype,
+            device=self.device,
+            blocksize=self.block_frames,
+            callback=self._callback
+        )
+        self._stream.start()
+        print(f"-> [AudioIO] Start nagrywania strumieniowego: {self.file_path} (SR: {self.samplerate} Hz)")
+        return self
+
+    def stop(self) -> str:
+        """Kończy nagrywanie, dopisuje resztę bufora i zamyka plik. Zwraca ścieżkę pliku."""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        self._stopping.set()
+        self._data_ready.set()
+        if self._writer is not None:
+            self._writer.join()
+        print(f"-> [AudioIO] Koniec nagrywania: {self.duration:.1f}s, utracone ramki: {self.dropped_frames}")
+        return os.path.abspath(self.file_path)
+
+    def frames(self, max_queue_blocks: int = 100) -> Iterator[np.ndarray]:
+        """
+        Generator bloków audio (płaskie mono lub (N, kanały)) dostępnych w trakcie nagrywania.
+        Konsument jest rejestrowany od razu (nie przy pierwszym next), więc nie gubi początku nagrania.
+        Kończy się po stop(). Wolny konsument gubi najstarsze bloki zamiast blokować zapis.
+        """
+        consumer: queue.Queue = queue.Queue(maxsize=max_queue_blocks)
+        with self._consumers_lock:
+            self._consumers.append(consumer)
+        return self._iterate(consumer)
+
+    def __enter__(self) -> "StreamingRecorder":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Wewnętrzne ---
+
+    def _iterate(self, consumer: queue.Queue) -> Iterator[np.ndarray]:
+        try:
+            while True:
+                block = consumer.get()
+                if block is None:
+                    return
+                yield block
+        finally:
+            with self._consumers_lock:
+                if consumer in self._consumers:
+                    self._consumers.remove(consumer)
+
+    def _callback(self, indata, frames, time_info, status):
+        # Wątek audio: tylko kopiowanie do bufora cyklicznego, zero alokacji i blokad
+        self._ring.write(indata)
+        self._data_ready.set()
+
+    def _write_loop(self):
+        with sf.SoundFile(self.file_path, mode="w", samplerate=self.samplerate, channels=self.channels,
+                          subtype=self._subtype()) as out:
+            last_flush = 0.0
+            while True:
+                self._data_ready.wait(timeout=0.1)
+                self._data_ready.clear()
+                block = self._ring.read()
+                if len(block):
+                    out.write(block)
+                    self.frames_written += len(block)
+                    if self.frames_written / self.samplerate - last_flush >= self.FLUSH_INTERVAL_SECONDS:
+                        out.flush()
+                        last_flush = self.frames_written / self.samplerate
+                    self._publish(block[:, 0] if self.channels == 1 else block)
+                elif self._stopping.is_set():
+                    break
+        self._publish(None)
+
+    def _publish(self, block: Optional[np.ndarray]):
+        with self._consumers_lock:
+            consumers = list(self._consumers)
+        for consumer in consumers:
+            if block is None:
+                # Sygnał końca musi dotrzeć - robimy miejsce kosztem najstarszego bloku
+                while True:
+                    try:
+                        consumer.put_nowait(None)
+                        break
+                    except queue.Full:
+                        self._drop_oldest(consumer)
+                continue
+            try:
+                consumer.put_nowait(block)
+            except queue.Full:
+                self._drop_oldest(consumer)
+                consumer.put_nowait(block)
+
+    @staticmethod
+    def _drop_oldest(consumer: queue.Queue):
+        try:
+            consumer.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _subtype(self) -> str:
+        # FLAC nie obsługuje próbek zmiennoprzecinkowych - zapisujemy wtedy 16-bit
+        if self.file_path.lower().endswith(".flac"):
+            return "PCM_16"
+        return {"int16": "PCM_16", "int32": "PCM_32", "float32": "FLOAT"}.get(self.dtype, "PCM_16")
@@ -0,0 +1,84 @@
+# File: src/infrastructure/subtitle_export.py
+
+from typing import Callable, Dict, Iterable, Iterator
+
+from src.domain.models.models import TranscriptionSegment
+
+# Formaty eksportu transkryptu: napisy SubRip, WebVTT i zwykły tekst
+EXPORT_FORMATS = ("srt", "vtt", "txt")
+MEDIA_TYPES = {
+    "srt": "application/x-subrip; charset=utf-8",
+    "vtt": "text/vtt; charset=utf-8",
+    "txt": "text/plain; charset=utf-8",
+}
+# Napisy oddawane paczkami - jeden zapis do gniazda/pliku zamiast tysięcy przy długich spotkaniach
+CUE_BATCH = 200
+
+# Writery przyjmują TranscriptionSegment lub dowolny obiekt z polami start/end/speaker/text (np. SegmentView)
+Segments = Iterable[TranscriptionSegment]
+
+
+def format_timestamp(seconds: float, separator: str = ",") -> str:
+    """Czas jako GG:MM:SS,mmm (SRT) lub GG:MM:SS.mmm (WebVTT, separator='.')."""
+    millis = max(0, int(round(seconds * 1000)))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _single_line(text: str) -> str:
+    # Pusta linia kończy napis w SRT i WebVTT - tekst wypowiedzi zawsze w jednej linii
+    return " ".join(text.split()) if "\n" in text or "\r" in text else text
+
+
+def srt_cues(segments: Segments) -> Iterator[str]:
+    """Kolejne napisy SubRip (numer, czasy, 'MÓWCA: tekst')."""
+    for index, segment in enumerate(segments, 1):
+        yield (f"{index}\n{format_timestamp(segment.start)} --> {format_timestamp(segment.end)}\n"
+               f"{segment.speaker}: {_single_line(segment.text)}\n\n")
+
+
+def vtt_cues(segments: Segments) -> Iterator[str]:
+    """Nagłówek WebVTT, potem napisy z mówcą jako znacznikiem głosu (<v MÓWCA>)."""
+    yield "WEBVTT\n\n"
+    for segment in segments:
+        text = _single_line(segment.text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        speaker = segment.speaker.replace(">", "")
+        yield (f"{format_timestamp(segment.start, '.')} --> {format_timestamp(segment.end, '.')}\n"
+               f"<v {speaker}>{text}\n\n")
+
+
+def text_lines(segments: Segments) -> Iterator[str]:
+    """Zwykły tekst: '[GG:MM:SS] MÓWCA: tekst', jedna wypowiedź na linię."""
+    for segment in segments:
+        yield f"[{format_timestamp(segment.start)[:8]}] {segment.speaker}: {_single_line(segment.text)}\n"
+
+
+_WRITERS: Dict[str, Callable[[Segments], Iterator[str]]] = {
+    "srt": srt_cues,
+    "vtt": vtt_cues,
+    "txt": text_lines,
+}
+
+
+def iter_export(segments: Segments, export_format: str, batch: int = CUE_BATCH) -> Iterator[str]:
+    """
+    Dokument w danym formacie oddawany kawałkami (po `batch` wpisów) - segmenty są czytane leniwie,
+    więc w pamięci jest tylko bieżąca paczka, nie cały dokument. Nieznany format - ValueError od razu.
+    """
+    writer = _WRITERS.get(export_format)
+    if writer is None:
+        raise ValueError(f"Nieobsługiwany format eksportu: {export_format} (dostępne: {EXPORT_FORMATS})")
+    return _batched(writer(segments), batch)
+
+
+def _batched(entries: Iterator[str], batch: int) -> Iterator[str]:
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) >= batch:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
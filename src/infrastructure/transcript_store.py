@@ -0,0 +1,230 @@
+# File: src/infrastructure/transcript_store.py
+
+import os
+import json
+import base64
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.domain.models.models import MeetingTranscript, SegmentPage, TranscriptionSegment
+from src.infrastructure.search_index import _Transaction, meeting_key
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    doc_id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    meeting_id TEXT,
+    filename TEXT NOT NULL,
+    processed_at TEXT NOT NULL,
+    duration REAL NOT NULL,
+    segment_count INTEGER NOT NULL,
+    max_segment_seconds REAL NOT NULL,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS segments (
+    doc_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    speaker TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (doc_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS segments_by_start ON segments (doc_id, start, seq);
+CREATE INDEX IF NOT EXISTS segments_by_speaker ON segments (doc_id, speaker, start, seq);
+"""
+
+# Pola MeetingTranscript poza segmentami i kolumnami tabeli - zapisywane jako JSON
+_EXTRA_FIELDS = ("speakers", "skipped_audio", "summary", "timings")
+
+
+def _segment(start: float, end: float, speaker: str, text: str) -> TranscriptionSegment:
+    return TranscriptionSegment.model_construct(start=start, end=end, speaker=speaker, text=text)
+
+
+class TranscriptNotFoundError(LookupError):
+    """Brak transkryptu o podanym kluczu w magazynie."""
+
+
+def encode_cursor(start: float, seq: int) -> str:
+    """Kursor stronicowania: pozycja ostatniego zwróconego segmentu (start, numer) - nieprzezroczysty dla klienta."""
+    return base64.urlsafe_b64encode(json.dumps([start, seq]).encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Odwrotność encode_cursor; zły kursor (np. z innego zapytania po ręcznej edycji) to ValueError."""
+    try:
+        start, seq = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(start), int(seq)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Nieprawidłowy kursor: {cursor!r}") from e
+
+
+class TranscriptStore:
+    """
+    Trwały magazyn transkryptów (SQLite, jeden plik) z indeksem przedziałów czasu segmentów.
+
+    Zapytanie o okno [a, b] szuka segmentów nachodzących na okno: start <= b i end >= a.
+    Indeks B-drzewa na (spotkanie, start) zawęża start do [a - najdłuższy segment spotkania, b],
+    więc koszt to O(log n + k) zamiast wczytywania całego transkryptu. Stronicowanie kursorem (start, numer)
+    - kolejna strona zaczyna się wyszukiwaniem w indeksie, a nie przez OFFSET.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        :param path: Plik bazy (':memory:' - magazyn w pamięci, np. w testach).
+        """
+        if path != ":memory:":
+            path = os.path.abspath(os.path.expanduser(path))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    # --- Zapis ---
+
+    def save(self, transcript: MeetingTranscript) -> str:
+        """Zapisuje (lub zastępuje) transkrypt; zwraca jego klucz (meeting_id, jeśli jest)."""
+        key = meeting_key(transcript)
+        segments = transcript.segments
+        max_segment = max((s.end - s.start for s in segments), default=0.0)
+        extra = transcript.model_dump_json(include=set(_EXTRA_FIELDS), exclude_none=True)
+        with self._lock, _Transaction(self._conn):
+            self._delete(key)
+            doc_id = self._conn.execute(
+                "INSERT INTO transcripts (key, meeting_id, filename, processed_at, duration, segment_count, "
+                "max_segment_seconds, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, transcript.meeting_id, transcript.filename, transcript.processed_at.isoformat(),
+                 transcript.total_duration, len(segments), max(0.0, max_segment), extra)
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO segments (doc_id, seq, start, end, speaker, text) VALUES (?, ?, ?, ?, ?, ?)",
+                ((doc_id, i, s.start, s.end, s.speaker, s.text) for i, s in enumerate(segments))
+            )
+        return key
+
+    def delete(self, key: str) -> bool:
+        with self._lock, _Transaction(self._conn):
+            return self._delete(key)
+
+    # --- Odczyt ---
+
+    def list(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Metadane zapisanych transkryptów, od najnowszych."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, filename, processed_at, duration, segment_count FROM transcripts "
+                "ORDER BY processed_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(zip(("key", "filename", "processed_at", "duration", "segments"), row)) for row in rows]
+
+    def info(self, key: str) -> Dict[str, Any]:
+        """Metadane transkryptu z listą mówców - bez segmentów."""
+        with self._lock:
+            row = self._transcript_row(key)
+            speakers = [s for (s,) in self._conn.execute(
+                "SELECT DISTINCT speaker FROM segments WHERE doc_id = ? ORDER BY speaker", (row[0],)
+            )]
+        _, _, meeting_id, filename, processed_at, duration, count, _, extra = row
+        return {"key": key, "meeting_id": meeting_id, "filename": filename, "processed_at": processed_at,
+                "duration": duration, "segments": count, "speaker_labels": speakers, **json.loads(extra or "{}")}
+
+    def get(self, key: str) -> MeetingTranscript:
+        """Pełny transkrypt (wszystkie segmenty) - jak odpowiedź /transcribe."""
+        with self._lock:
+            row = self._transcript_row(key)
+            segments = self._conn.execute(
+                "SELECT start, end, speaker, text FROM segments WHERE doc_id = ? ORDER BY seq", (row[0],)
+            ).fetchall()
+        _, _, meeting_id, filename, processed_at, _, _, _, extra = row
+        transcript = MeetingTranscript.model_validate(
+            {"filename": filename, "meeting_id": meeting_id, "processed_at": processed_at, "segments": [],
+             **json.loads(extra or "{}")}
+        )
+        # Segmenty z własnej bazy - bez ponownej walidacji każdego z nich
+        transcript.segments = [_segment(*row) for row in segments]
+        return transcript
+
+    def segments(self, key: str, start: float = 0.0, end: Optional[float] = None,
+                 speakers: Optional[List[str]] = None, limit: int = DEFAULT_PAGE_SIZE,
+                 cursor: Optional[str] = None) -> SegmentPage:
+        """
+        Segmenty nachodzące na okno [start, end] (end=None - do końca nagrania), w kolejności czasu.
+        :param speakers: Tylko wypowiedzi tych mówców (None/pusta lista - wszyscy).
+        :param cursor: next_cursor z poprzedniej strony.
+        """
+        if end is not None and end < start:
+            raise ValueError("Koniec okna czasu nie może być przed początkiem.")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"Rozmiar strony musi być w zakresie 1..{MAX_PAGE_SIZE}.")
+
+        with self._lock:
+            row = self._transcript_row(key)
+            doc_id, max_segment = row[0], row[7]
+            # Segment nachodzi na okno tylko wtedy, gdy zaczyna się nie wcześniej niż start - najdłuższy segment
+            sql = ["SELECT seq, start, end, speaker, text FROM segments WHERE doc_id = ? AND start >= ?"]
+            params: List[Any] = [doc_id, start - max_segment]
+            if end is not None:
+                sql.append("AND start <= ?")
+                params.append(end)
+            sql.append("AND end >= ?")
+            params.append(start)
+            if speakers:
+                sql.append(f"AND speaker IN ({', '.join('?' * len(speakers))})")
+                params.extend(speakers)
+            if cursor is not None:
+                sql.append("AND (start, seq) > (?, ?)")
+                params.extend(decode_cursor(cursor))
+            sql.append("ORDER BY start, seq LIMIT ?")
+            params.append(limit + 1)
+            rows = self._conn.execute(" ".join(sql), params).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][1], rows[-1][0]) if has_more else None
+        return SegmentPage(
+            segments=[_segment(*row[1:]) for row in rows],
+            next_cursor=next_cursor
+        )
+
+    def iter_segments(self, key: str, page_size: int = MAX_PAGE_SIZE) -> Iterator[TranscriptionSegment]:
+        """
+        Wszystkie segmenty w kolejności czasu, czytane stronami - w pamięci jest najwyżej jedna strona
+        (np. do strumieniowego eksportu napisów). Nieznany klucz zgłasza błąd od razu, nie przy pierwszym next().
+        """
+        return self._follow_pages(key, self.segments(key, limit=page_size), page_size)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Wewnętrzne ---
+
+    def _follow_pages(self, key: str, page: SegmentPage, page_size: int) -> Iterator[TranscriptionSegment]:
+        while True:
+            yield from page.segments
+            if page.next_cursor is None:
+                return
+            page = self.segments(key, limit=page_size, cursor=page.next_cursor)
+
+    def _transcript_row(self, key: str) -> tuple:
+        row = self._conn.execute("SELECT * FROM transcripts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise TranscriptNotFoundError(f"Nie znaleziono transkryptu: {key}")
+        return row
+
+    def _delete(self, key: str) -> bool:
+        row = self._conn.execute("SELECT doc_id FROM transcripts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        self._conn.execute("DELETE FROM segments WHERE doc_id = ?", row)
+        self._conn.execute("DELETE FROM transcripts WHERE doc_id = ?", row)
+        return True
@@ -0,0 +1,211 @@
+# File: src/infrastructure/vad.py
+
+import os
+import logging
+import tempfile
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.infrastructure.audio_loader import AudioBuffer, BYTES_PER_SAMPLE, DEFAULT_MEMMAP_THRESHOLD_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Energia liczona blokami - stała pamięć także dla wielogodzinnych nagrań (memmap)
+BLOCK_SECONDS = 60.0
+# Poniżej tej ilości ciszy kompaktowanie (kopia audio) się nie opłaca - modele dostają oryginał
+MIN_SKIPPED_SECONDS = 1.0
+
+
+class SpeechMap:
+    """
+    Odwzorowanie między osią czasu oryginalnego nagrania a skompaktowanym audio (same fragmenty mowy,
+    sklejone z krótką ciszą join_seconds, żeby modele nie łączyły słów z różnych fragmentów).
+    Wszystkie czasy w sekundach.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, total_seconds: float, join_seconds: float = 0.1):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.total_seconds = float(total_seconds)
+        self.join_seconds = join_seconds
+        lengths = self.ends - self.starts
+        # Początek każdego fragmentu w skompaktowanym audio
+        self.compact_starts = np.concatenate([[0.0], np.cumsum(lengths + join_seconds)[:-1]]) if len(lengths) else np.empty(0)
+        self.lengths = lengths
+
+    @property
+    def speech_seconds(self) -> float:
+        return float(self.lengths.sum())
+
+    @property
+    def skipped_seconds(self) -> float:
+        return max(0.0, self.total_seconds - self.speech_seconds)
+
+    @property
+    def regions(self) -> int:
+        return len(self.starts)
+
+    def to_original(self, times: np.ndarray) -> np.ndarray:
+        """Czasy skompaktowanego audio -> czasy oryginału (czas w ciszy łączącej przypada na koniec fragmentu)."""
+        times = np.asarray(times, dtype=np.float64)
+        if not self.regions:
+            return times
+        index = np.clip(np.searchsorted(self.compact_starts, times, side="right") - 1, 0, self.regions - 1)
+        offset = np.clip(times - self.compact_starts[index], 0.0, self.lengths[index])
+        return self.starts[index] + offset
+
+    def map_transcription(self, transcription: Dict[str, Any]) -> Dict[str, Any]:
+        """Przenosi czasy segmentów i słów wyniku Whispera na oś oryginału (nowy słownik, wejście bez zmian)."""
+        segments = [dict(segment, words=[dict(w) for w in segment.get("words", [])])
+                    for segment in transcription.get("segments", [])]
+        words = [w for segment in segments for w in segment["words"]]
+
+        # Jedno wywołanie searchsorted na wszystkie znaczniki (brakujące pola czasu pomijamy)
+        stamps = [(item, key) for item in segments + words for key in ("start", "end") if item.get(key) is not None]
+        mapped = self.to_original(np.array([item[key] for item, key in stamps], dtype=np.float64)).tolist()
+        for (item, key), value in zip(stamps, mapped):
+            item[key] = value
+        return {**transcription, "segments": segments}
+
+    def map_turns(self, turns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Przenosi tury mówców na oś oryginału. Tura obejmująca łączenie dwóch fragmentów jest dzielona
+        - pominięta cisza nie jest przypisywana żadnemu mówcy.
+        """
+        mapped = []
+        for turn in turns:
+            start, end = turn["start"], turn["end"]
+            index = max(0, int(np.searchsorted(self.compact_starts, start, side="right")) - 1)
+            while index < self.regions and self.compact_starts[index] < end:
+                lo = max(start, self.compact_starts[index])
+                hi = min(end, self.compact_starts[index] + self.lengths[index])
+                if hi > lo:
+                    shift = self.starts[index] - self.compact_starts[index]
+                    mapped.append({**turn, "start": float(lo + shift), "end": float(hi + shift)})
+                index += 1
+        return mapped
+
+    def compact(self, audio: AudioBuffer, force_memmap: bool = False,
+                memmap_threshold_bytes: int = DEFAULT_MEMMAP_THRESHOLD_BYTES) -> AudioBuffer:
+        """
+        Skleja fragmenty mowy w nowy bufor. Duże wyniki (lub force_memmap, np. dla procesów roboczych)
+        trafiają do pliku tymczasowego mapowanego w pamięć - fragmenty kopiowane są po kolei.
+        """
+        rate = audio.sample_rate
+        bounds = [(int(round(s * rate)), int(round(e * rate))) for s, e in zip(self.starts.tolist(), self.ends.tolist())]
+        join = np.zeros(int(round(self.join_seconds * rate)), dtype=np.float32)
+        total = sum(b - a for a, b in bounds) + len(join) * max(0, len(bounds) - 1)
+        name = f"{audio.name} (mowa)"
+
+        if not force_memmap and total * BYTES_PER_SAMPLE <= memmap_threshold_bytes:
+            parts = []
+            for i, (a, b) in enumerate(bounds):
+                if i:
+                    parts.append(join)
+                parts.append(np.asarray(audio.samples[a:b], dtype=np.float32))
+            samples = np.concatenate(parts) if parts else np.empty(0, dtype=np.float32)
+            return AudioBuffer(samples, name=name, sample_rate=rate)
+
+        spill = tempfile.NamedTemporaryFile(delete=False, suffix=".f32")
+        try:
+            with spill:
+                for i, (a, b) in enumerate(bounds):
+                    if i:
+                        spill.write(join.tobytes())
+                    spill.write(np.asarray(audio.samples[a:b], dtype=np.float32).tobytes())
+        except BaseException:
+            os.remove(spill.name)
+            raise
+        return AudioBuffer.from_file(spill.name, name=name, owns_backing_file=True)
+
+
+class EnergyVAD:
+    """
+    Szybka detekcja mowy na podstawie energii ramek (NumPy, bez modelu).
+    Próg adaptacyjny: poziom szumu (percentyl energii ramek) + margines, ograniczony z dołu progiem
+    bezwzględnym, a z góry pułapem - przy głośnym tle wszystko jest mową (nic nie wycinamy), zamiast
+    ciąć cichszych mówców.
+    Usuwane są tylko dłuższe przerwy (min_silence_seconds) - krótkie pauzy zostają, żeby nie zmieniać
+    rytmu wypowiedzi widzianego przez modele.
+    """
+
+    def __init__(self, frame_seconds: float = 0.03, threshold_db: float = -50.0, ceiling_db: float = -35.0,
+                 margin_db: float = 10.0,
+                 noise_percentile: float = 10.0, min_speech_seconds: float = 0.2, min_silence_seconds: float = 2.0,
+                 padding_seconds: float = 0.3, join_seconds: float = 0.1):
+        """
+        :param threshold_db: Bezwzględny próg energii ramki (dBFS) - poniżej zawsze cisza.
+        :param ceiling_db: Najwyższy dopuszczalny próg adaptacyjny (dBFS).
+        :param margin_db: Margines nad poziomem szumu tła dla progu adaptacyjnego.
+        :param min_silence_seconds: Najkrótsza przerwa, która zostanie wycięta.
+        :param padding_seconds: Zapas dodawany z obu stron każdego fragmentu mowy.
+        :param join_seconds: Cisza wstawiana między sklejonymi fragmentami.
+        """
+        self.frame_seconds = frame_seconds
+        self.threshold_db = threshold_db
+        self.ceiling_db = ceiling_db
+        self.margin_db = margin_db
+        self.noise_percentile = noise_percentile
+        self.min_speech_seconds = min_speech_seconds
+        self.min_silence_seconds = min_silence_seconds
+        self.padding_seconds = padding_seconds
+        self.join_seconds = join_seconds
+
+    def params(self) -> Dict[str, Any]:
+        """Parametry wpływające na wynik (część klucza cache etapów liczonych na samej mowie)."""
+        return {
+            "vad": "energy",
+            "frame": self.frame_seconds,
+            "threshold_db": self.threshold_db,
+            "ceiling_db": self.ceiling_db,
+            "margin_db": self.margin_db,
+            "noise_percentile": self.noise_percentile,
+            "min_speech": self.min_speech_seconds,
+            "min_silence": self.min_silence_seconds,
+            "padding": self.padding_seconds,
+            "join": self.join_seconds,
+        }
+
+    def frame_energy_db(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        frame = max(1, int(self.frame_seconds * sample_rate))
+        num_frames = len(samples) // frame
+        block = max(1, int(BLOCK_SECONDS * sample_rate) // frame) * frame
+        energy = np.empty(num_frames, dtype=np.float32)
+        for offset in range(0, num_frames * frame, block):
+            chunk = np.asarray(samples[offset:min(offset + block, num_frames * frame)], dtype=np.float32)
+            frames = chunk.reshape(-1, frame)
+            energy[offset // frame:offset // frame + len(frames)] = np.einsum("ij,ij->i", frames, frames) / frame
+        return 10.0 * np.log10(energy + 1e-12)
+
+    def detect(self, samples: np.ndarray, sample_rate: int) -> SpeechMap:
+        total_seconds = len(samples) / sample_rate
+        energy_db = self.frame_energy_db(samples, sample_rate)
+        if not len(energy_db):
+            return SpeechMap(np.empty(0), np.empty(0), total_seconds, self.join_seconds)
+
+        noise_floor = float(np.percentile(energy_db, self.noise_percentile))
+        threshold = min(self.ceiling_db, max(self.threshold_db, noise_floor + self.margin_db))
+        voiced = energy_db > threshold
+
+        # Granice ciągów ramek mowy (indeksy ramek)
+        edges = np.diff(np.concatenate([[0], voiced.view(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1) * self.frame_seconds
+        ends = np.flatnonzero(edges == -1) * self.frame_seconds
+
+        # Krótkie przerwy zostają (sklejenie sąsiednich fragmentów), potem odrzucenie krótkich impulsów
+        if len(starts):
+            keep_gap = (starts[1:] - ends[:-1]) >= self.min_silence_seconds
+            starts = np.concatenate([starts[:1], starts[1:][keep_gap]])
+            ends = np.concatenate([ends[:-1][keep_gap], ends[-1:]])
+            long_enough = (ends - starts) >= self.min_speech_seconds
+            starts, ends = starts[long_enough], ends[long_enough]
+
+        # Zapas z obu stron; nakładające się po tym fragmenty łączymy
+        starts = np.maximum(0.0, starts - self.padding_seconds)
+        ends = np.minimum(total_seconds, ends + self.padding_seconds)
+        if len(starts) > 1:
+            separate = starts[1:] > ends[:-1]
+            starts = np.concatenate([starts[:1], starts[1:][separate]])
+            ends = np.concatenate([ends[:-1][separate], ends[-1:]])
+        return SpeechMap(starts, ends, total_seconds, self.join_seconds)
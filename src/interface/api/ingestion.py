@@ -0,0 +1,138 @@
+# File: src/interface/api/ingestion.py
+
+import os
+import hashlib
+import tempfile
+import logging
+from typing import AsyncIterator, Optional
+
+import numpy as np
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger("API")
+
+# Duże bloki zapisu: mniej wywołań systemowych i przełączeń do threadpoola
+WRITE_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Formaty ciała żądania: kontener (wav/mp3/m4a...) lub surowe PCM 16kHz mono
+INPUT_FORMATS = ("container", "pcm_s16le", "pcm_f32le")
+
+
+class UploadTooLargeError(Exception):
+    """Ciało żądania przekroczyło skonfigurowany limit rozmiaru."""
+
+
+class IngestedUpload:
+    """
+    Upload zapisany na dysk razem z hashem treści policzonym w tym samym przebiegu.
+    Dla PCM plik zawiera już gotowe próbki float32 (bez dekodowania kontenera).
+    """
+
+    def __init__(self, path: str, filename: str, content_hash: str, size: int, input_format: str):
+        self.path = path
+        self.filename = filename
+        self.content_hash = content_hash
+        self.size = size
+        self.input_format = input_format
+
+    @property
+    def is_pcm(self) -> bool:
+        return self.input_format != "container"
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+            logger.info(f"Usunięto plik tymczasowy: {self.path}")
+
+
+class _StreamWriter:
+    """Zapis strumienia do pliku tymczasowego z równoległym haszowaniem i limitem rozmiaru."""
+
+    def __init__(self, suffix: str, input_format: str, max_bytes: int):
+        if input_format not in INPUT_FORMATS:
+            raise ValueError(f"Nieznany format wejścia: {input_format} (dostępne: {INPUT_FORMATS})")
+        self.input_format = input_format
+        self.max_bytes = max_bytes
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self._pending = bytearray()
+        self._remainder = b""  # niepełna próbka PCM z końca poprzedniego bloku
+        self._file = tempfile.NamedTemporaryFile(delete=False, suffix=".f32" if input_format != "container" else suffix)
+        self.path = self._file.name
+
+    async def feed(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLargeError(f"Plik przekracza limit {self.max_bytes / 1024 ** 2:.0f} MB")
+        self._pending.extend(chunk)
+        if len(self._pending) >= WRITE_CHUNK_BYTES:
+            block, self._pending = bytes(self._pending), bytearray()
+            await run_in_threadpool(self._write_block, block)
+
+    async def finish(self):
+        if self._pending:
+            await run_in_threadpool(self._write_block, bytes(self._pending))
+            self._pending = bytearray()
+        self._file.close()
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _write_block(self, block: bytes):
+        # Hash liczony z oryginalnych bajtów - ten sam plik zawsze trafia w ten sam wpis cache
+        self.digest.update(block)
+        if self.input_format == "container":
+            self._file.write(block)
+            return
+
+        data = self._remainder + block
+        width = 2 if self.input_format == "pcm_s16le" else 4
+        usable = len(data) - len(data) % width
+        self._remainder = data[usable:]
+        if self.input_format == "pcm_s16le":
+            samples = np.frombuffer(data, dtype="<i2", count=usable // 2).astype(np.float32) / 32768.0
+        else:
+            samples = np.frombuffer(data, dtype="<f4", count=usable // 4)
+        self._file.write(samples.astype(np.float32, copy=False).tobytes())
+
+
+async def ingest_stream(chunks: AsyncIterator[bytes], filename: str, max_bytes: int,
+                        input_format: str = "container") -> IngestedUpload:
+    """
+    Strumieniowo zapisuje ciało żądania na dysk, licząc SHA-256 w tym samym przebiegu.
+    :param input_format: 'container' (plik audio) albo 'pcm_s16le'/'pcm_f32le' (surowe 16kHz mono).
+    """
+    writer = _StreamWriter(os.path.splitext(filename)[1], input_format, max_bytes)
+    try:
+        async for chunk in chunks:
+            if chunk:
+                await writer.feed(chunk)
+        await writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+    logger.info(f"Przyjęto {filename}: {writer.size / 1024 ** 2:.1f} MB ({input_format}), sha256={writer.digest.hexdigest()[:12]}")
+    return IngestedUpload(writer.path, filename, writer.digest.hexdigest(), writer.size, input_format)
+
+
+async def ingest_upload(file: UploadFile, max_bytes: int, input_format: str = "container") -> IngestedUpload:
+    """Wariant dla multipart (UploadFile) - kopiowanie dużymi blokami z haszowaniem w locie."""
+
+    async def read_chunks() -> AsyncIterator[bytes]:
+        while True:
+            chunk = await file.read(WRITE_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+    return await ingest_stream(read_chunks(), file.filename or "upload", max_bytes, input_format)
+
+
+def display_name(filename: Optional[str], input_format: str) -> str:
+    if filename:
+        return filename
+    return "stream.pcm" if input_format != "container" else "upload"
@@ -1,12 +1,32 @@
 from dotenv import load_dotenv
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
-import shutil
-import os
-import tempfile
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Query, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+import io
+import asyncio
 import logging
-from src.core.meeting_service import MeetingService
-from src.domain.models.models import MeetingTranscript
+import os
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from src.core.model_pool import ModelPool
+from src.core.job_manager import JobManager, QueueFullError
+from src.core.live_transcription import PCM_FORMATS, LiveTranscriptionSession, PCMFrameDecoder
+from src.domain.models.models import MeetingTranscript, JobInfo, SearchHit, SegmentPage
+from src.infrastructure.artifact_store import MeetingNotFoundError
+from src.infrastructure.audio_loader import AudioBuffer
+from src.infrastructure.metrics import REGISTRY
+from src.infrastructure.settings import Settings
+from src.infrastructure.subtitle_export import MEDIA_TYPES as EXPORT_MEDIA_TYPES, iter_export
+from src.infrastructure.transcript_store import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, TranscriptNotFoundError
+from src.interface.api.ingestion import (
+    IngestedUpload, UploadTooLargeError, ingest_stream, ingest_upload, display_name
+)
+from src.interface.api.streaming import MEDIA_TYPES, STREAM_FORMATS, stream_transcription
 
 load_dotenv()
 
@@ -14,22 +34,169 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("API")
 
+# Pula replik modeli (Globalna instancja)
+# W wersji PRO użylibyśmy Dependency Injection (Depends), ale na teraz to wystarczy.
+# Modele są ładowane i rozgrzewane w tle przy starcie - gotowość raportuje /health/ready.
+settings = Settings.from_env()
+model_pool = ModelPool.from_settings(settings)
+job_manager = JobManager(max_workers=settings.job_workers, max_queue=settings.job_queue_size)
+
+MAX_UPLOAD_BYTES = settings.max_upload_mb * 1024 * 1024
+
+# Eksport transkryptu kolumnowego (czasy słów) - format -> typ MIME
+WORD_MEDIA_TYPES = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Rozgrzewanie w tle: proces od razu odpowiada na /health/live, ruch czeka na gotowe repliki
+    model_pool.start(background=True)
+    yield
+    job_manager.shutdown()
+    model_pool.close()
+
 app = FastAPI(
     title="CoreTranscript API",
     description="API do transkrypcji i diaryzacji spotkań (Whisper + Pyannote)",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
-# Inicjalizacja serwisu (Globalna instancja)
-# W wersji PRO użylibyśmy Dependency Injection (Depends), ale na teraz to wystarczy.
-# Serwis załaduje modele przy pierwszym użyciu (Lazy Loading z AIEngine).
-meeting_service = MeetingService()
+# Metryki odczytywane przy każdym scrape (stan kolejki i puli)
+HTTP_SECONDS = REGISTRY.histogram("coretranscript_http_request_seconds", "Czas obsługi żądania HTTP", ["method", "route", "status"])
+JOBS_GAUGE = REGISTRY.gauge("coretranscript_jobs", "Zadania w kolejce wg stanu", ["state"])
+POOL_GAUGE = REGISTRY.gauge("coretranscript_model_pool_replicas", "Repliki modeli wg stanu", ["state"])
+CACHE_GAUGE = REGISTRY.gauge("coretranscript_cache_requests", "Trafienia/pudła cache wyników", ["kind", "result"])
+
+@app.middleware("http")
+async def record_request_time(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Szablon ścieżki (np. /jobs/{job_id}), żeby identyfikatory nie mnożyły serii
+    route = request.scope.get("route")
+    HTTP_SECONDS.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code)
+    )
+    return response
+
+async def _ingest(coro) -> IngestedUpload:
+    """Mapuje błędy przyjmowania uploadu na kody HTTP (413 - za duży, 400 - zły format)."""
+    try:
+        return await coro
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _process_ingested(upload: IngestedUpload, progress_callback=None) -> MeetingTranscript:
+    """
+    Przetwarza przyjęty upload na wypożyczonej replice modeli.
+    Hash jest już znany, więc cache sprawdzany jest przed dekodowaniem.
+    """
+    with model_pool.checkout() as meeting_service:
+        if upload.is_pcm:
+            # Surowe PCM: próbki są już w formacie modeli - pomijamy dekodowanie kontenera
+            audio = AudioBuffer.from_file(upload.path, name=upload.filename)
+            with audio:
+                return meeting_service.process_audio(
+                    audio, upload.filename, content_hash=upload.content_hash, progress_callback=progress_callback
+                )
+        return meeting_service.process_meeting(
+            upload.path, content_hash=upload.content_hash, progress_callback=progress_callback, filename=upload.filename
+        )
+
+async def _transcribe_ingested(upload: IngestedUpload) -> MeetingTranscript:
+    try:
+        logger.info(f"Plik zapisany tymczasowo jako: {upload.path}")
+
+        # Delegacja do Core (MeetingService)
+        # To jest operacja blokująca (synchroniczna) - uruchamiamy ją w threadpoolu,
+        # żeby nie blokować pętli zdarzeń (health checki i inne uploady działają dalej).
+        return await run_in_threadpool(_process_ingested, upload)
+
+    except Exception as e:
+        logger.error(f"Błąd przetwarzania: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    finally:
+        # Sprzątanie: zawsze usuwamy plik tymczasowy, nawet jak wystąpi błąd
+        upload.remove()
+
+def _process_and_remove(upload: IngestedUpload, progress_callback=None) -> MeetingTranscript:
+    """Jak _process_ingested, ale sprząta upload po zakończeniu (strumień może się rozłączyć wcześniej)."""
+    try:
+        return _process_ingested(upload, progress_callback)
+    finally:
+        upload.remove()
+
+def _submit_job(upload: IngestedUpload):
+    try:
+        job = job_manager.submit(
+            upload.filename,
+            lambda report: _process_ingested(upload, progress_callback=report),
+            on_finish=upload.remove
+        )
+    except QueueFullError as e:
+        upload.remove()
+        return JSONResponse(status_code=429, content={"detail": str(e)}, headers={"Retry-After": "30"})
+    return job.info
 
 @app.get("/")
 def health_check():
     """Szybki test czy API żyje."""
     return {"status": "ok", "message": "CoreTranscript is ready to listen."}
 
+@app.get("/health/live")
+def liveness():
+    """Proces działa (niezależnie od stanu modeli)."""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def readiness():
+    """Czy repliki modeli są załadowane i rozgrzane. Do tego czasu 503 (load balancer nie kieruje ruchu)."""
+    status = model_pool.status()
+    if not status["ready"]:
+        return JSONResponse(status_code=503, content={"status": "not_ready", **status})
+    return {"status": "ready", **status}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Metryki w formacie Prometheusa: czasy i pamięć etapów, RTF per model, oczekiwanie w kolejkach, ładowanie modeli."""
+    for state, count in job_manager.stats().items():
+        JOBS_GAUGE.set(count, state=state)
+    pool = model_pool.status()
+    POOL_GAUGE.set(pool["in_use"], state="in_use")
+    POOL_GAUGE.set(pool["available"], state="available")
+    cache = model_pool.primary.cache
+    if cache is not None:
+        stats = cache.stats()
+        for result in ("hits", "misses"):
+            for kind, count in stats[result].items():
+                CACHE_GAUGE.set(count, kind=kind, result=result)
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/models")
+def model_memory():
+    """
+    Załadowane modele i ich szacowana pamięć, budżet, liczniki ładowań/zwolnień
+    (CORETRANSCRIPT_MODELS_MEMORY_BUDGET_MB, CORETRANSCRIPT_MODELS_IDLE_SECONDS).
+    """
+    return model_pool.primary.ai_engine.models.stats()
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Statystyki cache wyników (trafienia/pudła per etap, rozmiar)."""
+    cache = model_pool.primary.cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
 @app.post("/transcribe", response_model=MeetingTranscript)
 async def transcribe_audio(file: UploadFile = File(...)):
     """
@@ -37,29 +204,436 @@ async def transcribe_audio(file: UploadFile = File(...)):
     Zwraca pełny transkrypt z podziałem na mówców.
     """
     logger.info(f"Otrzymano żądanie transkrypcji pliku: {file.filename}")
-    
-    # Tworzymy plik tymczasowy, bo nasze modele wymagają ścieżki do pliku na dysku
-    # Używamy delete=False, żeby plik nie zniknął zanim AIEngine go przeczyta.
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-        shutil.copyfileobj(file.file, temp_file)
-        temp_path = temp_file.name
-    
-    try:
-        logger.info(f"Plik zapisany tymczasowo jako: {temp_path}")
-        
-        # Delegacja do Core (MeetingService)
-        # To jest operacja blokująca (synchroniczna), więc w FastAPI domyślnie
-        # uruchomi się w osobnym wątku (threadpool), nie blokując całego serwera.
-        result = meeting_service.process_meeting(temp_path)
-        
-        return result
+    upload = await _ingest(ingest_upload(file, MAX_UPLOAD_BYTES))
+    return await _transcribe_ingested(upload)
 
-    except Exception as e:
-        logger.error(f"Błąd przetwarzania: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    
+@app.post("/transcribe/raw", response_model=MeetingTranscript)
+async def transcribe_raw(
+    request: Request,
+    filename: Optional[str] = Query(None, description="Nazwa pliku w wyniku"),
+    format: str = Query("container", description="container | pcm_s16le | pcm_f32le (PCM: 16kHz mono)")
+):
+    """
+    Transkrypcja z surowego ciała żądania (bez multipart).
+    Ciało jest zapisywane strumieniowo z haszowaniem w locie; PCM pomija dekodowanie kontenera.
+    """
+    name = display_name(filename, format)
+    logger.info(f"Otrzymano żądanie transkrypcji (raw, {format}): {name}")
+    upload = await _ingest(ingest_stream(request.stream(), name, MAX_UPLOAD_BYTES, format))
+    return await _transcribe_ingested(upload)
+
+@app.post("/transcribe/stream")
+async def transcribe_audio_stream(
+    file: UploadFile = File(...),
+    format: str = Query("ndjson", description="ndjson | sse (Server-Sent Events)")
+):
+    """
+    Jak POST /transcribe, ale wynik płynie strumieniem - połączenie nie wisi bez odpowiedzi przez cały przebieg.
+    Zdarzenia: progress (etap, postęp 0..1), heartbeat, segment (wypowiedź po alignmencie),
+    summary (pełny MeetingTranscript - ten sam model co odpowiedź /transcribe) albo error.
+    """
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Nieobsługiwany format strumienia: {format} (dostępne: {STREAM_FORMATS})")
+    logger.info(f"Otrzymano żądanie transkrypcji strumieniowej ({format}): {file.filename}")
+    upload = await _ingest(ingest_upload(file, MAX_UPLOAD_BYTES))
+    # Przetwarzanie rusza już tutaj - upload zostanie usunięty, nawet gdy odpowiedź nie zacznie się wysyłać
+    events = stream_transcription(lambda report: _process_and_remove(upload, report), format)
+    return StreamingResponse(
+        events,
+        media_type=MEDIA_TYPES[format],
+        # Bez buforowania po drodze (nginx) - zdarzenia mają docierać od razu
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# --- Kolejka zadań (asynchroniczne przetwarzanie) ---
+
+@app.post("/jobs", status_code=202, response_model=JobInfo)
+async def create_job(file: UploadFile = File(...)):
+    """
+    Przyjmuje plik i od razu zwraca identyfikator zadania.
+    Wynik odczytuje się przez GET /jobs/{job_id}. Przy pełnej kolejce zwraca 429.
+    """
+    upload = await _ingest(ingest_upload(file, MAX_UPLOAD_BYTES))
+    return _submit_job(upload)
+
+@app.post("/jobs/raw", status_code=202, response_model=JobInfo)
+async def create_job_raw(
+    request: Request,
+    filename: Optional[str] = Query(None, description="Nazwa pliku w wyniku"),
+    format: str = Query("container", description="container | pcm_s16le | pcm_f32le (PCM: 16kHz mono)")
+):
+    """Jak POST /jobs, ale z surowego ciała żądania (plik audio lub PCM)."""
+    name = display_name(filename, format)
+    upload = await _ingest(ingest_stream(request.stream(), name, MAX_UPLOAD_BYTES, format))
+    return _submit_job(upload)
+
+@app.get("/jobs/{job_id}", response_model=JobInfo)
+def get_job(job_id: str):
+    """Status, postęp i (po zakończeniu) wynik zadania."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono zadania: {job_id}")
+    return job.info
+
+@app.get("/jobs/{job_id}/export")
+def export_job_result(job_id: str, format: str = Query("srt", description="srt | vtt | txt | json | msgpack | parquet")):
+    """
+    Wynik zakończonego zadania jako napisy SRT / WebVTT lub tekst (strumieniem) albo transkrypt
+    z czasami wszystkich słów - json / msgpack / parquet (z artefaktów spotkania, jak /meetings/{id}/words).
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono zadania: {job_id}")
+    result = job.info.result
+    if result is None:
+        raise HTTPException(status_code=409, detail=f"Zadanie nie ma jeszcze wyniku (status: {job.info.status.value})")
+    if format in WORD_MEDIA_TYPES:
+        if result.meeting_id is None:
+            raise HTTPException(status_code=404, detail="Wynik bez meeting_id - czasy słów wymagają magazynu artefaktów.")
+        try:
+            columnar = _artifacts().load_columnar(result.meeting_id)
+        except MeetingNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        return _words_response(columnar, format, result.filename)
+    return _export_response(result.segments, format, result.filename)
+
+@app.delete("/jobs/{job_id}", response_model=JobInfo)
+def cancel_job(job_id: str):
+    """Anuluje zadanie (oczekujące od razu, uruchomione przy najbliższej granicy etapu)."""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono zadania: {job_id}")
+    return job.info
+
+# --- Ponowne przeliczenie etapów spotkania (bez ponownego ASR) ---
+
+def _artifacts():
+    store = model_pool.primary.artifacts
+    if store is None:
+        raise HTTPException(status_code=404, detail="Magazyn artefaktów jest wyłączony (CORETRANSCRIPT_ARTIFACTS_ENABLED).")
+    return store
+
+async def _rerun(fn, *args) -> MeetingTranscript:
+    """Mapuje błędy przeliczenia na kody HTTP (404 - brak artefaktów, 400 - złe parametry)."""
+    try:
+        return await run_in_threadpool(fn, *args)
+    except MeetingNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _realign(meeting_id: str, tolerance: Optional[float]) -> MeetingTranscript:
+    # Alignment nie używa modeli (bez slotu urządzenia), ale zmienia stan repliki (last_*) - wypożyczamy ją
+    with model_pool.checkout() as meeting_service:
+        return meeting_service.realign(meeting_id, tolerance)
+
+def _rediarize(meeting_id: str, hints: dict) -> MeetingTranscript:
+    with model_pool.checkout() as meeting_service:
+        return meeting_service.rediarize(meeting_id, **hints)
+
+@app.get("/meetings")
+def list_meetings():
+    """Spotkania z zapisanymi artefaktami etapów (od najnowszych)."""
+    return _artifacts().list()
+
+@app.get("/meetings/{meeting_id}")
+def get_meeting(meeting_id: str):
+    """Metadane spotkania: parametry ASR, diaryzacji i alignmentu użyte w ostatnim przeliczeniu."""
+    try:
+        return _artifacts().metadata(meeting_id)
+    except MeetingNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/meetings/{meeting_id}/words")
+def export_meeting_words(meeting_id: str, format: str = Query("json", description="json | msgpack | parquet")):
+    """
+    Wynik ostatniego alignmentu spotkania z czasami wszystkich słów (transkrypt kolumnowy):
+    JSON, MessagePack (wymaga msgpack) lub Parquet (wymaga pyarrow).
+    """
+    try:
+        columnar = _artifacts().load_columnar(meeting_id)
+    except MeetingNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _words_response(columnar, format, meeting_id)
+
+def _words_response(columnar, export_format: str, name: str) -> Response:
+    if export_format not in WORD_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Nieobsługiwany format: {export_format} (dostępne: {tuple(WORD_MEDIA_TYPES)})")
+    try:
+        if export_format == "json":
+            body = columnar.to_json()
+        elif export_format == "msgpack":
+            body = columnar.to_msgpack()
+        else:
+            buffer = io.BytesIO()
+            columnar.to_parquet(buffer)
+            body = buffer.getvalue()
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return Response(body, media_type=WORD_MEDIA_TYPES[export_format],
+                    headers={"Content-Disposition": f'attachment; filename="{_download_stem(name)}.words.{export_format}"'})
+
+@app.post("/meetings/{meeting_id}/rediarize", response_model=MeetingTranscript)
+async def rediarize_meeting(
+    meeting_id: str,
+    num_speakers: Optional[int] = Query(None, ge=1, description="Dokładna liczba mówców"),
+    min_speakers: Optional[int] = Query(None, ge=1, description="Minimalna liczba mówców"),
+    max_speakers: Optional[int] = Query(None, ge=1, description="Maksymalna liczba mówców")
+):
+    """
+    Ponowna diaryzacja zapisanego audio (z podpowiedziami liczby mówców) i alignment z zapisanym wynikiem ASR.
+    Whisper nie jest uruchamiany. Identyfikator spotkania: pole meeting_id transkryptu.
+    """
+    _artifacts()
+    hints = {"num_speakers": num_speakers, "min_speakers": min_speakers, "max_speakers": max_speakers}
+    return await _rerun(_rediarize, meeting_id, hints)
+
+@app.post("/meetings/{meeting_id}/realign", response_model=MeetingTranscript)
+async def realign_meeting(
+    meeting_id: str,
+    tolerance: Optional[float] = Query(None, ge=0, description="Tolerancja alignmentu (s); brak = zapisana")
+):
+    """Ponowny alignment zapisanych wyników ASR i diaryzacji - bez modeli, bez kolejki na urządzenie."""
+    _artifacts()
+    return await _rerun(_realign, meeting_id, tolerance)
+
+# --- Indeks głosów (rozpoznawanie mówców między spotkaniami) ---
+
+def _speaker_index():
+    index = model_pool.primary.speaker_index
+    if index is None:
+        raise HTTPException(status_code=404, detail="Indeks głosów jest wyłączony (CORETRANSCRIPT_SPEAKER_INDEX_ENABLED).")
+    return index
+
+@app.get("/speakers")
+def list_speakers():
+    """Zapisane tożsamości i liczba ich głosów."""
+    index = _speaker_index()
+    return {"voices": len(index), "identities": index.identities()}
+
+@app.post("/speakers/enroll")
+def enroll_speaker(
+    meeting_id: str = Query(..., description="Spotkanie z zapisanymi artefaktami (pole meeting_id transkryptu)"),
+    speaker: str = Query(..., description="Etykieta mówcy z diaryzacji (np. SPEAKER_01)"),
+    identity: str = Query(..., min_length=1, description="Nazwa osoby")
+):
+    """
+    Zapisuje głos mówcy ze spotkania jako osobę. Kolejne transkrypty (oraz realign spotkań)
+    podpisują rozpoznanych mówców jej nazwą; szczegóły dopasowania w polu speakers transkryptu.
+    """
+    _speaker_index()
+    _artifacts()
+    try:
+        with model_pool.checkout() as meeting_service:
+            voices = meeting_service.enroll_speaker(meeting_id, speaker, identity)
+    except MeetingNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"identity": identity, "voices": voices}
+
+@app.delete("/speakers/{identity}")
+def delete_speaker(identity: str):
+    """Usuwa osobę (wszystkie jej głosy) z indeksu."""
+    if not _speaker_index().remove(identity):
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono osoby: {identity}")
+    return {"identity": identity, "deleted": True}
+
+# --- Wyszukiwanie pełnotekstowe w transkryptach ---
+
+def _search_index():
+    index = model_pool.primary.search_index
+    if index is None:
+        raise HTTPException(status_code=404, detail="Indeks wyszukiwania jest wyłączony (CORETRANSCRIPT_SEARCH_INDEX_ENABLED).")
+    return index
+
+@app.get("/search", response_model=List[SearchHit])
+def search_transcripts(
+    q: str = Query(..., min_length=1, description="Szukane słowa (wszystkie muszą wystąpić; budż* = prefiks)"),
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    speaker: Optional[str] = Query(None, description="Tylko wypowiedzi tego mówcy"),
+    meeting_id: Optional[str] = Query(None, description="Tylko w tym spotkaniu"),
+    raw: bool = Query(False, description="Zapytanie w składni FTS5 (frazy, OR, NOT, NEAR)")
+):
+    """
+    Które spotkanie i kiedy: wypowiedzi pasujące do zapytania z mówcą i czasem w nagraniu,
+    od najlepiej dopasowanych. Indeksowane są wszystkie transkrypty przetworzone przez serwis
+    (oraz eksporty JSON załadowane przez python -m src.interface.cli.search ingest).
+    """
+    try:
+        return _search_index().search(q, limit=limit, offset=offset, speaker=speaker, meeting_id=meeting_id, raw=raw)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/search/stats")
+def search_stats():
+    """Liczba spotkań i wypowiedzi w indeksie oraz rozmiar pliku."""
+    return _search_index().stats()
+
+# --- Zapisane transkrypty (fragmenty wg czasu i mówcy) ---
+
+def _transcript_store():
+    store = model_pool.primary.transcript_store
+    if store is None:
+        raise HTTPException(status_code=404, detail="Magazyn transkryptów jest wyłączony (CORETRANSCRIPT_TRANSCRIPT_STORE_ENABLED).")
+    return store
+
+@app.get("/transcripts")
+def list_transcripts(limit: int = Query(100, ge=1, le=1000)):
+    """Zapisane transkrypty (od najnowszych); klucz = meeting_id transkryptu, jeśli był."""
+    return _transcript_store().list(limit)
+
+@app.get("/transcripts/{key}", response_model=MeetingTranscript)
+def get_transcript(key: str):
+    """Pełny zapisany transkrypt. Długie nagrania lepiej czytać fragmentami: /transcripts/{key}/segments."""
+    try:
+        return _transcript_store().get(key)
+    except TranscriptNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/transcripts/{key}/info")
+def get_transcript_info(key: str):
+    """Metadane transkryptu (długość, liczba segmentów, mówcy) - bez segmentów."""
+    try:
+        return _transcript_store().info(key)
+    except TranscriptNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/transcripts/{key}/segments", response_model=SegmentPage)
+def get_transcript_segments(
+    key: str,
+    start: float = Query(0.0, ge=0, description="Początek okna czasu (s)"),
+    end: Optional[float] = Query(None, ge=0, description="Koniec okna czasu (s); brak = do końca nagrania"),
+    speaker: Optional[List[str]] = Query(None, description="Tylko wypowiedzi tych mówców (parametr można powtórzyć)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor z poprzedniej strony")
+):
+    """
+    Segmenty nachodzące na okno [start, end], w kolejności czasu, stronicowane kursorem.
+    Odczyt z indeksu przedziałów - koszt zależy od liczby zwróconych segmentów, nie od długości transkryptu.
+    """
+    try:
+        return _transcript_store().segments(key, start=start, end=end, speakers=speaker, limit=limit, cursor=cursor)
+    except TranscriptNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/transcripts/{key}/export")
+def export_transcript(key: str, format: str = Query("srt", description="srt | vtt | txt")):
+    """
+    Zapisany transkrypt jako napisy SRT / WebVTT lub tekst. Segmenty czytane z magazynu stronami
+    i wysyłane w miarę generowania - dokument nie powstaje w całości ani w pamięci, ani w bazie.
+    """
+    try:
+        segments = _transcript_store().iter_segments(key)
+    except TranscriptNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _export_response(segments, format, key)
+
+def _export_response(segments, export_format: str, name: str) -> StreamingResponse:
+    try:
+        chunks = iter_export(segments, export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        chunks, media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{_download_stem(name)}.{export_format}"'}
+    )
+
+def _download_stem(name: str) -> str:
+    # Nagłówki HTTP są w latin-1 - nazwa pliku bez polskich znaków i cudzysłowów
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.splitext(os.path.basename(name))[0]) or "transcript"
+
+@app.delete("/transcripts/{key}")
+def delete_transcript(key: str):
+    if not _transcript_store().delete(key):
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono transkryptu: {key}")
+    return {"key": key, "deleted": True}
+
+# --- Transkrypcja na żywo (WebSocket) ---
+
+# Ostatnie sesje (także zakończone) - do odczytu metryk opóźnień
+MAX_LIVE_SESSIONS = 100
+live_sessions: "OrderedDict[str, LiveTranscriptionSession]" = OrderedDict()
+
+@app.websocket("/ws/live")
+async def live_transcription(websocket: WebSocket, format: str = "pcm_s16le"):
+    """
+    Strumień PCM 16kHz mono (ramki binarne, pcm_s16le lub pcm_f32le).
+    Serwer odsyła zdarzenia JSON: session, partial, final, speaker_update, metrics.
+    Klient kończy sesję wiadomością tekstową {"type": "stop"}.
+    """
+    if format not in PCM_FORMATS:
+        await websocket.close(code=1003, reason=f"Nieobsługiwany format: {format}")
+        return
+    await websocket.accept()
+
+    # Każdy krok wypożycza replikę i slot urządzenia - sesja nie współdzieli silnika z zadaniami wsadowymi
+    session = LiveTranscriptionSession(
+        engine_lease=model_pool.inference,
+        step_seconds=settings.live_step_seconds,
+        window_seconds=settings.live_window_seconds,
+        diarize_every_seconds=settings.live_diarize_every_seconds
+    )
+    live_sessions[session.session_id] = session
+    while len(live_sessions) > MAX_LIVE_SESSIONS:
+        live_sessions.popitem(last=False)
+    await websocket.send_json({"type": "session", "session_id": session.session_id})
+    logger.info(f"Sesja na żywo {session.session_id} rozpoczęta ({format})")
+
+    decoder = PCMFrameDecoder(format)  # ramki nie muszą kończyć się na granicy próbki
+    audio_ready = asyncio.Event()
+    stopped = asyncio.Event()
+    disconnected = False
+
+    async def receive():
+        nonlocal disconnected
+        # Odbiór tylko dokłada audio do bufora - ASR działa w osobnej pętli i nie blokuje odbioru
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    disconnected = True
+                    break
+                if message.get("bytes"):
+                    session.append_audio(decoder.decode(message["bytes"]))
+                    audio_ready.set()
+                elif message.get("text") and '"stop"' in message["text"]:
+                    break
+        except Exception as e:
+            # Błąd odbioru kończy sesję jak "stop" (finish oddaje zatwierdzony tekst) - nie znika po cichu
+            logger.error(f"Sesja na żywo {session.session_id}: błąd odbioru audio: {e}")
+        finally:
+            stopped.set()
+            audio_ready.set()
+
+    receiver = asyncio.create_task(receive())
+    try:
+        while not stopped.is_set():
+            await audio_ready.wait()
+            audio_ready.clear()
+            if stopped.is_set() or not session.has_pending_step():
+                continue
+            for event in await run_in_threadpool(session.step):
+                await websocket.send_json(event)
+
+        events = await run_in_threadpool(session.finish)
+        if not disconnected:
+            for event in events:
+                await websocket.send_json(event)
+            await websocket.close()
+    except WebSocketDisconnect:
+        pass
     finally:
-        # Sprzątanie: zawsze usuwamy plik tymczasowy, nawet jak wystąpi błąd
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-            logger.info(f"Usunięto plik tymczasowy: {temp_path}")
\ No newline at end of file
+        receiver.cancel()
+        logger.info(f"Sesja na żywo {session.session_id} zakończona: {session.metrics()}")
+
+@app.get("/live/{session_id}/metrics")
+def live_metrics(session_id: str):
+    """Metryki opóźnień sesji na żywo (m.in. czas od audio do pierwszego tekstu)."""
+    session = live_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono sesji: {session_id}")
+    return session.metrics()
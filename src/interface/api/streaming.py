@@ -0,0 +1,107 @@
+# File: src/interface/api/streaming.py
+
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Callable, Iterator
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.domain.models.models import MeetingTranscript
+
+logger = logging.getLogger("API")
+
+# Formaty strumienia wyników: NDJSON (jedno zdarzenie JSON na linię) lub Server-Sent Events
+STREAM_FORMATS = ("ndjson", "sse")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+# Co ile sekund bez postępu wysyłać heartbeat (proxy i klienci HTTP nie zamykają bezczynnego połączenia)
+HEARTBEAT_SECONDS = 15.0
+# Segmenty wysyłane paczkami - jeden zapis do gniazda zamiast tysięcy przy długich spotkaniach
+SEGMENT_BATCH = 200
+
+# (etap, postęp 0..1) - ten sam kontrakt co progress_callback w MeetingService
+ProgressCallback = Callable[[str, float], None]
+
+
+def format_event(event_type: str, data_json: str, stream_format: str) -> str:
+    """
+    Zdarzenie w formacie strumienia; data_json to gotowy JSON (bez ponownej serializacji).
+    NDJSON: {"type": ..., "data": ...}; SSE: pola event/data.
+    """
+    if stream_format == "sse":
+        return f"event: {event_type}\ndata: {data_json}\n\n"
+    return f'{{"type":"{event_type}","data":{data_json}}}\n'
+
+
+def heartbeat(stream_format: str) -> str:
+    # W SSE komentarz - klienci EventSource go ignorują
+    if stream_format == "sse":
+        return ": heartbeat\n\n"
+    return format_event("heartbeat", "{}", stream_format)
+
+
+def transcript_events(transcript: MeetingTranscript, stream_format: str) -> Iterator[str]:
+    """Segmenty w kolejności czasu, na końcu podsumowanie - pełny MeetingTranscript (jak odpowiedź /transcribe)."""
+    batch = []
+    for segment in transcript.segments:
+        batch.append(format_event("segment", segment.model_dump_json(), stream_format))
+        if len(batch) >= SEGMENT_BATCH:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+    yield format_event("summary", transcript.model_dump_json(), stream_format)
+
+
+def stream_transcription(process: Callable[[ProgressCallback], MeetingTranscript], stream_format: str,
+                         heartbeat_seconds: float = HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+    """
+    Uruchamia process(report) w threadpoolu i zwraca strumień: progress (na granicach etapów),
+    heartbeat (gdy etap trwa dłużej), potem segment (po alignmencie) i summary - albo error.
+    Przetwarzanie startuje już przy wywołaniu (w pętli zdarzeń), a nie przy pierwszym odczycie strumienia:
+    process sprząta po sobie także wtedy, gdy klient rozłączy się przed pierwszym zdarzeniem.
+    Rozłączenie klienta nie przerywa przetwarzania (wynik trafia do cache).
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def report(stage: str, progress: float):
+        # Wywoływane z wątku roboczego - do pętli zdarzeń tylko przez call_soon_threadsafe
+        loop.call_soon_threadsafe(queue.put_nowait, (stage, progress))
+
+    def finished(task: asyncio.Future):
+        if not task.cancelled():
+            task.exception()  # odebrany także wtedy, gdy klient już się rozłączył
+        queue.put_nowait(None)
+
+    task = asyncio.ensure_future(run_in_threadpool(process, report))
+    task.add_done_callback(finished)
+    return _stream_events(task, queue, stream_format, heartbeat_seconds)
+
+
+async def _stream_events(task: asyncio.Future, queue: asyncio.Queue, stream_format: str,
+                         heartbeat_seconds: float) -> AsyncIterator[str]:
+    yield format_event("progress", json.dumps({"stage": "accepted", "progress": 0.0}), stream_format)
+    while True:
+        try:
+            item = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+        except asyncio.TimeoutError:
+            yield heartbeat(stream_format)
+            continue
+        if item is None:
+            break
+        stage, progress = item
+        yield format_event("progress", json.dumps({"stage": stage, "progress": round(progress, 4)}), stream_format)
+
+    try:
+        transcript = task.result()
+    except Exception as e:
+        # Nagłówki (200) już wysłane - błąd jako ostatnie zdarzenie strumienia
+        logger.error(f"Błąd przetwarzania (strumień): {e}")
+        yield format_event("error", json.dumps({"detail": str(e)}, ensure_ascii=False), stream_format)
+        return
+
+    yield format_event("progress", json.dumps({"stage": "done", "progress": 1.0}), stream_format)
+    for chunk in transcript_events(transcript, stream_format):
+        yield chunk
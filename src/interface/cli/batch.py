@@ -0,0 +1,229 @@
+# File: src/interface/cli/batch.py
+"""
+Wsadowa transkrypcja archiwum nagrań.
+
+Uruchomienie:
+    python -m src.interface.cli.batch <katalog|manifest.txt> -o <katalog_wyników> [--workers 2]
+
+Każde nagranie daje jeden plik <nazwa>.json (MeetingTranscript). Pliki z istniejącym wynikiem są pomijane,
+więc przerwany przebieg wznawia się od miejsca przerwania. Nagrania, które dałyby ten sam plik wyniku
+(np. a.wav i a.mp3), zatrzymują przebieg przed startem. Konfiguracja modeli: zmienne CORETRANSCRIPT_*.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from src.infrastructure.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".aac", ".webm", ".mp4")
+
+# --- Proces roboczy: jeden MeetingService (modele ładowane raz na proces) ---
+_worker_service = None
+
+
+def _init_worker(settings_data: Dict[str, Any]):
+    global _worker_service
+    # Import w procesie roboczym - proces główny nie ładuje bibliotek modeli
+    from src.core.meeting_service import MeetingService
+
+    settings = Settings(**settings_data)
+    # Równoległość zapewnia pula procesów - wewnątrz workera bez zagnieżdżonych procesów
+    _worker_service = MeetingService.from_settings(settings.model_copy(update={"executor": "thread"}))
+
+
+def _worker_process(source: str, target: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        transcript = _worker_service.process_meeting(source)
+    except Exception as e:
+        return {"source": source, "ok": False, "error": str(e), "seconds": time.perf_counter() - start}
+
+    write_atomic(target, transcript.model_dump_json(indent=2))
+    duration = _worker_service.last_audio_duration
+    if duration is None and transcript.segments:
+        # Wynik z cache (bez dekodowania) - długość szacowana z ostatniego segmentu
+        duration = transcript.segments[-1].end
+    return {
+        "source": source,
+        "ok": True,
+        "seconds": time.perf_counter() - start,
+        "audio_seconds": duration or 0.0,
+        "segments": len(transcript.segments),
+        "timings": dict(_worker_service.last_timings),
+    }
+
+
+# --- Planowanie ---
+
+def write_atomic(path: str, content: str):
+    """Zapis przez plik tymczasowy + os.replace - przerwanie nigdy nie zostawi połowy wyniku."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def discover_inputs(source: str) -> List[Tuple[str, str]]:
+    """
+    Zwraca listę (ścieżka nagrania, ścieżka względna dla wyniku).
+    :param source: Katalog (przeszukiwany rekurencyjnie) albo manifest - plik tekstowy z jedną ścieżką w linii
+                   (ścieżki względne liczone od katalogu manifestu, '#' rozpoczyna komentarz).
+    """
+    if os.path.isdir(source):
+        found = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if name.lower().endswith(AUDIO_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    found.append((path, os.path.relpath(path, source)))
+        return sorted(found)
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    found = []
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = line if os.path.isabs(line) else os.path.join(base_dir, line)
+            relative = os.path.relpath(path, base_dir)
+            if relative.startswith(os.pardir):
+                relative = os.path.basename(path)
+            found.append((path, relative))
+    return found
+
+
+def output_path(output_dir: str, relative: str) -> str:
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + ".json")
+
+
+def plan(source: str, output_dir: str, overwrite: bool = False) -> Tuple[List[Tuple[str, str]], int]:
+    """
+    Zwraca (lista (nagranie, wynik) do przetworzenia, liczba pominiętych, bo już gotowe).
+    ValueError, gdy dwa nagrania trafiłyby do jednego pliku wyniku (np. a.wav i a.mp3 w jednym katalogu
+    albo pliki o tej samej nazwie spoza katalogu manifestu) - jeden wynik nadpisałby drugi,
+    a wznowienie pominęłoby drugie nagranie jako gotowe.
+    """
+    discovered = [(path, output_path(output_dir, relative)) for path, relative in discover_inputs(source)]
+    owners: Dict[str, str] = {}
+    collisions = []
+    for path, target in discovered:
+        # Bez rozróżniania wielkości liter - system plików macOS domyślnie ich nie rozróżnia
+        key = os.path.normpath(target).lower()
+        if key in owners:
+            collisions.append(f"{owners[key]} i {path} -> {target}")
+        else:
+            owners[key] = path
+    if collisions:
+        raise ValueError("Nagrania o tym samym pliku wyniku: " + "; ".join(collisions))
+
+    todo, skipped = [], 0
+    for path, target in discovered:
+        if not overwrite and os.path.exists(target):
+            skipped += 1
+            continue
+        todo.append((path, target))
+    return todo, skipped
+
+
+# --- Raport ---
+
+def summarize(results: List[Dict[str, Any]], skipped: int, wall_seconds: float) -> Dict[str, Any]:
+    done = [r for r in results if r["ok"]]
+    audio_seconds = sum(r["audio_seconds"] for r in done)
+    stage_totals: Dict[str, float] = {}
+    for r in done:
+        for stage, seconds in r["timings"].items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+    hours = wall_seconds / 3600 if wall_seconds > 0 else float("nan")
+    return {
+        "processed": len(done),
+        "failed": len(results) - len(done),
+        "skipped": skipped,
+        "wall_seconds": wall_seconds,
+        "audio_seconds": audio_seconds,
+        "files_per_hour": len(done) / hours if done else 0.0,
+        "audio_hours_per_hour": audio_seconds / 3600 / hours if done else 0.0,
+        "stage_seconds_total": stage_totals,
+        "stage_seconds_mean": {k: v / len(done) for k, v in stage_totals.items()} if done else {},
+        "errors": {r["source"]: r["error"] for r in results if not r["ok"]},
+    }
+
+
+def print_summary(summary: Dict[str, Any]):
+    print("\n=== Podsumowanie ===")
+    print(f"Przetworzone: {summary['processed']}, błędy: {summary['failed']}, pominięte (gotowe): {summary['skipped']}")
+    print(f"Czas: {summary['wall_seconds'] / 60:.1f} min, audio: {summary['audio_seconds'] / 3600:.2f} h")
+    print(f"Przepustowość: {summary['files_per_hour']:.1f} plików/h, {summary['audio_hours_per_hour']:.2f} h audio/h")
+    if summary["stage_seconds_mean"]:
+        print("Średni czas etapów na plik:")
+        for stage, seconds in summary["stage_seconds_mean"].items():
+            print(f"  {stage:>16}: {seconds:8.2f}s")
+    for source, error in summary["errors"].items():
+        print(f"  BŁĄD {source}: {error}")
+
+
+# --- Uruchomienie ---
+
+def run(source: str, output_dir: str, workers: int = 1, overwrite: bool = False,
+        settings: Optional[Settings] = None, report_path: Optional[str] = None) -> Dict[str, Any]:
+    settings = settings or Settings.from_env()
+    todo, skipped = plan(source, output_dir, overwrite)
+    print(f"Do przetworzenia: {len(todo)} plików (pominięte, już gotowe: {skipped}), workery: {workers}")
+
+    results: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(settings.model_dump(),)) as pool:
+            futures = [pool.submit(_worker_process, path, target) for path, target in todo]
+            for index, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                results.append(result)
+                status = "ok" if result["ok"] else f"BŁĄD: {result['error']}"
+                print(f"[{index}/{len(todo)}] {os.path.basename(result['source'])} ({result['seconds']:.1f}s) {status}")
+
+    summary = summarize(results, skipped, time.perf_counter() - start)
+    print_summary(summary)
+    if report_path:
+        write_atomic(report_path, json.dumps(summary, indent=2, ensure_ascii=False))
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Katalog z nagraniami lub manifest (jedna ścieżka w linii)")
+    parser.add_argument("-o", "--output-dir", required=True, help="Katalog na transkrypty (.json)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Liczba procesów (każdy ładuje własne modele)")
+    parser.add_argument("--overwrite", action="store_true", help="Przetwarzaj ponownie pliki z istniejącym wynikiem")
+    parser.add_argument("--report", help="Zapisz podsumowanie jako JSON")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        summary = run(args.source, args.output_dir, args.workers, args.overwrite, report_path=args.report)
+    except ValueError as e:
+        parser.error(str(e))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
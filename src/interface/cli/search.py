@@ -0,0 +1,94 @@
+# File: src/interface/cli/search.py
+"""
+Indeks wyszukiwania pełnotekstowego w transkryptach (SQLite FTS5).
+
+Uruchomienie:
+    python -m src.interface.cli.search ingest <katalog|plik.json ...> [--batch 500]
+    python -m src.interface.cli.search query "budżet Q3" [--limit 20] [--speaker SPEAKER_01]
+
+ingest ładuje istniejące eksporty MeetingTranscript (np. wyniki src.interface.cli.batch) partiami,
+w jednej transakcji na partię. Indeks: CORETRANSCRIPT_SEARCH_INDEX_PATH (ten sam, którego używa API /search).
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from typing import Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+from src.infrastructure.search_index import DEFAULT_BATCH_SIZE, TranscriptSearchIndex
+from src.infrastructure.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def discover_json(sources: List[str]) -> Iterator[str]:
+    """Pliki .json z podanych ścieżek (katalogi przeszukiwane rekurencyjnie, w stałej kolejności)."""
+    for source in sources:
+        if not os.path.isdir(source):
+            yield source
+            continue
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".json"):
+                    yield os.path.join(root, name)
+
+
+def ingest(index: TranscriptSearchIndex, sources: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    start = time.perf_counter()
+    stats = index.ingest_json_files(discover_json(sources), batch_size)
+    index.optimize()
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    print(f"Zaindeksowano {stats['meetings']} spotkań ({stats['segments']} wypowiedzi) "
+          f"w {stats['seconds']:.1f}s, pominięto {stats['skipped']} plików.")
+    return stats
+
+
+def query(index: TranscriptSearchIndex, text: str, limit: int, speaker: Optional[str], raw: bool) -> int:
+    start = time.perf_counter()
+    hits = index.search(text, limit=limit, speaker=speaker, raw=raw)
+    print(f"{len(hits)} trafień ({(time.perf_counter() - start) * 1000:.1f} ms)")
+    for hit in hits:
+        print(f"{hit.filename} [{hit.start:.1f}s-{hit.end:.1f}s] {hit.speaker}: {hit.snippet}")
+    return len(hits)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index", help="Plik indeksu (domyślnie CORETRANSCRIPT_SEARCH_INDEX_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", help="Załaduj eksporty JSON do indeksu")
+    ingest_parser.add_argument("sources", nargs="+", help="Pliki .json lub katalogi z nimi")
+    ingest_parser.add_argument("--batch", type=int, default=DEFAULT_BATCH_SIZE, help="Transkrypty na transakcję")
+
+    query_parser = commands.add_parser("query", help="Wyszukaj w indeksie")
+    query_parser.add_argument("text", help="Szukane słowa (budż* = prefiks)")
+    query_parser.add_argument("--limit", type=int, default=20)
+    query_parser.add_argument("--speaker", help="Tylko wypowiedzi tego mówcy")
+    query_parser.add_argument("--raw", action="store_true", help="Zapytanie w składni FTS5")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(level=logging.WARNING)
+    index = TranscriptSearchIndex(args.index or Settings.from_env().search_index_path)
+    try:
+        if args.command == "ingest":
+            ingest(index, args.sources, args.batch)
+            return 0
+        try:
+            query(index, args.text, args.limit, args.speaker, args.raw)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        return 0
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,10 +6,32 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.
 
 import streamlit as st
 print(f"👀 WERSJA STREAMLIT W RUNTIME: {st.__version__}")
+import hashlib
 import tempfile
 import logging
 from dotenv import load_dotenv
+from src.core.job_manager import JobManager, QueueFullError
 from src.core.meeting_service import MeetingService
+from src.domain.models.models import JobState
+from src.infrastructure.settings import Settings
+from src.infrastructure.subtitle_export import MEDIA_TYPES, iter_export
+from src.interface.ui.transcript_view import TranscriptView, format_clock
+
+# Ile przetworzonych nagrań trzymać w sesji (wynik + widok), zanim najstarsze wypadnie
+SESSION_RESULTS = 5
+PAGE_SIZES = (25, 50, 100)
+# Formaty pobierania wyniku: JSON (pełny model) i napisy/tekst z writerów strumieniowych
+DOWNLOAD_FORMATS = ("json", "srt", "vtt", "txt")
+STAGE_LABELS = {
+    "hash": "Liczenie sumy kontrolnej",
+    "decode": "Dekodowanie audio",
+    "waiting_for_device": "Oczekiwanie na model",
+    "asr": "Transkrypcja (Whisper)",
+    "diarization": "Diaryzacja (Pyannote)",
+    "asr+diarization": "Transkrypcja i diaryzacja",
+    "alignment": "Łączenie tekstu z mówcami",
+    "mapping": "Budowa transkryptu",
+}
 
 # Konfiguracja strony
 st.set_page_config(
@@ -32,6 +54,155 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_meeting_service():
+    return MeetingService.from_settings(Settings.from_env())
+
+@st.cache_resource
+def get_job_manager():
+    # Jeden worker - przetwarzanie w tle, a model nie jest przeciążany przez kilka kart przeglądarki
+    return JobManager(max_workers=1, max_queue=4)
+
+def upload_hash(audio_source) -> str:
+    """SHA-256 nagrania; liczony raz na plik (file_id), nie przy każdym rerunie."""
+    hashes = st.session_state.setdefault("upload_hashes", {})
+    file_id = getattr(audio_source, "file_id", None)
+    if file_id is None or file_id not in hashes:
+        digest = hashlib.sha256(audio_source.getvalue()).hexdigest()
+        if file_id is None:
+            return digest
+        hashes[file_id] = digest
+    return hashes[file_id]
+
+def start_processing(service, job_manager, audio_source, source_name: str, content_hash: str) -> bool:
+    """Zapisuje nagranie do pliku tymczasowego i zleca przetwarzanie w tle (wątek JobManagera)."""
+    suffix = f".{source_name.split('.')[-1]}" if "." in source_name else ".wav"
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file.write(audio_source.getvalue())
+        tmp_path = tmp_file.name
+
+    def remove_tmp():
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    try:
+        job = job_manager.submit(
+            source_name,
+            lambda report: service.process_meeting(
+                tmp_path, content_hash=content_hash, progress_callback=report, filename=source_name
+            ),
+            on_finish=remove_tmp
+        )
+    except QueueFullError as e:
+        remove_tmp()
+        st.error(f"Kolejka przetwarzania jest pełna: {e}")
+        return False
+    st.session_state.setdefault("jobs", {})[content_hash] = job.job_id
+    return True
+
+def store_result(content_hash: str, transcript):
+    """Wynik w sesji per hash nagrania - ponowne wgranie tego samego pliku nie uruchamia modeli."""
+    results = st.session_state.setdefault("results", {})
+    results[content_hash] = {
+        "view": TranscriptView(transcript),
+        # JSON do pobrania liczony raz, nie przy każdej interakcji
+        "json": transcript.model_dump_json(indent=2),
+    }
+    while len(results) > SESSION_RESULTS:
+        results.pop(next(iter(results)))
+
+@st.fragment(run_every=1.0)
+def show_progress(job_manager, content_hash: str):
+    """Pasek postępu odświeżany co sekundę - rerun tylko tego fragmentu, nie całej strony."""
+    jobs = st.session_state.get("jobs", {})
+    job = job_manager.get(jobs.get(content_hash, ""))
+    if job is None:
+        jobs.pop(content_hash, None)
+        st.warning("Zadanie przetwarzania wygasło - uruchom je ponownie.")
+        return
+
+    info = job.info
+    if info.status == JobState.COMPLETED:
+        store_result(content_hash, info.result)
+        jobs.pop(content_hash, None)
+        st.rerun()
+    elif info.status in (JobState.FAILED, JobState.CANCELLED):
+        jobs.pop(content_hash, None)
+        if info.status == JobState.FAILED:
+            st.error(f"Błąd podczas przetwarzania: {info.error}")
+        else:
+            st.info("Przetwarzanie anulowane.")
+    else:
+        label = STAGE_LABELS.get(info.stage, info.stage) if info.stage else "W kolejce"
+        st.progress(info.progress, text=f"{label}... ({info.progress:.0%})")
+        if st.button("Anuluj", key=f"cancel_{content_hash}"):
+            job_manager.cancel(job.job_id)
+
+def avatar_for(speaker: str) -> str:
+    # Różne awatary dla czytelności
+    if "SPEAKER_00" in speaker:
+        return "🤖"
+    if "SPEAKER_01" in speaker:
+        return "🗣️"
+    return "👤"
+
+@st.fragment
+def show_results(content_hash: str, source_name: str):
+    """
+    Widok wyników: filtr czasu, mówców i wyszukiwanie + stronicowanie.
+    Fragment - interakcja z filtrami przelicza tylko tę część strony, a renderowana jest tylko bieżąca strona.
+    """
+    result = st.session_state["results"][content_hash]
+    view: TranscriptView = result["view"]
+    transcript = view.transcript
+
+    st.divider()
+    st.success(f"Gotowe! Przetworzono: {transcript.total_duration:.2f}s, {len(view)} wypowiedzi")
+
+    duration = max(1, int(view.duration + 1))
+    col_query, col_speakers = st.columns([3, 2])
+    query = col_query.text_input("🔎 Szukaj w transkrypcie", key=f"query_{content_hash}")
+    speakers = col_speakers.multiselect("Mówcy", view.speaker_names, key=f"speakers_{content_hash}")
+    time_range = st.slider(
+        "Zakres czasu (s)", 0, duration, (0, duration), key=f"range_{content_hash}",
+        help="Wypowiedzi nachodzące na wybrany fragment nagrania"
+    )
+
+    indices = view.filter(time_range[0], time_range[1], query, speakers)
+    col_size, col_page = st.columns(2)
+    page_size = col_size.selectbox("Na stronie", PAGE_SIZES, index=1, key=f"size_{content_hash}")
+    pages = view.page_count(indices, page_size)
+    # Klucz zależny od filtrów - zmiana filtra wraca na 1. stronę (i nie wychodzi poza nowy zakres)
+    filters_key = hash((query, tuple(speakers), time_range, page_size))
+    page = col_page.number_input(f"Strona (z {pages})", 1, pages, 1, key=f"page_{content_hash}_{filters_key}")
+    st.caption(f"Pasujące wypowiedzi: {len(indices)} z {len(view)}")
+
+    # Wyświetlanie czatu - tylko bieżąca strona
+    with st.container():
+        for segment in view.page(indices, page, page_size):
+            with st.chat_message(name=segment.speaker, avatar=avatar_for(segment.speaker)):
+                st.markdown(f"**{segment.speaker}** _({format_clock(segment.start)})_")
+                st.write(segment.text)
+
+    # Pobieranie: JSON albo napisy SRT / WebVTT / tekst
+    col_format, col_download = st.columns([1, 3], vertical_alignment="bottom")
+    export_format = col_format.selectbox("Format", DOWNLOAD_FORMATS, key=f"format_{content_hash}")
+    col_download.download_button(
+        label=f"📥 Pobierz wynik ({export_format.upper()})",
+        data=export_data(result, export_format),
+        file_name=f"transcript_{source_name}.{export_format}",
+        mime="application/json" if export_format == "json" else MEDIA_TYPES[export_format]
+    )
+
+def export_data(result: dict, export_format: str) -> str:
+    """
+    Dokument do pobrania, liczony przy pierwszym wyborze formatu i trzymany w sesji.
+    Przycisk pobierania potrzebuje całej treści - składamy ją z kawałków writera jednym join.
+    """
+    if export_format not in result:
+        result[export_format] = "".join(iter_export(result["view"].transcript.segments, export_format))
+    return result[export_format]
+
 def main():
     load_dotenv()
     
@@ -39,12 +210,9 @@ def main():
     st.caption("Whisper (ASR) + Pyannote (Diarization) on Apple Silicon")
 
     # --- 1. INICJALIZACJA MODELI (CACHE) ---
-    @st.cache_resource
-    def get_meeting_service():
-        return MeetingService()
-
     try:
         service = get_meeting_service()
+        job_manager = get_job_manager()
         # Wyświetlamy status tylko w expanderze, żeby nie śmiecić
         with st.expander("Status Systemu", expanded=False):
             st.success("Silnik AI (Whisper + Pyannote) załadowany i gotowy.")
@@ -77,54 +245,20 @@ def main():
             st.audio(audio_source) # Odsłuch od razu po nagraniu
 
     # --- 3. LOGIKA PRZETWARZANIA ---
-    if audio_source is not None:
-        # Przycisk aktywuje się dopiero jak mamy źródło dźwięku
-        if st.button("🚀 Uruchom Transkrypcję", type="primary", use_container_width=True):
-            
-            with st.spinner("Przetwarzanie... (Whisper czyta, Pyannote słucha)"):
-                tmp_path = None
-                try:
-                    # Zapisujemy strumień bajtów do pliku tymczasowego na dysku
-                    suffix = f".{source_name.split('.')[-1]}" if "." in source_name else ".wav"
-                    
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                        tmp_file.write(audio_source.getvalue())
-                        tmp_path = tmp_file.name
-
-                    # --- CORE PROCESSING ---
-                    # Tu dzieje się magia backendu
-                    transcript = service.process_meeting(tmp_path)
-                    
-                    # --- WYNIKI ---
-                    st.divider()
-                    st.success(f"Gotowe! Przetworzono: {transcript.total_duration:.2f}s")
-
-                    # Wyświetlanie czatu
-                    chat_container = st.container()
-                    with chat_container:
-                        for segment in transcript.segments:
-                            # Różne awatary dla czytelności
-                            avatar = "🤖" if "SPEAKER_00" in segment.speaker else "👤"
-                            if "SPEAKER_01" in segment.speaker: avatar = "🗣️"
-                            
-                            with st.chat_message(name=segment.speaker, avatar=avatar):
-                                st.markdown(f"**{segment.speaker}** _({segment.start:.1f}s)_")
-                                st.write(segment.text)
-                    
-                    # Pobieranie JSON
-                    st.download_button(
-                        label="📥 Pobierz wynik (JSON)",
-                        data=transcript.model_dump_json(indent=2),
-                        file_name=f"transcript_{source_name}.json",
-                        mime="application/json"
-                    )
-
-                except Exception as e:
-                    st.error(f"Błąd podczas przetwarzania: {e}")
-                finally:
-                    # Sprzątanie po sobie
-                    if tmp_path and os.path.exists(tmp_path):
-                        os.remove(tmp_path)
+    if audio_source is None:
+        return
+
+    content_hash = upload_hash(audio_source)
+    if content_hash in st.session_state.get("results", {}):
+        # To samo nagranie już przetworzone w tej sesji - od razu wyniki
+        show_results(content_hash, source_name)
+    elif content_hash in st.session_state.get("jobs", {}):
+        # Przetwarzanie trwa w tle - strona pozostaje responsywna
+        show_progress(job_manager, content_hash)
+    # Przycisk aktywuje się dopiero jak mamy źródło dźwięku
+    elif st.button("🚀 Uruchom Transkrypcję", type="primary", use_container_width=True):
+        if start_processing(service, job_manager, audio_source, source_name, content_hash):
+            st.rerun()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
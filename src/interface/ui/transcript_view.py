@@ -0,0 +1,80 @@
+# File: src/interface/ui/transcript_view.py
+
+import math
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from src.domain.models.models import MeetingTranscript, TranscriptionSegment
+
+
+class TranscriptView:
+    """
+    Filtrowanie i stronicowanie długiego transkryptu dla UI (bez Streamlit - testowalne osobno).
+    Kolumny (czasy, mówcy, teksty małymi literami) budowane są raz na transkrypt; filtr zwraca
+    indeksy segmentów, a na stronę materializowane są tylko widoczne segmenty.
+    """
+
+    def __init__(self, transcript: MeetingTranscript):
+        self.transcript = transcript
+        segments = transcript.segments
+        self.starts = np.fromiter((s.start for s in segments), dtype=np.float64, count=len(segments))
+        self.ends = np.fromiter((s.end for s in segments), dtype=np.float64, count=len(segments))
+        self.speaker_names: List[str] = sorted({s.speaker for s in segments})
+        codes = {name: i for i, name in enumerate(self.speaker_names)}
+        self.speaker_codes = np.fromiter((codes[s.speaker] for s in segments), dtype=np.int32, count=len(segments))
+        # Wyszukiwanie bez rozróżniania wielkości liter - tablica NumPy (np.char.find w pętli C)
+        self._texts = np.array([s.text.lower() for s in segments], dtype=str) if segments else np.empty(0, dtype=str)
+        # Segmenty są w kolejności czasu - zakres czasu to wycinek z searchsorted
+        self._sorted = bool(np.all(np.diff(self.starts) >= 0)) if len(segments) > 1 else True
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def duration(self) -> float:
+        return float(self.ends.max()) if len(self.ends) else 0.0
+
+    def filter(self, start: float = 0.0, end: Optional[float] = None, query: str = "",
+               speakers: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Indeksy segmentów nachodzących na zakres [start, end], zawierających frazę i od wybranych mówców.
+        :param speakers: Lista mówców (None lub pusta = wszyscy).
+        """
+        if self._sorted:
+            # Segment nachodzi na zakres, gdy zaczyna się przed jego końcem i kończy po początku
+            hi = len(self.starts) if end is None else int(np.searchsorted(self.starts, end, side="right"))
+            indices = np.arange(hi)
+            indices = indices[self.ends[:hi] >= start]
+        else:
+            mask = self.ends >= start
+            if end is not None:
+                mask &= self.starts <= end
+            indices = np.flatnonzero(mask)
+
+        if speakers:
+            codes = [self.speaker_names.index(name) for name in speakers if name in self.speaker_names]
+            indices = indices[np.isin(self.speaker_codes[indices], codes)]
+        query = query.strip().lower()
+        if query and len(indices):
+            indices = indices[np.char.find(self._texts[indices], query) >= 0]
+        return indices
+
+    @staticmethod
+    def page_count(indices: np.ndarray, page_size: int) -> int:
+        return max(1, math.ceil(len(indices) / page_size))
+
+    def page(self, indices: np.ndarray, page: int, page_size: int) -> List[TranscriptionSegment]:
+        """Segmenty strony (numeracja od 1; numer spoza zakresu przycinany)."""
+        page = min(max(1, page), self.page_count(indices, page_size))
+        visible = indices[(page - 1) * page_size:page * page_size]
+        segments = self.transcript.segments
+        return [segments[i] for i in visible.tolist()]
+
+
+def format_clock(seconds: float) -> str:
+    """Czas jako G:MM:SS (lub MM:SS dla krótszych niż godzina)."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
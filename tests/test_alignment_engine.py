@@ -0,0 +1,88 @@
+# File: tests/test_alignment_engine.py
+import sys
+import os
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.alignment_engine import IntervalAlignmentEngine, SpeakerTimeline, UNKNOWN_CODE
+from src.core.alignment_service import AlignmentService
+
+
+def brute_force(word_starts, word_ends, timeline, tolerance):
+    """Pełny przegląd: segment o największym pokryciu (remis - wcześniejszy), poza tolerancją UNKNOWN."""
+    codes = []
+    for ws, we in zip(word_starts, word_ends):
+        overlap = np.minimum(we, timeline.ends) - np.maximum(ws, timeline.starts)
+        best = int(np.argmax(overlap))
+        codes.append(int(timeline.codes[best]) if overlap[best] >= -tolerance else UNKNOWN_CODE)
+    return codes
+
+
+def run_test():
+    print("--- [TEST] Wektorowy alignment (bez modeli AI) ---")
+
+    # Nakładające się tury: SPEAKER_01 wchodzi w słowo SPEAKER_00
+    segments = [
+        {"start": 0.0, "end": 5.0, "speaker": "SPEAKER_00"},
+        {"start": 4.0, "end": 9.0, "speaker": "SPEAKER_01"},
+        {"start": 20.0, "end": 25.0, "speaker": "SPEAKER_00"},
+    ]
+    timeline = SpeakerTimeline.from_segments(segments)
+    engine = IntervalAlignmentEngine(tolerance=0.75)
+
+    word_starts = np.array([1.0, 4.2, 4.8, 9.5, 15.0, 19.5])
+    word_ends = np.array([1.5, 4.9, 6.0, 9.8, 15.5, 20.1])
+    codes = engine.assign(word_starts, word_ends, timeline)
+    labels = [timeline.speakers[c] if c != UNKNOWN_CODE else "UNKNOWN" for c in codes]
+
+    expected = ["SPEAKER_00", "SPEAKER_00", "SPEAKER_01", "SPEAKER_01", "UNKNOWN", "SPEAKER_00"]
+    assert labels == expected, f"Oczekiwano {expected}, otrzymano {labels}"
+    print(f"   Przypisania: {labels}")
+
+    # Adapter słownikowy + grupowanie
+    transcription = {"segments": [{"words": [
+        {"word": " Dzień", "start": 0.5, "end": 0.9},
+        {"word": " dobry", "start": 1.0, "end": 1.4},
+        {"word": " Cześć", "start": 6.0, "end": 6.5},
+    ]}]}
+    result = AlignmentService().align(transcription, segments)
+    assert [r['speaker'] for r in result] == ["SPEAKER_00", "SPEAKER_01"]
+    assert result[0]['text'] == "Dzień dobry"
+
+    # Jedna długa tura nad wieloma krótkimi: pamięć kandydatów nie rośnie jak słowa x segmenty
+    num_words = 100000
+    total = num_words * 0.4
+    long_segments = [{"start": 0.0, "end": total, "speaker": "TLO"}] + [
+        {"start": float(s), "end": float(s) + 2.5, "speaker": f"SPEAKER_0{i % 3}"}
+        for i, s in enumerate(np.linspace(0, total, 5000, endpoint=False))
+    ]
+    timeline = SpeakerTimeline.from_segments(long_segments)
+    word_starts = np.arange(num_words) * 0.4 + 0.05
+    word_ends = word_starts + 0.3
+    tracemalloc.start()
+    codes = engine.assign(word_starts, word_ends, timeline)
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    tracemalloc.stop()
+    print(f"   Długa tura + 5000 krótkich, {num_words} słów: szczyt pamięci {peak_mb:.0f} MB")
+    assert peak_mb < 200
+    sample = np.random.default_rng(0).choice(num_words, 500, replace=False)
+    assert codes[sample].tolist() == brute_force(word_starts[sample], word_ends[sample], timeline, 0.75)
+
+    # Losowe nakładające się tury różnej długości - zgodność z pełnym przeglądem
+    rng = np.random.default_rng(1)
+    starts = rng.uniform(0, 300, 400)
+    random_segments = [{"start": float(s), "end": float(s + rng.exponential(rng.choice([0.3, 5.0, 60.0]))),
+                        "speaker": f"SPEAKER_0{rng.integers(4)}"} for s in starts]
+    timeline = SpeakerTimeline.from_segments(random_segments)
+    word_starts = np.sort(rng.uniform(0, 300, 3000))
+    word_ends = word_starts + rng.uniform(0.05, 1.0, 3000)
+    codes = IntervalAlignmentEngine(tolerance=0.75, chunk_size=500).assign(word_starts, word_ends, timeline)
+    assert codes.tolist() == brute_force(word_starts, word_ends, timeline, 0.75)
+    print("✅ SUKCES: Alignment działa.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,116 @@
+# File: tests/test_asr_batching.py
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.asr_backends import FakeASRBackend
+from src.infrastructure.asr_batching import ASRBatcher
+from src.infrastructure.audio_loader import AudioBuffer
+from src.infrastructure.metrics import REGISTRY
+
+NUM_REQUESTS = 32
+CALL_OVERHEAD = 0.02  # stały koszt jednego wywołania modelu (jak uruchomienie kerneli na GPU)
+
+
+class BatchingBackend(FakeASRBackend):
+    """Backend 'fake' z kosztem wywołania niezależnym od rozmiaru partii; zapamiętuje rozmiary partii."""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio):
+        return self.transcribe_batch([audio])[0]
+
+    def transcribe_batch(self, audios):
+        with self._lock:  # jedno urządzenie - wywołania jedno po drugim
+            self.batch_sizes.append(len(audios))
+            time.sleep(CALL_OVERHEAD)
+            if any(len(audio) == 0 for audio in audios):
+                raise ValueError("Puste okno audio")
+            return [FakeASRBackend.transcribe(self, audio) for audio in audios]
+
+
+def voice_note(index: int) -> np.ndarray:
+    """Krótka notatka głosowa: 'mowa' przez index + 1 słów, potem cisza."""
+    samples = np.zeros(16000 * 4, dtype=np.float32)
+    samples[:int(16000 * 0.4 * (index % 8 + 1))] = 0.5
+    return samples
+
+
+def run_test():
+    print("--- [TEST] Łączenie okien ASR z równoczesnych żądań w partie ---")
+    reference = FakeASRBackend()
+    notes = [voice_note(i) for i in range(NUM_REQUESTS)]
+
+    # 1. Bez łączenia: każde żądanie to osobne wywołanie modelu
+    backend = BatchingBackend()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(NUM_REQUESTS) as pool:
+        list(pool.map(backend.transcribe, notes))
+    single_seconds = time.perf_counter() - start
+
+    # 2. Z łączeniem: wyniki wracają do właściwych wywołujących
+    backend = BatchingBackend()
+    batcher = ASRBatcher(backend, max_batch_size=8, max_wait_ms=20)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(NUM_REQUESTS) as pool:
+        results = list(pool.map(batcher.transcribe, notes))
+    batched_seconds = time.perf_counter() - start
+    print(f"   {NUM_REQUESTS} żądań: pojedynczo {single_seconds:.2f}s, w partiach {batched_seconds:.2f}s "
+          f"(partie: {backend.batch_sizes})")
+    assert all(result == reference.transcribe(note) for result, note in zip(results, notes))
+    assert max(backend.batch_sizes) == 8 and len(backend.batch_sizes) <= NUM_REQUESTS // 4
+    assert batched_seconds * 2 < single_seconds
+
+    # 3. Pojedyncze żądanie czeka najwyżej max_wait_ms na dopełnienie partii
+    start = time.perf_counter()
+    batcher.transcribe(notes[0])
+    assert time.perf_counter() - start < CALL_OVERHEAD + 0.02 + 0.05 and backend.batch_sizes[-1] == 1
+
+    # 4. Błędne okno psuje tylko swoje żądanie (partia powtarzana pojedynczo)
+    def safe_transcribe(audio):
+        try:
+            return batcher.transcribe(audio)
+        except ValueError as e:
+            return e
+    with ThreadPoolExecutor(4) as pool:
+        mixed = list(pool.map(safe_transcribe, [notes[1], np.zeros(0, dtype=np.float32), notes[2], notes[3]]))
+    assert isinstance(mixed[1], ValueError) and mixed[0] == reference.transcribe(notes[1])
+    assert mixed[2] == reference.transcribe(notes[2]) and mixed[3] == reference.transcribe(notes[3])
+
+    metrics = REGISTRY.render()
+    assert "coretranscript_asr_batch_size_count" in metrics and "coretranscript_asr_batch_fill_ratio_bucket" in metrics
+    assert 'queue="asr_batch"' in metrics
+    batcher.close()
+
+    # 5. Fragmenty długiego nagrania (asr_workers) też trafiają do wspólnych partii
+    samples = np.tile(np.concatenate([np.full(16000 * 3, 0.5), np.zeros(16000 * 2)]), 12).astype(np.float32)
+    backend = BatchingBackend()
+    batcher = ASRBatcher(backend, max_batch_size=4, max_wait_ms=20)
+    batched_engine = AIEngine(asr_backend="fake", asr_chunk_seconds=10, asr_workers=4, asr_batcher=batcher)
+    plain_engine = AIEngine(asr_backend="fake", asr_chunk_seconds=10, asr_workers=4)
+    with AudioBuffer(samples) as audio:
+        batched = batched_engine.transcribe(audio)
+        plain = plain_engine.transcribe(audio)
+    assert batched == plain and batched_engine.asr is backend and max(backend.batch_sizes) > 1
+    batcher.close()
+    try:
+        batcher.transcribe(notes[0])
+        raise AssertionError("Oczekiwano błędu po zamknięciu")
+    except RuntimeError:
+        pass
+
+    print("✅ SUKCES: Partie ASR działają.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,66 @@
+# File: tests/test_audio_buffer.py
+import sys
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.infrastructure.audio_loader import AudioBuffer, SAMPLE_RATE
+
+
+def _checksum(audio: AudioBuffer):
+    """Wywoływane w procesie roboczym - próbki czytane z tego samego pliku."""
+    return audio.is_memmap, isinstance(audio.samples, np.memmap), float(audio.samples.sum(dtype=np.float64))
+
+
+def run_test():
+    print("--- [TEST] AudioBuffer: memmap surowego float32 i serializacja samej ścieżki ---")
+
+    rng = np.random.default_rng(0)
+    samples = rng.standard_normal(SAMPLE_RATE * 60).astype(np.float32)  # minuta audio = 3.84 MB
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "meeting.f32")
+        samples.tofile(path)
+
+        # 1. Surowy plik float32 jest mapowany w pamięć, nie wczytywany
+        audio = AudioBuffer.from_file(path, name="meeting.wav", owns_backing_file=True)
+        assert audio.is_memmap and isinstance(audio.samples, np.memmap) and audio.backing_path == path
+        assert audio.samples.dtype == np.float32 and audio.duration == 60.0
+        assert np.array_equal(audio.samples, samples)
+
+        # 2. Pickle zawiera tylko ścieżkę: bez próbek i bez prawa do usunięcia pliku
+        state = audio.__getstate__()
+        assert state["samples"] is None and state["backing_path"] == path and not state["_owns_backing_file"]
+        data = pickle.dumps(audio)
+        print(f"   Pickle: {len(data)} B (próbki: {samples.nbytes} B)")
+        assert len(data) < 1024
+
+        copy = pickle.loads(data)
+        assert copy.is_memmap and isinstance(copy.samples, np.memmap) and copy.name == "meeting.wav"
+        assert np.array_equal(copy.samples, samples)
+        copy.close()
+        assert os.path.exists(path)  # kopia nie usuwa pliku właściciela
+
+        # 3. Proces roboczy (jak w executor='process') mapuje ten sam plik
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            is_memmap, mapped, total = executor.submit(_checksum, audio).result()
+        assert is_memmap and mapped and np.isclose(total, samples.sum(dtype=np.float64))
+
+        # 4. Bufor w pamięci serializuje próbki
+        small = AudioBuffer(samples[:SAMPLE_RATE], name="clip")
+        restored = pickle.loads(pickle.dumps(small))
+        assert not restored.is_memmap and np.array_equal(restored.samples, small.samples)
+
+        audio.close()
+        assert not os.path.exists(path)
+
+    print("✅ SUKCES: AudioBuffer mapuje plik i przekazuje do procesów tylko ścieżkę.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,79 @@
+# File: tests/test_batch_cli.py
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.interface.cli.batch import plan, summarize, write_atomic
+
+
+def run_test():
+    print("--- [TEST] CLI wsadowe (planowanie, wznawianie, raport) ---")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive = os.path.join(tmp_dir, "archive")
+        output = os.path.join(tmp_dir, "out")
+        for name in ("2024/a.wav", "2024/b.mp3", "c.m4a", "notes.txt"):
+            path = os.path.join(archive, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "wb").close()
+
+        todo, skipped = plan(archive, output)
+        assert skipped == 0 and len(todo) == 3  # notes.txt to nie audio
+        assert todo[0][1] == os.path.join(output, "2024", "a.json")
+
+        # Gotowy wynik -> plik pomijany przy wznowieniu (chyba że --overwrite)
+        write_atomic(todo[0][1], "{}")
+        todo, skipped = plan(archive, output)
+        assert skipped == 1 and len(todo) == 2
+        assert len(plan(archive, output, overwrite=True)[0]) == 3
+        assert not [n for n in os.listdir(os.path.join(output, "2024")) if n.endswith(".tmp")]
+
+        # Manifest: ścieżki względne od katalogu manifestu, komentarze pomijane
+        manifest = os.path.join(archive, "manifest.txt")
+        with open(manifest, "w") as f:
+            f.write("# lista\n2024/b.mp3\nc.m4a\n\n")
+        todo, _ = plan(manifest, output)
+        assert [t for _, t in todo] == [os.path.join(output, "2024", "b.json"), os.path.join(output, "c.json")]
+
+        # Dwa nagrania -> jeden plik wyniku: błąd przed przetwarzaniem zamiast cichego nadpisania
+        open(os.path.join(archive, "2024", "a.mp3"), "wb").close()
+        try:
+            plan(archive, output)
+            raise AssertionError("Oczekiwano błędu kolizji")
+        except ValueError as e:
+            assert "a.wav" in str(e) and "a.mp3" in str(e)
+        os.remove(os.path.join(archive, "2024", "a.mp3"))
+        outside = [os.path.join(tmp_dir, folder, "rec.wav") for folder in ("x", "y")]
+        for path in outside:
+            os.makedirs(os.path.dirname(path))
+            open(path, "wb").close()
+        with open(manifest, "w") as f:
+            f.write("\n".join(outside) + "\n")
+        try:
+            plan(manifest, output)
+            raise AssertionError("Oczekiwano błędu kolizji")
+        except ValueError as e:
+            assert "rec.json" in str(e)
+        with open(manifest, "w") as f:
+            f.write(outside[0] + "\n")
+        assert plan(manifest, output)[0] == [(outside[0], os.path.join(output, "rec.json"))]
+
+    results = [
+        {"source": "a", "ok": True, "seconds": 10, "audio_seconds": 1800, "timings": {"asr": 6, "total": 9}},
+        {"source": "b", "ok": True, "seconds": 10, "audio_seconds": 1800, "timings": {"asr": 4, "total": 7}},
+        {"source": "c", "ok": False, "seconds": 1, "error": "uszkodzony plik"},
+    ]
+    summary = summarize(results, skipped=5, wall_seconds=60)
+    print(f"   Raport: {summary['files_per_hour']:.0f} plików/h, {summary['audio_hours_per_hour']:.0f} h audio/h")
+    assert summary["processed"] == 2 and summary["failed"] == 1 and summary["skipped"] == 5
+    assert summary["files_per_hour"] == 120 and summary["audio_hours_per_hour"] == 60
+    assert summary["stage_seconds_mean"]["asr"] == 5
+    assert summary["errors"] == {"c": "uszkodzony plik"}
+
+    print("✅ SUKCES: CLI wsadowe działa.")
+
+
+if __name__ == "__main__":
+    run_test()
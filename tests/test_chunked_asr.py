@@ -0,0 +1,54 @@
+# File: tests/test_chunked_asr.py
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.infrastructure.audio_loader import AudioBuffer, SAMPLE_RATE
+from src.infrastructure.chunked_asr import ChunkedTranscriber, plan_chunks
+
+
+def fake_whisper(samples: np.ndarray) -> dict:
+    """Udaje Whispera: każdy 'wybuch' sygnału to jedno słowo (czasy względem początku okna)."""
+    frame = SAMPLE_RATE // 100
+    active = np.abs(samples[:len(samples) // frame * frame]).reshape(-1, frame).max(axis=1) > 0.1
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], active.astype(int), [0]])))
+    words = [
+        {"word": f" w{int(s)}", "start": s / 100, "end": e / 100, "probability": 1.0}
+        for s, e in zip(edges[::2], edges[1::2])
+    ]
+    return {"text": "".join(w['word'] for w in words), "segments": [{"id": 0, "words": words}], "language": "pl"}
+
+
+def run_test():
+    print("--- [TEST] ASR fragmentami (fałszywy Whisper) ---")
+
+    # 10 minut: słowo 0.3s co 0.5s, w środku krótkie pauzy
+    duration = 600
+    samples = np.zeros(duration * SAMPLE_RATE, dtype=np.float32)
+    starts = np.arange(0, duration - 1, 0.5)
+    for t in starts:
+        samples[int(t * SAMPLE_RATE):int((t + 0.3) * SAMPLE_RATE)] = 0.5
+
+    audio = AudioBuffer(samples, name="synthetic.wav")
+    chunks = plan_chunks(audio.samples, audio.sample_rate, chunk_seconds=60)
+    print(f"   Fragmentów: {len(chunks)}")
+
+    progress = []
+    transcriber = ChunkedTranscriber(fake_whisper, max_workers=3, chunk_seconds=60, overlap_seconds=1.0)
+    result = transcriber.transcribe(audio, progress_callback=progress.append)
+
+    words = [w for seg in result['segments'] for w in seg['words']]
+    word_starts = np.array([w['start'] for w in words])
+    assert len(words) == len(starts), f"Oczekiwano {len(starts)} słów, otrzymano {len(words)}"
+    assert np.all(np.diff(word_starts) > 0), "Słowa nie są posortowane / są zduplikowane"
+    assert np.allclose(word_starts, starts, atol=0.011)
+    assert progress[-1] == 1.0
+    print(f"   Słów: {len(words)}, segmentów: {len(result['segments'])}")
+    print("✅ SUKCES: Sklejanie fragmentów działa.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,81 @@
+# File: tests/test_columnar_transcript.py
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.alignment_service import AlignmentService
+from src.domain.models.columnar import ColumnarTranscript
+
+
+def make_data(num_words: int = 2000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    starts = np.cumsum(rng.uniform(0.2, 0.6, num_words))
+    # Czasy z dokładnością Whispera (0.01 s) - JSON zapisuje milisekundy
+    words = [{"word": f" słowo{i}", "start": round(float(s), 2), "end": round(float(s) + 0.15, 2)}
+             for i, s in enumerate(starts)]
+    transcription = {"segments": [{"words": words[i:i + 20]} for i in range(0, num_words, 20)]}
+    turns, t = [], 0.0
+    while t < starts[-1]:
+        length = float(rng.uniform(2, 15))
+        turns.append({"start": t, "end": t + length, "speaker": f"SPEAKER_{int(rng.integers(0, 3)):02d}"})
+        t += length + (3.0 if rng.random() < 0.1 else 0.0)  # czasem przerwa -> słowa UNKNOWN
+    return transcription, turns
+
+
+def run_test():
+    print("--- [TEST] Transkrypt kolumnowy (widoki + eksport) ---")
+
+    transcription, turns = make_data()
+    service = AlignmentService()
+    expected = service.align(transcription, turns)
+    columnar = service.align_columnar(transcription, turns, "meeting.wav")
+    print(f"   Słowa: {columnar.num_words}, wypowiedzi: {len(columnar.segments)}, mówcy: {columnar.speakers}")
+
+    # Te same wypowiedzi co dotychczasowa ścieżka słownikowa
+    assert list(columnar.iter_segments()) == expected
+    model = columnar.to_meeting_transcript()
+    assert [s.model_dump() for s in model.segments] == expected
+
+    # Leniwe widoki
+    last = columnar.segments[-1]
+    assert last.text == expected[-1]["text"] and last.speaker == expected[-1]["speaker"]
+    assert " ".join(w["word"] for w in last.words()) == last.text
+    assert columnar.word(0) == {"word": "słowo0", "start": columnar.word_starts[0], "end": columnar.word_ends[0],
+                                "speaker": expected[0]["speaker"]}
+
+    def same(other: ColumnarTranscript):
+        assert other.filename == columnar.filename and other.speakers == columnar.speakers
+        assert list(other.iter_segments()) == expected
+        assert np.array_equal(other.word_starts, columnar.word_starts)
+
+    same(ColumnarTranscript.from_json(columnar.to_json()))
+    for name, roundtrip in (
+        ("msgpack", lambda: ColumnarTranscript.from_msgpack(columnar.to_msgpack())),
+        ("pyarrow", lambda: ColumnarTranscript.from_arrow(columnar.to_arrow())),
+    ):
+        try:
+            same(roundtrip())
+        except ImportError:
+            print(f"   (pominięto eksport {name} - brak pakietu)")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "meeting.parquet")
+            columnar.to_parquet(path)
+            same(ColumnarTranscript.from_parquet(path))
+    except ImportError:
+        print("   (pominięto eksport parquet - brak pakietu)")
+
+    empty = service.align_columnar({"segments": []}, turns, "empty.wav")
+    assert len(empty.segments) == 0 and empty.to_meeting_transcript().segments == []
+    assert ColumnarTranscript.from_json(empty.to_json()).num_words == 0
+
+    print("✅ SUKCES: Transkrypt kolumnowy działa.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,94 @@
+# File: tests/test_execution_modes.py
+import sys
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.meeting_service import MeetingService
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.audio_loader import AudioBuffer
+
+STAGE_SECONDS = 0.3
+
+
+class SlowEngine(AIEngine):
+    """Backend ASR 'fake' + stała diaryzacja; oba etapy trwają STAGE_SECONDS i notują, ile działa naraz."""
+
+    def __init__(self, shared_device: bool = False):
+        super().__init__(asr_backend="fake")
+        self.shared_device = shared_device
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def stages_share_device(self) -> bool:
+        return self.shared_device
+
+    def transcribe(self, audio, progress_callback=None):
+        with self._stage():
+            return super().transcribe(audio, progress_callback)
+
+    def diarize(self, audio, speaker_hints=None):
+        with self._stage():
+            half = audio.duration / 2
+            return [{"start": 0.0, "end": half, "speaker": "SPEAKER_00"},
+                    {"start": half, "end": audio.duration, "speaker": "SPEAKER_01"}]
+
+    @contextmanager
+    def _stage(self):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(STAGE_SECONDS)
+            yield
+        finally:
+            with self._lock:
+                self.running -= 1
+
+def run_test():
+    print("--- [TEST] Tryby wykonania: równoległy / sekwencyjny / auto ---")
+
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(16000 * 10) * 0.1).astype(np.float32)
+
+    results = {}
+    cases = [("parallel", False, 2), ("sequential", False, 1), ("auto", False, 2), ("auto", True, 1)]
+    for mode, shared_device, expected_concurrency in cases:
+        engine = SlowEngine(shared_device)
+        service = MeetingService(ai_engine=engine, execution_mode=mode)
+        with AudioBuffer(samples, name="meeting.wav") as audio:
+            transcript = service.process_audio(audio, "meeting.wav", keep_artifacts=False)
+        service.close()
+        name = f"{mode}{' (wspólne urządzenie)' if shared_device else ''}"
+        print(f"   {name}: inferencja {transcript.timings['inference_wall']:.2f}s, naraz {engine.max_running}")
+
+        # Równolegle oba etapy działają jednocześnie - wspólny czas bliski jednemu etapowi, nie sumie
+        assert engine.max_running == expected_concurrency
+        wall = transcript.timings["inference_wall"]
+        assert (wall < 1.8 * STAGE_SECONDS) if expected_concurrency == 2 else (wall >= 2 * STAGE_SECONDS)
+
+        # Czasy etapów wypełnione w transkrypcie i w last_timings
+        for stage in ("asr", "diarization", "inference_wall", "alignment", "mapping", "total"):
+            assert stage in transcript.timings and stage in service.last_timings, f"{name}: brak etapu {stage}"
+        assert transcript.timings["asr"] >= STAGE_SECONDS and transcript.timings["diarization"] >= STAGE_SECONDS
+        assert transcript.timings["total"] >= wall
+
+        results[name] = transcript.model_dump(exclude={"timings", "processed_at"})
+
+    # Tryb nie zmienia wyniku
+    reference = results["sequential"]
+    assert reference["segments"] and {s["speaker"] for s in reference["segments"]} == {"SPEAKER_00", "SPEAKER_01"}
+    for name, result in results.items():
+        assert result == reference, f"{name}: inny wynik niż w trybie sekwencyjnym"
+
+    print("✅ SUKCES: Tryby wykonania dają ten sam wynik i pełne czasy etapów.")
+
+
+if __name__ == "__main__":
+    run_test()
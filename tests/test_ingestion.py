@@ -0,0 +1,49 @@
+# File: tests/test_ingestion.py
+import sys
+import os
+import asyncio
+import hashlib
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.interface.api.ingestion import ingest_stream, UploadTooLargeError
+from src.infrastructure.audio_loader import AudioBuffer
+
+
+async def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def run_checks():
+    # PCM int16 w blokach o nieparzystej długości (próbki przecięte na granicy bloku)
+    pcm = (np.sin(np.linspace(0, 100, 48000)) * 20000).astype("<i2")
+    body = pcm.tobytes()
+    upload = await ingest_stream(chunked(body, 1001), "live.pcm", max_bytes=10 ** 7, input_format="pcm_s16le")
+    try:
+        assert upload.content_hash == hashlib.sha256(body).hexdigest()
+        with AudioBuffer.from_file(upload.path) as audio:
+            assert len(audio.samples) == len(pcm)
+            assert np.allclose(audio.samples, pcm / 32768.0)
+        print(f"   PCM: {upload.size} B -> {len(pcm)} próbek float32, hash OK")
+    finally:
+        upload.remove()
+
+    # Limit rozmiaru
+    try:
+        await ingest_stream(chunked(body, 4096), "big.wav", max_bytes=1000)
+        raise AssertionError("Oczekiwano UploadTooLargeError")
+    except UploadTooLargeError as e:
+        print(f"   Limit: {e}")
+
+
+def run_test():
+    print("--- [TEST] Strumieniowe przyjmowanie uploadu ---")
+    asyncio.run(run_checks())
+    print("✅ SUKCES: Ingestion działa.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,65 @@
+# File: tests/test_job_manager.py
+import sys
+import os
+import time
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.job_manager import JobManager, QueueFullError
+from src.domain.models.models import JobState
+
+
+def wait_for(job, states, timeout=5.0):
+    deadline = time.time() + timeout
+    while job.info.status not in states and time.time() < deadline:
+        time.sleep(0.01)
+    return job.info.status
+
+
+def run_test():
+    print("--- [TEST] Kolejka zadań (bez modeli AI) ---")
+
+    release = threading.Event()
+    cleaned = []
+
+    def slow_work(report):
+        for i in range(100):
+            report("asr", i / 100)
+            if release.wait(0.01):
+                break
+        return "wynik"
+
+    manager = JobManager(max_workers=1, max_queue=1)
+
+    running = manager.submit("a.wav", slow_work, on_finish=lambda: cleaned.append("a"))
+    assert wait_for(running, {JobState.RUNNING}) == JobState.RUNNING
+    queued = manager.submit("b.wav", slow_work, on_finish=lambda: cleaned.append("b"))
+
+    # Kolejka pełna -> backpressure
+    try:
+        manager.submit("c.wav", slow_work)
+        raise AssertionError("Oczekiwano QueueFullError")
+    except QueueFullError as e:
+        print(f"   Backpressure: {e}")
+
+    # Anulowanie zadania oczekującego i uruchomionego
+    manager.cancel(queued.job_id)
+    assert queued.info.status == JobState.CANCELLED
+    manager.cancel(running.job_id)
+    assert wait_for(running, {JobState.CANCELLED}) == JobState.CANCELLED
+
+    # Zwykłe zakończenie
+    release.set()
+    done = manager.submit("d.wav", slow_work)
+    assert wait_for(done, {JobState.COMPLETED}) == JobState.COMPLETED
+    assert done.info.result == "wynik" and done.info.progress == 1.0
+    assert sorted(cleaned) == ["a", "b"]
+
+    print(f"   Statystyki: {manager.stats()}")
+    manager.shutdown()
+    print("✅ SUKCES: Kolejka zadań działa.")
+
+
+if __name__ == "__main__":
+    run_test()
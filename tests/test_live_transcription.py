@@ -0,0 +1,72 @@
+# File: tests/test_live_transcription.py
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.live_transcription import LiveTranscriptionSession, PCMFrameDecoder
+from src.infrastructure.audio_loader import SAMPLE_RATE
+
+
+class FakeEngine:
+    """Silnik bez modeli: słowo co 0.5 s okna, dwóch mówców na zmianę co 10 s."""
+
+    def transcribe(self, audio):
+        duration = len(audio.samples) / SAMPLE_RATE
+        words = [{"word": f" w{i}", "start": t, "end": t + 0.4} for i, t in enumerate(np.arange(0.0, duration - 0.4, 0.5))]
+        return {"segments": [{"words": words}]}
+
+    def diarize(self, audio):
+        duration = len(audio.samples) / SAMPLE_RATE
+        return [{"start": float(t), "end": float(min(t + 10.0, duration)), "speaker": f"S{int(t // 10) % 2}"}
+                for t in np.arange(0.0, duration, 10.0)]
+
+
+def run_test():
+    print("--- [TEST] Transkrypcja na żywo (ramki PCM + stała pamięć sesji) ---")
+
+    # 1. Ramki nie na granicy próbki: niepełna próbka przechodzi do kolejnej ramki
+    samples = (np.random.default_rng(0).standard_normal(10000) * 3000).astype("<i2")
+    data = samples.tobytes()
+    decoder = PCMFrameDecoder("pcm_s16le")
+    decoded = np.concatenate([decoder.decode(data[i:i + 1001]) for i in range(0, len(data), 1001)])
+    assert decoded.dtype == np.float32 and np.array_equal(decoded, samples.astype(np.float32) / 32768.0)
+    floats = np.linspace(-1, 1, 999, dtype="<f4")
+    decoder = PCMFrameDecoder("pcm_f32le")
+    chunks = [decoder.decode(floats.tobytes()[i:i + 7]) for i in range(0, floats.nbytes, 7)]
+    assert np.array_equal(np.concatenate(chunks), floats)
+    try:
+        PCMFrameDecoder("mp3")
+        raise AssertionError("Oczekiwano błędu")
+    except ValueError:
+        pass
+
+    # 2. Długi strumień: bufory słów i segmentów nie rosną ponad okno diaryzacji
+    session = LiveTranscriptionSession(FakeEngine(), step_seconds=1.0, window_seconds=5.0,
+                                       diarize_every_seconds=5.0, diarization_window_seconds=30.0)
+    second = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    finals, updates, kept = [], [], []
+    for _ in range(600):
+        session.append_audio(second)
+        events = session.step()
+        finals += [e for e in events if e["type"] == "final"]
+        updates += [e for e in events if e["type"] == "speaker_update"]
+        kept.append(len(session._segments))
+    events = session.finish()
+    finals += [e for e in events if e["type"] == "final"]
+    metrics = events[-1]
+    print(f"   Segmenty: {len(finals)}, w pamięci maks. {max(kept)}, aktualizacji mówców: {len(updates)}")
+    assert [e["segment_id"] for e in finals] == list(range(len(finals))) and metrics["segments"] == len(finals)
+    assert len(finals) > 100 and max(kept) < 40
+    assert len(session._words) < 100 and len(session._audio) <= 31 * SAMPLE_RATE
+    # Aktualizacje mówców trafiają także w segmenty z końca strumienia (po przycięciu listy)
+    assert max(e["segment_id"] for e in updates) >= len(finals) - 5
+    assert {e["speaker"] for e in updates} == {"SPEAKER_00", "SPEAKER_01"}
+
+    print("✅ SUKCES: Sesja na żywo działa w stałej pamięci.")
+
+
+if __name__ == "__main__":
+    run_test()
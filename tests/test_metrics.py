@@ -0,0 +1,86 @@
+# File: tests/test_metrics.py
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from src.core.meeting_service import MeetingService
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.audio_loader import AudioBuffer
+from src.infrastructure.metrics import REGISTRY, MetricsRegistry, span
+from src.infrastructure.vad import EnergyVAD
+
+# Metryki ruchu produkcyjnego - klip rozgrzewający nie może ich zmieniać
+TRAFFIC_METRICS = ("coretranscript_stage_seconds", "coretranscript_stage_rss_delta_bytes",
+                   "coretranscript_real_time_factor", "coretranscript_meetings_total",
+                   "coretranscript_audio_seconds_total", "coretranscript_vad_")
+
+
+class OneSpeakerEngine(AIEngine):
+    """Backend ASR 'fake' + diaryzacja: jeden mówca przez całe nagranie."""
+
+    def __init__(self):
+        super().__init__(asr_backend="fake")
+
+    def diarize(self, audio, speaker_hints=None):
+        return [{"start": 0.0, "end": audio.duration, "speaker": "SPEAKER_00"}]
+
+
+def traffic_metrics() -> list:
+    return [line for line in REGISTRY.render().splitlines() if line.startswith(TRAFFIC_METRICS)]
+
+
+def run_test():
+    print("--- [TEST] Metryki (format Prometheusa + pomiary etapów) ---")
+
+    registry = MetricsRegistry()
+    stage = registry.histogram("test_stage_seconds", "Czas etapu", ["stage"], buckets=(0.1, 1.0))
+    meetings = registry.counter("test_meetings_total", "Spotkania", ["source"])
+
+    for value in (0.05, 0.5, 5.0):
+        stage.observe(value, stage="asr")
+    meetings.inc(source="cache")
+    meetings.inc(2, source="cache")
+
+    text = registry.render()
+    print(text)
+    assert '# TYPE test_stage_seconds histogram' in text
+    # Kubełki są skumulowane, +Inf obejmuje wszystko
+    assert 'test_stage_seconds_bucket{stage="asr",le="0.1"} 1' in text
+    assert 'test_stage_seconds_bucket{stage="asr",le="1"} 2' in text
+    assert 'test_stage_seconds_bucket{stage="asr",le="+Inf"} 3' in text
+    assert 'test_stage_seconds_count{stage="asr"} 3' in text
+    assert 'test_meetings_total{source="cache"} 3' in text
+
+    # Ta sama nazwa zwraca istniejącą metrykę
+    assert registry.counter("test_meetings_total", "Spotkania", ["source"]) is meetings
+    try:
+        stage.observe(1.0, model="x")
+        raise AssertionError("Złe etykiety powinny rzucić ValueError")
+    except ValueError:
+        pass
+
+    timings, memory = {}, {}
+    with span("alignment", timings, memory):
+        data = [0] * 1_000_000
+    assert timings["alignment"] > 0 and "alignment" in memory
+    del data
+
+    # Rozgrzewanie repliki nie zmienia metryk ruchu (liczników spotkań, czasów etapów, RTF, VAD)
+    service = MeetingService(ai_engine=OneSpeakerEngine(), execution_mode="sequential", vad=EnergyVAD())
+    before = traffic_metrics()
+    assert service.warm_up(0.5) > 0 and "total" in service.last_timings
+    assert traffic_metrics() == before
+    samples = (np.random.default_rng(0).standard_normal(16000 * 6) * 0.1).astype(np.float32)
+    with AudioBuffer(samples) as audio:
+        service.process_audio(audio, "spotkanie.wav")
+    after = "\n".join(traffic_metrics())
+    assert after != "\n".join(before) and 'coretranscript_meetings_total{source="pipeline"}' in after
+
+    print("✅ SUKCES: Metryki działają.")
+
+
+if __name__ == "__main__":
+    run_test()
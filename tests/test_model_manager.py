@@ -0,0 +1,105 @@
+# File: tests/test_model_manager.py
+import sys
+import os
+import time
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.metrics import REGISTRY
+from src.infrastructure.model_manager import ModelManager
+
+MB = 1024 * 1024
+
+
+def loader(size_mb: int, loads: list):
+    def load():
+        loads.append(size_mb)
+        return np.ones(size_mb * MB, dtype=np.uint8)
+    return load
+
+
+class FakePipeline:
+    """Pipeline diaryzacji bez pyannote: jeden mówca przez 1 s."""
+
+    def __call__(self, audio_input, **hints):
+        turn = SimpleNamespace(start=0.0, end=1.0)
+        return SimpleNamespace(itertracks=lambda yield_label: iter([(turn, None, "SPEAKER_00")]))
+
+
+class FakePipelineEngine(AIEngine):
+    def __init__(self, **kwargs):
+        super().__init__(asr_backend="fake", **kwargs)
+        self.pipeline_loads = 0
+
+    def _load_diarization_pipeline(self):
+        self.pipeline_loads += 1
+        return FakePipeline()
+
+
+def run_test():
+    print("--- [TEST] Menedżer pamięci modeli (budżet LRU, bezczynność, ponowne ładowanie) ---")
+    nbytes = lambda model: model.nbytes
+
+    # 1. Budżet: najdawniej używany model jest zwalniany, a potem ładowany ponownie na żądanie
+    manager = ModelManager(budget_bytes=100 * MB)
+    loads = []
+    for key, size in (("a", 40), ("b", 40), ("a", 40), ("c", 40)):
+        with manager.use(key, loader(size, loads), name=f"model-{key}", size_fn=nbytes) as model:
+            assert model.nbytes == size * MB
+    stats = manager.stats()
+    assert sorted(m["model"] for m in stats["loaded"]) == ["model-a", "model-c"]  # b - najdawniej używany
+    assert stats["resident_bytes"] <= 100 * MB and stats["counts"]["model-b"]["unloads"] == 1
+    manager.get("b", loader(40, loads), name="model-b", size_fn=nbytes)
+    assert len(loads) == 4 and manager.stats()["counts"]["model-b"]["loads"] == 2
+    assert manager.stats()["counts"]["model-b"]["unloads_bytes"] == 40 * MB
+
+    # 2. Model w użyciu nie jest zwalniany, nawet gdy budżet jest przekroczony
+    manager = ModelManager(budget_bytes=50 * MB)
+    with manager.use("duzy", loader(40, []), size_fn=nbytes) as pinned:
+        manager.get("drugi", loader(40, []), size_fn=nbytes)
+        assert "duzy" in [m["model"] for m in manager.stats()["loaded"]] and pinned.nbytes == 40 * MB
+    manager.get("trzeci", loader(40, []), size_fn=nbytes)
+    assert [m["model"] for m in manager.stats()["loaded"]] == ["trzeci"]
+
+    # 3. Równoczesne użycia ładują model raz
+    loads = []
+    manager = ModelManager()
+    threads = [threading.Thread(target=manager.get, args=("wspolny", loader(1, loads))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loads == [1]
+
+    # 4. Bezczynność: wątek w tle zwalnia nieużywane modele
+    manager = ModelManager(idle_seconds=0.2)
+    manager.get("bezczynny", loader(1, []), size_fn=nbytes)
+    deadline = time.perf_counter() + 3
+    while manager.stats()["loaded"] and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    assert manager.stats()["loaded"] == [] and manager.stats()["counts"]["bezczynny"]["unloads"] == 1
+    manager.close()
+
+    # 5. AIEngine: pipeline diaryzacji przez menedżera - zwolniony i załadowany ponownie przy kolejnym użyciu
+    manager = ModelManager(budget_bytes=10 * MB)
+    engine = FakePipelineEngine(model_manager=manager)
+    with tempfile.NamedTemporaryFile(suffix=".wav") as f:
+        assert engine.diarize(f.name) == [{"start": 0.0, "end": 1.0, "speaker": "SPEAKER_00"}]
+        manager.get("inny model", loader(20, []), size_fn=nbytes)  # wypycha pipeline z budżetu...
+        engine.diarize(f.name)  # ...więc ładuje się ponownie
+    assert engine.pipeline_loads == 2 and engine.asr.models is manager
+
+    metrics = REGISTRY.render()
+    assert 'coretranscript_model_unloads_total{model="model-b",reason="budget"} 1' in metrics
+    assert 'reason="idle"' in metrics and 'coretranscript_model_resident_bytes{model="trzeci"}' in metrics
+    print("✅ SUKCES: Menedżer pamięci modeli działa.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,90 @@
+# File: tests/test_model_pool.py
+import sys
+import os
+import time
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.model_pool import ModelPool, PoolTimeoutError
+
+
+class FakeReplica:
+    """Replika bez modeli: pierwsze rozgrzanie "ładuje" model (wolne), kolejne są szybkie."""
+
+    def __init__(self, slots=None):
+        self.loaded = False
+        self.closed = False
+        self.ai_engine = object()
+        self.inference_slots = slots
+
+    def warm_up(self, clip_seconds: float) -> float:
+        start = time.perf_counter()
+        time.sleep(0.01 if self.loaded else 0.1)
+        self.loaded = True
+        return time.perf_counter() - start
+
+    def close(self):
+        self.closed = True
+
+
+def run_test():
+    print("--- [TEST] Pula modeli (rozgrzewanie + wypożyczanie) ---")
+
+    pool = ModelPool(FakeReplica, size=2)
+    assert not pool.ready
+
+    # Przed startem nie ma wolnych replik - żądanie czeka
+    try:
+        with pool.checkout(timeout=0.05):
+            raise AssertionError("Replika nie powinna być dostępna przed rozgrzaniem")
+    except PoolTimeoutError:
+        pass
+
+    pool.start(background=True).join()
+    status = pool.status()
+    print(f"   Status: {status}")
+    assert pool.ready and status["pooled"] == 2
+    assert all(r.loaded for r in pool.replicas)
+    for entry in status["warmup"]:
+        assert entry["cold_start_seconds"] > entry["warm_start_seconds"]
+
+    # Każde żądanie dostaje własną replikę; trzecie czeka na zwolnienie
+    held = []
+    with pool.checkout() as a, pool.checkout() as b:
+        assert a is not b
+        assert pool.status()["in_use"] == 2
+        waiter = threading.Thread(target=lambda: held.append(pool.checkout(timeout=2).__enter__()))
+        waiter.start()
+        time.sleep(0.05)
+        assert not held
+    waiter.join()
+    assert held and held[0] in pool.replicas
+
+    pool.close()
+    assert all(r.closed for r in pool.replicas)
+
+    # Inferencja poza potokiem (sesje na żywo): replika na wyłączność + slot urządzenia wspólny dla replik
+    slots = threading.BoundedSemaphore(1)
+    pool = ModelPool(lambda: FakeReplica(slots), size=2, warm_up=False)
+    pool.start(background=False)
+    lease, entered = pool.inference(), []
+    with pool.inference() as engine:
+        assert engine in [r.ai_engine for r in pool.replicas] and pool.status()["in_use"] == 1
+        assert not slots.acquire(blocking=False)
+        # Druga replika jest wolna, ale slot urządzenia zajęty - kolejna inferencja czeka
+        waiter = threading.Thread(target=lambda: entered.append(lease.__enter__()))
+        waiter.start()
+        time.sleep(0.05)
+        assert not entered and pool.status()["in_use"] == 2
+    waiter.join(timeout=2)
+    assert entered and pool.status()["in_use"] == 1  # pierwsza replika wróciła do puli
+    lease.__exit__(None, None, None)
+    assert slots.acquire(blocking=False) and pool.status()["in_use"] == 0
+    slots.release()
+
+    print("✅ SUKCES: Pula modeli działa.")
+
+
+if __name__ == "__main__":
+    run_test()
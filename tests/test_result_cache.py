@@ -0,0 +1,41 @@
+# File: tests/test_result_cache.py
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.infrastructure.result_cache import ResultCache, make_key
+
+
+def run_test():
+    print("--- [TEST] Cache wyników (LRU + liczniki) ---")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ResultCache(cache_dir, max_bytes=250)
+
+        keys = [make_key("hash", i, {"model": "whisper"}) for i in range(3)]
+        cache.put("asr", keys[0], b"a" * 100)
+        cache.put("asr", keys[1], b"b" * 100)
+        assert cache.get("asr", keys[0]) == b"a" * 100  # keys[0] staje się najświeższy
+
+        # Trzeci wpis przekracza limit -> usuwany jest najdawniej używany (keys[1])
+        cache.put("asr", keys[2], b"c" * 100)
+        assert cache.get("asr", keys[1]) is None
+        assert cache.get("asr", keys[0]) is not None
+
+        stats = cache.stats()
+        print(f"   Statystyki: {stats}")
+        assert stats["hits"]["asr"] == 2 and stats["misses"]["asr"] == 1
+        assert stats["entries"] == 2 and stats["bytes"] == 200
+
+        # Indeks odtwarza się z dysku po restarcie
+        reopened = ResultCache(cache_dir, max_bytes=250)
+        assert reopened.stats()["entries"] == 2
+        assert reopened.get_json("missing", keys[0]) is None
+
+    print("✅ SUKCES: Cache działa.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,93 @@
+# File: tests/test_result_streaming.py
+import sys
+import os
+import json
+import time
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.domain.models.models import MeetingTranscript, TranscriptionSegment
+from src.interface.api.streaming import SEGMENT_BATCH, stream_transcription
+
+TRANSCRIPT = MeetingTranscript(
+    filename="spotkanie.wav",
+    segments=[TranscriptionSegment(start=i, end=i + 0.9, speaker=f"SPEAKER_0{i % 2}", text=f"zdanie {i}")
+              for i in range(SEGMENT_BATCH + 5)]
+)
+
+
+def slow_pipeline(report):
+    for stage, progress in (("decode", 0.02), ("asr", 0.05), ("diarization", 0.6), ("alignment", 0.9)):
+        report(stage, progress)
+        time.sleep(0.05)
+    return TRANSCRIPT
+
+
+def failing_pipeline(report):
+    report("decode", 0.02)
+    raise RuntimeError("Nie udało się zdekodować pliku")
+
+
+async def collect(process, stream_format, heartbeat_seconds=1.0) -> str:
+    return "".join([chunk async for chunk in stream_transcription(process, stream_format, heartbeat_seconds)])
+
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if not line.startswith(":"))
+        if fields:
+            events.append({"type": fields["event"], "data": json.loads(fields["data"])})
+    return events
+
+
+def run_test():
+    print("--- [TEST] Strumieniowanie wyniku /transcribe (NDJSON / SSE) ---")
+
+    # 1. NDJSON: postęp etapów, segmenty po kolei, podsumowanie = odpowiedź /transcribe
+    events = [json.loads(line) for line in asyncio.run(collect(slow_pipeline, "ndjson")).splitlines()]
+    types = [e["type"] for e in events]
+    stages = [e["data"]["stage"] for e in events if e["type"] == "progress"]
+    print(f"   NDJSON: {len(events)} zdarzeń, etapy: {stages}")
+    assert stages == ["accepted", "decode", "asr", "diarization", "alignment", "done"]
+    assert types.count("segment") == len(TRANSCRIPT.segments) and types[-1] == "summary"
+    segments = [e["data"] for e in events if e["type"] == "segment"]
+    assert [s["text"] for s in segments] == [s.text for s in TRANSCRIPT.segments]
+    assert MeetingTranscript.model_validate(events[-1]["data"]) == TRANSCRIPT
+
+    # 2. SSE + heartbeat, gdy etap trwa dłużej niż interwał
+    body = asyncio.run(collect(slow_pipeline, "sse", heartbeat_seconds=0.01))
+    assert ": heartbeat" in body
+    sse_events = parse_sse(body)
+    assert [e["type"] for e in sse_events if e["type"] != "progress"] == [e for e in types if e != "progress"]
+
+    # 3. Błąd po wysłaniu nagłówków - ostatnie zdarzenie error
+    events = [json.loads(line) for line in asyncio.run(collect(failing_pipeline, "ndjson")).splitlines()]
+    assert events[-1] == {"type": "error", "data": {"detail": "Nie udało się zdekodować pliku"}}
+
+    # 4. Klient rozłącza się, zanim strumień zostanie odczytany - przetwarzanie (i sprzątanie) i tak rusza
+    cleaned = []
+
+    def pipeline_with_cleanup(report):
+        try:
+            return slow_pipeline(report)
+        finally:
+            cleaned.append(True)
+
+    async def abandon():
+        stream = stream_transcription(pipeline_with_cleanup, "ndjson")
+        await stream.aclose()
+        for _ in range(100):
+            if cleaned:
+                break
+            await asyncio.sleep(0.05)
+
+    asyncio.run(abandon())
+    assert cleaned
+
+    print("✅ SUKCES: Strumieniowanie wyniku działa.")
+
+
+if __name__ == "__main__":
+    run_test()
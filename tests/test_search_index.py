@@ -0,0 +1,106 @@
+# File: tests/test_search_index.py
+import sys
+import os
+import time
+import random
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.meeting_service import MeetingService
+from src.domain.models.models import MeetingTranscript, TranscriptionSegment
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.audio_loader import AudioBuffer
+from src.infrastructure.search_index import TranscriptSearchIndex
+from src.interface.cli import search as search_cli
+
+MEETINGS = 1000
+SEGMENTS_PER_MEETING = 100
+
+
+class OneSpeakerEngine(AIEngine):
+    """ASR 'fake' + diaryzacja: jeden mówca przez całe nagranie."""
+
+    def __init__(self):
+        super().__init__(asr_backend="fake")
+
+    def diarize(self, audio, speaker_hints=None, return_embeddings=False):
+        return [{"start": 0.0, "end": audio.duration, "speaker": "SPEAKER_00"}]
+
+
+def make_meeting(rng: random.Random, number: int, vocabulary) -> MeetingTranscript:
+    segments = [
+        TranscriptionSegment(start=i * 5.0, end=i * 5.0 + 4.0, speaker=f"SPEAKER_0{i % 3}",
+                             text=" ".join(rng.choice(vocabulary) for _ in range(12)))
+        for i in range(SEGMENTS_PER_MEETING)
+    ]
+    if number == 42:
+        segments[30] = segments[30].model_copy(update={"text": "Omówmy budżet na Q3 i terminy", "speaker": "Anna"})
+    return MeetingTranscript(filename=f"spotkanie_{number}.wav", meeting_id=f"{number:016x}", segments=segments)
+
+
+def run_test():
+    print("--- [TEST] Wyszukiwanie pełnotekstowe w transkryptach (SQLite FTS5) ---")
+    rng = random.Random(0)
+    vocabulary = [f"słowo{i}" for i in range(5000)] + ["klient", "projekt", "sprzedaż"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 1. Ładowanie hurtowe z eksportów JSON (partie w transakcjach), z jednym uszkodzonym plikiem
+        exports = os.path.join(tmp_dir, "exports")
+        os.makedirs(exports)
+        for number in range(MEETINGS):
+            with open(os.path.join(exports, f"{number:04d}.json"), "w", encoding="utf-8") as f:
+                f.write(make_meeting(rng, number, vocabulary).model_dump_json())
+        with open(os.path.join(exports, "zepsuty.json"), "w") as f:
+            f.write("{nie json")
+
+        index = TranscriptSearchIndex(os.path.join(tmp_dir, "search.db"))
+        stats = search_cli.ingest(index, [exports], batch_size=200)
+        assert stats == {**stats, "meetings": MEETINGS, "segments": MEETINGS * SEGMENTS_PER_MEETING, "skipped": 1}
+
+        # 2. Trafienie: spotkanie, mówca, czasy; bez polskich znaków i wielkości liter
+        hits = index.search("budzet q3")
+        assert len(hits) == 1
+        hit = hits[0]
+        assert (hit.meeting_id, hit.filename, hit.speaker, hit.start, hit.end) == (
+            f"{42:016x}", "spotkanie_42.wav", "Anna", 150.0, 154.0)
+        assert "[budżet]" in hit.snippet and index.search("budż*")[0].start == 150.0
+        assert index.search('"Q3" NOT "klient"', raw=True)[0].filename == "spotkanie_42.wav"
+
+        # 3. Czas zapytań przy 100k wypowiedzi
+        timings = []
+        for text in ("klient", "projekt sprzedaż", "budżet", "słowo1234"):
+            start = time.perf_counter()
+            for _ in range(10):
+                found = index.search(text, limit=20)
+            timings.append((time.perf_counter() - start) / 10 * 1000)
+            assert found
+        print(f"   {index.stats()['segments']} wypowiedzi, zapytania: " + ", ".join(f"{t:.2f} ms" for t in timings))
+        assert np.median(timings) < 50
+
+        # Filtry: mówca, spotkanie; ponowne dodanie zastępuje (bez duplikatów)
+        assert all(h.speaker == "SPEAKER_01" for h in index.search("klient", speaker="SPEAKER_01"))
+        assert {h.meeting_id for h in index.search("klient", meeting_id=f"{7:016x}", limit=200)} == {f"{7:016x}"}
+        index.add(make_meeting(random.Random(1), 42, vocabulary))
+        assert len(index.search("budżet")) == 1 and index.stats()["meetings"] == MEETINGS
+        index.close()
+
+        # 4. Na żywo: transkrypt z MeetingService trafia do indeksu od razu
+        live_index = TranscriptSearchIndex()
+        service = MeetingService(ai_engine=OneSpeakerEngine(), execution_mode="sequential",
+                                 search_index=live_index)
+        samples = (np.random.default_rng(0).standard_normal(16000 * 6) * 0.1).astype(np.float32)
+        with AudioBuffer(samples) as audio:
+            transcript = service.process_audio(audio, "na_zywo.wav")
+        hits = live_index.search(transcript.segments[0].text.split()[0])
+        assert hits and hits[0].filename == "na_zywo.wav" and "search_index" in transcript.timings
+        service.warm_up(0.5)
+        assert live_index.stats()["meetings"] == 1  # klip rozgrzewający nie jest indeksowany
+
+    print("✅ SUKCES: Wyszukiwanie w transkryptach działa.")
+
+
+if __name__ == "__main__":
+    run_test()
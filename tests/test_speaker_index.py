@@ -0,0 +1,95 @@
+# File: tests/test_speaker_index.py
+import sys
+import os
+import time
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.meeting_service import MeetingService
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.artifact_store import ArtifactStore
+from src.infrastructure.audio_loader import AudioBuffer
+from src.infrastructure.speaker_index import IVF_MIN_SIZE, SpeakerIndex
+
+DIM = 192
+
+
+class VoiceEngine(AIEngine):
+    """ASR 'fake' + diaryzacja na dwie tury, z embeddingami 'głosów' podanymi w teście."""
+
+    def __init__(self, voices):
+        super().__init__(asr_backend="fake")
+        self.voices = voices
+
+    def diarize(self, audio, speaker_hints=None, return_embeddings=False):
+        half = audio.duration / 2
+        segments = [{"start": 0.0, "end": half, "speaker": "SPEAKER_00"},
+                    {"start": half, "end": audio.duration, "speaker": "SPEAKER_01"}]
+        if not return_embeddings:
+            return segments
+        return segments, {f"SPEAKER_{i:02d}": v.tolist() for i, v in enumerate(self.voices)}
+
+
+def run_test():
+    print("--- [TEST] Indeks głosów (wyszukiwanie cosinusowe + IVF + rozpoznawanie mówców) ---")
+    rng = np.random.default_rng(0)
+
+    # 1. Duży zbiór: 3 głosy na osobę, zapytanie to nowe nagranie tej samej osoby
+    people = rng.standard_normal((IVF_MIN_SIZE, DIM)).astype(np.float32)
+    exact, approximate = SpeakerIndex(approximate=False), SpeakerIndex(approximate=True)
+    for i, person in enumerate(people):
+        voices = person + 0.3 * rng.standard_normal((3, DIM)).astype(np.float32)
+        exact.enroll(f"osoba{i}", voices)
+        approximate.enroll(f"osoba{i}", voices)
+    queries = people[:200] + 0.3 * rng.standard_normal((200, DIM)).astype(np.float32)
+
+    approximate.search(queries[0])  # budowa IVF poza pomiarem
+    for name, index in (("dokładny", exact), ("IVF", approximate)):
+        start = time.perf_counter()
+        hits = sum(index.search(q, k=1)[0][0] == f"osoba{i}" for i, q in enumerate(queries))
+        per_query = (time.perf_counter() - start) / len(queries) * 1000
+        print(f"   {name}: {len(index)} głosów, {per_query:.3f} ms/zapytanie, trafność {hits / len(queries):.2f}")
+        assert hits / len(queries) >= 0.95
+
+    # 2. Jednoznaczne przypisanie z progiem + trwałość
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "speakers.npz")
+        anna, jan, obcy = rng.standard_normal((3, DIM)).astype(np.float32)
+        index = SpeakerIndex(path)
+        index.enroll("Anna", anna)
+        index.enroll("Jan", jan)
+        matches = index.identify({"A": anna + 0.1, "B": anna + 0.2, "C": obcy}, threshold=0.6)
+        assert matches["A"][0] == "Anna" and matches["B"] is None and matches["C"] is None
+
+        reopened = SpeakerIndex(path)
+        assert reopened.identities() == {"Anna": 1, "Jan": 1} and reopened.version == index.version
+        assert reopened.remove("Anna") and reopened.search(anna, k=1)[0][0] == "Jan"
+
+        # 3. Potok: mówca zapisany z jednego spotkania rozpoznany w kolejnym
+        service = MeetingService(ai_engine=VoiceEngine([jan, obcy]), execution_mode="sequential",
+                                 artifacts=ArtifactStore(os.path.join(tmp_dir, "meetings")),
+                                 speaker_index=SpeakerIndex(os.path.join(tmp_dir, "voices.npz")))
+        samples = (rng.standard_normal(16000 * 8) * 0.1).astype(np.float32)
+        with AudioBuffer(samples) as audio:
+            first = service.process_audio(audio, "spotkanie1.wav")
+        assert {s.speaker for s in first.segments} == {"SPEAKER_00", "SPEAKER_01"}
+        assert all(s.identity is None for s in first.speakers)
+
+        assert service.enroll_speaker(first.meeting_id, "SPEAKER_00", "Jan") == 1
+        relabelled = service.realign(first.meeting_id)
+        print(f"   Mówcy po zapisaniu głosu: {[s.model_dump() for s in relabelled.speakers]}")
+        assert {s.speaker for s in relabelled.segments} == {"Jan", "SPEAKER_01"}
+
+        service.ai_engine.voices = [obcy + 0.05, jan + 0.05]  # kolejne spotkanie, Jan mówi drugi
+        with AudioBuffer(samples) as audio:
+            second = service.process_audio(audio, "spotkanie2.wav")
+        assert second.segments[-1].speaker == "Jan" and second.segments[0].speaker == "SPEAKER_00"
+
+    print("✅ SUKCES: Indeks głosów działa.")
+
+
+if __name__ == "__main__":
+    run_test()
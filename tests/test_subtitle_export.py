@@ -0,0 +1,130 @@
+# File: tests/test_subtitle_export.py
+import sys
+import os
+import time
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.alignment_service import AlignmentService
+from src.core.segmentation import SubtitleSegmenter
+from src.domain.models.models import MeetingTranscript, TranscriptionSegment
+from src.infrastructure.settings import Settings
+from src.infrastructure.subtitle_export import format_timestamp, iter_export
+from src.infrastructure.transcript_store import TranscriptStore
+
+NUM_WORDS = 200000
+
+
+def make_words(n: int):
+    """Długi monolog: słowa po 0.3 s, co 12. kończy zdanie, co 5. ma przecinek, co 400. po nim długa przerwa."""
+    words, t = [], 0.0
+    for i in range(n):
+        suffix = "." if i % 12 == 11 else "," if i % 5 == 4 else ""
+        words.append({"word": f" słowo{i}{suffix}", "start": t, "end": t + 0.25})
+        t += 3.0 if i % 400 == 399 else 0.3
+    return words, t
+
+
+def run_test():
+    print("--- [TEST] Segmentacja napisów i strumieniowy eksport SRT/VTT/TXT ---")
+
+    # 1. Reguły: zmiana mówcy, przerwa, limit długości (cięcie po interpunkcji), koniec zdania
+    words = [
+        {"word": "Dzień", "start": 0.0, "end": 0.4}, {"word": "dobry.", "start": 0.5, "end": 0.9},
+        {"word": "Zaczynamy", "start": 1.0, "end": 1.5}, {"word": "po", "start": 3.5, "end": 3.7},
+        {"word": "przerwie,", "start": 3.8, "end": 4.3}, {"word": "a", "start": 4.4, "end": 4.5},
+        {"word": "teraz", "start": 4.6, "end": 5.0}, {"word": "dłużej", "start": 5.1, "end": 5.6},
+    ]
+    transcription = {"segments": [{"words": words}]}
+    speakers = [{"start": 0.0, "end": 6.0, "speaker": "A"}]
+    assert [s["text"] for s in AlignmentService().align(transcription, speakers)] == [
+        "Dzień dobry. Zaczynamy po przerwie, a teraz dłużej"
+    ]
+    segmenter = SubtitleSegmenter(max_duration=1.8, max_pause=1.0, split_sentences=True, min_duration=0.5)
+    service = AlignmentService(segmenter=segmenter)
+    assert [s["text"] for s in service.align(transcription, speakers)] == [
+        "Dzień dobry.", "Zaczynamy", "po przerwie,", "a teraz dłużej"
+    ]
+    assert "segmentation" in service.params() and "segmentation" not in AlignmentService().params()
+    # Słowo dłuższe niż limit zaraz po interpunkcji: jedno cięcie, bez pustego segmentu
+    long_word = [{"word": "Hello,", "start": 0.0, "end": 0.4}, {"word": "loooooong", "start": 0.5, "end": 3.0},
+                 {"word": "x", "start": 3.2, "end": 3.5}]
+    segmenter = SubtitleSegmenter(max_duration=2.0)
+    assert segmenter.boundaries([w["word"] for w in long_word], np.array([w["start"] for w in long_word]),
+                                np.array([w["end"] for w in long_word]), np.zeros(3, dtype=int)).tolist() == [1, 2]
+    service = AlignmentService(segmenter=segmenter)
+    transcription = {"segments": [{"words": long_word}]}
+    grouped = service.align(transcription, speakers)
+    assert [s["text"] for s in grouped] == ["Hello,", "loooooong", "x"]
+    assert all(s["end"] > s["start"] for s in grouped)
+    columnar = service.align_columnar(transcription, speakers, "slowo.wav")
+    assert [s.text for s in columnar.to_meeting_transcript().segments] == ["Hello,", "loooooong", "x"]
+    # Domyślne ustawienia: segmentacja wyłączona - wynik i klucz cache jak bez segmentera
+    defaults = Settings()
+    off = AlignmentService(segmenter=SubtitleSegmenter(defaults.segment_max_seconds, defaults.segment_max_pause_seconds,
+                                                       defaults.segment_split_sentences))
+    assert off.segmenter is None and off.params() == AlignmentService().params()
+
+    # 2. Długi monolog: obie ścieżki alignmentu dają te same segmenty, w limitach i w czasie liniowym
+    segmenter = SubtitleSegmenter(max_duration=7.0, max_pause=1.5)
+    service = AlignmentService(segmenter=segmenter)
+    timings = {}
+    for n in (NUM_WORDS // 4, NUM_WORDS):
+        words, total = make_words(n)
+        transcription = {"segments": [{"words": words}]}
+        speakers = [{"start": 0.0, "end": total / 2, "speaker": "A"}, {"start": total / 2, "end": total, "speaker": "B"}]
+        start = time.perf_counter()
+        columnar = service.align_columnar(transcription, speakers, "monolog.wav")
+        timings[n] = time.perf_counter() - start
+        grouped = service.align(transcription, speakers)
+        assert list(columnar.iter_segments()) == grouped
+    durations = np.array([s["end"] - s["start"] for s in grouped])
+    assert durations.max() <= 7.0 and len(grouped) > n // 30
+    assert sum(s["text"].endswith((",", ".")) for s in grouped) > len(grouped) * 0.9  # cięcia po interpunkcji
+    assert " ".join(s["text"] for s in grouped) == " ".join(w["word"].strip() for w in words)
+    print(f"   Segmentacja {NUM_WORDS // 4} / {NUM_WORDS} słów: {timings[NUM_WORDS // 4]:.2f}s / {timings[NUM_WORDS]:.2f}s")
+    assert timings[NUM_WORDS] < timings[NUM_WORDS // 4] * 8  # liniowo (z zapasem na szum)
+
+    # 3. Formaty
+    segments = [
+        TranscriptionSegment(start=0.0, end=1.5, speaker="SPEAKER_00", text="Dzień dobry."),
+        TranscriptionSegment(start=3661.25, end=3662.0, speaker="Anna", text="a < b & c\nd"),
+    ]
+    assert format_timestamp(3661.2504) == "01:01:01,250" and format_timestamp(0.0016, ".") == "00:00:00.002"
+    assert "".join(iter_export(segments, "srt")) == (
+        "1\n00:00:00,000 --> 00:00:01,500\nSPEAKER_00: Dzień dobry.\n\n"
+        "2\n01:01:01,250 --> 01:01:02,000\nAnna: a < b & c d\n\n"
+    )
+    assert "".join(iter_export(segments, "vtt")) == (
+        "WEBVTT\n\n00:00:00.000 --> 00:00:01.500\n<v SPEAKER_00>Dzień dobry.\n\n"
+        "01:01:01.250 --> 01:01:02.000\n<v Anna>a &lt; b &amp; c d\n\n"
+    )
+    assert "".join(iter_export(segments, "txt")) == "[00:00:00] SPEAKER_00: Dzień dobry.\n[01:01:01] Anna: a < b & c d\n"
+    try:
+        iter_export(segments, "docx")
+        raise AssertionError("Oczekiwano błędu")
+    except ValueError:
+        pass
+
+    # 4. Strumień: kawałki powstają w miarę czytania segmentów z magazynu
+    many = [TranscriptionSegment(start=i * 2.0, end=i * 2.0 + 1.5, speaker="A", text=f"Zdanie {i}.") for i in range(5000)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = TranscriptStore(os.path.join(tmp_dir, "transcripts.db"))
+        store.save(MeetingTranscript(filename="dlugie.wav", meeting_id="m1", segments=many))
+        consumed = []
+        reading = (consumed.append(s) or s for s in store.iter_segments("m1", page_size=500))
+        chunks = iter_export(reading, "srt", batch=100)
+        first = next(chunks)
+        assert first.startswith("1\n00:00:00,000") and first.count(" --> ") == 100 and len(consumed) <= 500
+        document = first + "".join(chunks)
+        assert document.count(" --> ") == 5000 and document.endswith("A: Zdanie 4999.\n\n")
+        store.close()
+
+    print("✅ SUKCES: Segmentacja i eksport napisów działają.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,127 @@
+# File: tests/test_transcript_store.py
+import sys
+import os
+import time
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.meeting_service import MeetingService
+from src.domain.models.models import MeetingTranscript, TranscriptionSegment
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.audio_loader import AudioBuffer
+from src.infrastructure.transcript_store import TranscriptNotFoundError, TranscriptStore
+
+NUM_SEGMENTS = 100000
+
+
+class OneSpeakerEngine(AIEngine):
+    """ASR 'fake' + diaryzacja: jeden mówca przez całe nagranie."""
+
+    def __init__(self):
+        super().__init__(asr_backend="fake")
+
+    def diarize(self, audio, speaker_hints=None, return_embeddings=False):
+        return [{"start": 0.0, "end": audio.duration, "speaker": "SPEAKER_00"}]
+
+
+def make_transcript() -> MeetingTranscript:
+    rng = np.random.default_rng(0)
+    starts = np.cumsum(rng.uniform(0.5, 3.0, NUM_SEGMENTS))
+    lengths = rng.uniform(0.3, 4.0, NUM_SEGMENTS)
+    lengths[777] = 120.0  # jeden bardzo długi monolog - zapytania w jego środku muszą go zwrócić
+    segments = [
+        TranscriptionSegment(start=float(s), end=float(s + d), speaker=f"SPEAKER_0{i % 4}", text=f"Wypowiedź {i}")
+        for i, (s, d) in enumerate(zip(starts, lengths))
+    ]
+    return MeetingTranscript(filename="bardzo_dlugie.wav", meeting_id="abc123", segments=segments, summary="Test")
+
+
+def brute_force(transcript: MeetingTranscript, start: float, end: float, speakers=None):
+    found = [s for s in transcript.segments if s.start <= end and s.end >= start
+             and (not speakers or s.speaker in speakers)]
+    return sorted(found, key=lambda s: s.start)
+
+
+def run_test():
+    print("--- [TEST] Magazyn transkryptów: okna czasu, filtr mówców, kursory ---")
+    transcript = make_transcript()
+    long_start = transcript.segments[777].start
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "transcripts.db")
+        store = TranscriptStore(path)
+        start = time.perf_counter()
+        assert store.save(transcript) == "abc123"
+        save_ms = (time.perf_counter() - start) * 1000
+        store.close()
+
+        # 1. Trwałość: nowe połączenie widzi zapisany transkrypt
+        store = TranscriptStore(path)
+        info = store.info("abc123")
+        assert info["segments"] == NUM_SEGMENTS and info["summary"] == "Test"
+        assert info["speaker_labels"] == ["SPEAKER_00", "SPEAKER_01", "SPEAKER_02", "SPEAKER_03"]
+
+        # 2. Okna czasu (z filtrem mówców) zgodne z pełnym przeglądem
+        windows = [(0.0, 30.0), (long_start + 60, long_start + 61), (50000.0, 50100.0), (1e9, 2e9)]
+        for window_start, window_end in windows:
+            for speakers in (None, ["SPEAKER_01", "SPEAKER_03"]):
+                page = store.segments("abc123", window_start, window_end, speakers, limit=1000)
+                expected = brute_force(transcript, window_start, window_end, speakers)
+                assert [(s.start, s.speaker) for s in page.segments] == [(s.start, s.speaker) for s in expected]
+        assert 777 in [int(s.text.split()[-1]) for s in store.segments("abc123", long_start + 60, long_start + 61).segments]
+
+        # 3. Stronicowanie kursorem: bez powtórzeń i luk
+        window = (100000.0, 110000.0)
+        collected, cursor, pages = [], None, 0
+        while True:
+            page = store.segments("abc123", *window, limit=97, cursor=cursor)
+            collected.extend(page.segments)
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert [s.text for s in collected] == [s.text for s in brute_force(transcript, *window)] and pages > 10
+
+        # 4. Koszt odczytu okna vs wczytanie całego transkryptu
+        start = time.perf_counter()
+        for i in range(100):
+            store.segments("abc123", i * 1000.0, i * 1000.0 + 60.0, limit=100)
+        window_ms = (time.perf_counter() - start) * 1000 / 100
+        start = time.perf_counter()
+        full = store.get("abc123")
+        full_ms = (time.perf_counter() - start) * 1000
+        print(f"   {NUM_SEGMENTS} segmentów: zapis {save_ms:.0f} ms, okno 60 s {window_ms:.2f} ms, "
+              f"cały transkrypt {full_ms:.0f} ms")
+        assert full.segments[-1] == transcript.segments[-1] and full.summary == "Test"
+        assert window_ms * 20 < full_ms
+
+        # 5. Błędy: nieznany klucz, zły kursor, odwrócone okno; usuwanie
+        for call, error in ((lambda: store.segments("nie-ma"), TranscriptNotFoundError),
+                            (lambda: store.segments("abc123", cursor="???"), ValueError),
+                            (lambda: store.segments("abc123", 10.0, 5.0), ValueError)):
+            try:
+                call()
+                raise AssertionError("Oczekiwano błędu")
+            except error:
+                pass
+        assert store.delete("abc123") and not store.delete("abc123") and store.list() == []
+        store.close()
+
+    # 6. Na żywo: transkrypt z MeetingService trafia do magazynu od razu
+    live_store = TranscriptStore()
+    service = MeetingService(ai_engine=OneSpeakerEngine(), execution_mode="sequential", transcript_store=live_store)
+    samples = (np.random.default_rng(0).standard_normal(16000 * 6) * 0.1).astype(np.float32)
+    with AudioBuffer(samples) as audio:
+        transcript = service.process_audio(audio, "na_zywo.wav")
+    saved = live_store.list()
+    assert len(saved) == 1 and saved[0]["filename"] == "na_zywo.wav" and "transcript_store" in transcript.timings
+    assert live_store.get(saved[0]["key"]).segments == transcript.segments
+
+    print("✅ SUKCES: Magazyn transkryptów działa.")
+
+
+if __name__ == "__main__":
+    run_test()
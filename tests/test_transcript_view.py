@@ -0,0 +1,55 @@
+# File: tests/test_transcript_view.py
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.domain.models.models import MeetingTranscript, TranscriptionSegment
+from src.interface.ui.transcript_view import TranscriptView, format_clock
+
+NUM_SEGMENTS = 20000
+
+
+def make_transcript() -> MeetingTranscript:
+    segments = [
+        TranscriptionSegment(start=i * 2.0, end=i * 2.0 + 1.5, speaker=f"SPEAKER_0{i % 3}",
+                             text=f"Wypowiedź numer {i}" + (" Budżet na kwartał" if i % 1000 == 0 else ""))
+        for i in range(NUM_SEGMENTS)
+    ]
+    return MeetingTranscript(filename="dlugie.wav", segments=segments)
+
+
+def run_test():
+    print("--- [TEST] Widok długiego transkryptu (filtr czasu, mówców, wyszukiwanie, strony) ---")
+    transcript = make_transcript()
+
+    start = time.perf_counter()
+    view = TranscriptView(transcript)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    everything = view.filter()
+    in_range = view.filter(100.0, 200.0)
+    found = view.filter(query="BUDŻET")
+    combined = view.filter(0.0, 10000.0, "budżet", ["SPEAKER_01"])
+    filter_ms = (time.perf_counter() - start) * 1000 / 4
+    print(f"   {len(view)} segmentów: budowa {build_ms:.1f} ms, filtr {filter_ms:.2f} ms")
+
+    assert len(everything) == NUM_SEGMENTS and view.speaker_names == ["SPEAKER_00", "SPEAKER_01", "SPEAKER_02"]
+    # Nachodzące na [100, 200]: od segmentu 50 (start 100) do 100 (start 200); 49 kończy się o 99.5
+    assert in_range.tolist() == list(range(50, 101))
+    assert found.tolist() == list(range(0, NUM_SEGMENTS, 1000))
+    assert combined.tolist() == [1000, 4000]  # i % 3 == 1 wśród 0, 1000, ..., 4000
+
+    page = view.page(everything, page=3, page_size=50)
+    assert [s.start for s in page[:2]] == [200.0, 202.0] and len(page) == 50
+    assert view.page_count(everything, 50) == 400 and view.page(everything, 999, 50)[-1] is transcript.segments[-1]
+    assert view.page(view.filter(query="nie ma takiej frazy"), 1, 50) == []
+
+    assert format_clock(59.9) == "00:59" and format_clock(3725) == "1:02:05"
+    print("✅ SUKCES: Widok transkryptu działa.")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,97 @@
+# File: tests/test_vad.py
+import sys
+import os
+import time
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.meeting_service import MeetingService
+from src.infrastructure.ai_engine import AIEngine
+from src.infrastructure.artifact_store import ArtifactStore
+from src.infrastructure.audio_loader import AudioBuffer, SAMPLE_RATE
+from src.infrastructure.metrics import REGISTRY
+from src.infrastructure.vad import EnergyVAD
+
+SPEECH = [(5.0, 15.0), (40.0, 50.0)]
+DURATION = 60.0
+
+
+class RecordingEngine(AIEngine):
+    """ASR 'fake' + diaryzacja: jeden mówca przez całe otrzymane audio (zapamiętuje jego długość)."""
+
+    def __init__(self):
+        super().__init__(asr_backend="fake")
+        self.seen_durations = []
+
+    def diarize(self, audio, speaker_hints=None, return_embeddings=False):
+        self.seen_durations.append(audio.duration)
+        return [{"start": 0.0, "end": audio.duration, "speaker": "SPEAKER_00"}]
+
+
+def make_meeting() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(int(DURATION * SAMPLE_RATE)) * 1e-4).astype(np.float32)
+    for start, end in SPEECH:
+        a, b = int(start * SAMPLE_RATE), int(end * SAMPLE_RATE)
+        samples[a:b] = (rng.standard_normal(b - a) * 0.1).astype(np.float32)
+    return samples
+
+
+def inside_speech(t: float, margin: float = 0.5) -> bool:
+    return any(start - margin <= t <= end + margin for start, end in SPEECH)
+
+
+def run_test():
+    print("--- [TEST] VAD: wycinanie ciszy przed modelami i powrót czasów na oś nagrania ---")
+    samples = make_meeting()
+
+    # 1. Detekcja i odwzorowanie czasów
+    vad = EnergyVAD()
+    start = time.perf_counter()
+    speech_map = vad.detect(samples, SAMPLE_RATE)
+    print(f"   Detekcja: {speech_map.regions} fragmenty, {(time.perf_counter() - start) * 1000:.1f} ms / {DURATION:.0f}s audio")
+    assert speech_map.regions == 2
+    for (start, end), found_start, found_end in zip(SPEECH, speech_map.starts, speech_map.ends):
+        assert abs(found_start - (start - vad.padding_seconds)) < 0.1 and abs(found_end - (end + vad.padding_seconds)) < 0.1
+    second = speech_map.compact_starts[1]
+    assert np.allclose(speech_map.to_original([0.0, second + 1.0]), [speech_map.starts[0], speech_map.starts[1] + 1.0])
+
+    # Tura przez łączenie fragmentów dzielona na dwie - cisza nie należy do mówcy
+    turns = speech_map.map_turns([{"start": 1.0, "end": second + 2.0, "speaker": "A"}])
+    assert [round(t["end"] - t["start"], 2) for t in turns] == [round(speech_map.lengths[0] - 1.0, 2), 2.0]
+
+    # 2. Potok: modele dostają tylko mowę, wynik na osi oryginału
+    engine = RecordingEngine()
+    artifacts_dir = tempfile.TemporaryDirectory()
+    artifacts = ArtifactStore(artifacts_dir.name)
+    service = MeetingService(ai_engine=engine, execution_mode="sequential", vad=vad, artifacts=artifacts)
+    with AudioBuffer(samples) as audio:
+        transcript = service.process_audio(audio, "spotkanie.wav")
+    print(f"   Model widział {engine.seen_durations[0]:.1f}s z {DURATION:.0f}s, pominięto {transcript.skipped_audio}s")
+    assert engine.seen_durations[0] < 25.0
+    assert transcript.skipped_audio > 35.0
+    assert "coretranscript_vad_skipped_seconds_total " in REGISTRY.render()
+    assert 'coretranscript_vad_saved_seconds_total{stage="asr"}' in REGISTRY.render()
+    assert "vad" in transcript.timings
+
+    words = artifacts.load_columnar(transcript.meeting_id).word_starts
+    assert len(words) and all(inside_speech(t) for t in words.tolist())
+    assert words.max() > SPEECH[1][0]  # drugi fragment nie został przesunięty na początek
+    assert {s.speaker for s in transcript.segments} == {"SPEAKER_00"}
+
+    # 3. Bez VAD - te same fragmenty mowy pokryte słowami
+    plain = MeetingService(ai_engine=RecordingEngine(), execution_mode="sequential", artifacts=artifacts)
+    with AudioBuffer(samples) as audio:
+        reference = plain.process_audio(audio, "spotkanie.wav")
+    assert reference.skipped_audio is None
+    assert abs(len(words) - artifacts.load_columnar(reference.meeting_id).num_words) <= 2
+    artifacts_dir.cleanup()
+
+    print("✅ SUKCES: VAD pomija ciszę, a czasy słów i mówców zgadzają się z nagraniem.")
+
+
+if __name__ == "__main__":
+    run_test()